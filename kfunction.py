@@ -1,10 +1,20 @@
-import win32com.client as win32
 import pandas as pd, os, gc
 import sys
+from datetime import date, datetime
+import numpy as np
 
 # DataManager 싱글톤 인스턴스
 _data_manager = None
 
+# 디스크 캐시 싱글톤 인스턴스 (False: 비활성화로 확정)
+_disk_cache = None
+
+# Excel 읽기 백엔드: 'auto'(openpyxl 우선, 실패 시 COM) | 'openpyxl' | 'com'
+EXCEL_READER_BACKEND = os.environ.get('SUBCON_EXCEL_BACKEND', 'auto').lower()
+
+# openpyxl로 직접 읽을 수 있는 확장자
+_NATIVE_EXTENSIONS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+
 def get_data_manager():
     """DataManager 싱글톤 인스턴스 반환"""
     global _data_manager
@@ -13,29 +23,138 @@ def get_data_manager():
         src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
         if src_path not in sys.path:
             sys.path.insert(0, src_path)
-        
+
         from services.data_manager import DataManager
         _data_manager = DataManager()
     return _data_manager
 
+def get_disk_cache():
+    """디스크 캐시 싱글톤 반환 (비활성화 시 None)"""
+    global _disk_cache
+    if _disk_cache is None:
+        get_data_manager()  # src 경로 등록
+        from services.disk_cache import DiskCache, parquet_supported, resolve_cache_dir
+        cache_dir = resolve_cache_dir(os.path.dirname(os.path.abspath(__file__)))
+        if cache_dir and not parquet_supported():
+            print("[WARN] pyarrow가 설치되어 있지 않아 디스크 캐시를 사용하지 않습니다")
+            cache_dir = None
+        _disk_cache = DiskCache(cache_dir) if cache_dir else False
+    return _disk_cache or None
+
 def read_excel_data(
     file_path: str,
     sheet: int | str = 0,      # 인덱스(0‑기준) 또는 시트명
     header: int | list[int] = 0,
+    backend: str | None = None,
+    schema: dict | None = None,
 ) -> pd.DataFrame:
     """
-    Excel 파일을 DataFrame으로 읽어 오는 함수 (pywin32 사용, 시트 자동 검증)
+    Excel 파일을 DataFrame으로 읽어 오는 함수 (시트 자동 검증)
     - sheet: 0‑기준 인덱스(int) 또는 정확한 시트명(str)
     - header: pandas.read_excel과 동일하게 단일/다중 헤더 지원
+    - backend: 'openpyxl'(xlsx 직접 스트리밍 파싱), 'com'(Excel 실행, Windows 전용),
+               'auto'(openpyxl 우선, 읽을 수 없는 형식이면 COM). 기본값은 EXCEL_READER_BACKEND
+    - schema: 입력 스키마(services.input_schema) - 지정하면 선언된 컬럼만 선언된 형식으로 변환하고
+              전체 컬럼 숫자 자동 변환은 하지 않음
     """
-    # 캐시 확인
+    # 캐시 확인 (같은 파일이라도 시트/헤더/스키마가 다르면 별도 항목)
     dm = get_data_manager()
-    cached_data = dm.get_cached_data(file_path)
+    variant = _cache_variant(sheet, header, schema)
+    cached_data = dm.get_cached_data(file_path, variant)
     if cached_data is not None:
         print(f"[INFO] '{file_path}' 캐시에서 로드")
-        return cached_data.copy()
-    
+        return cached_data
+
+    # 디스크 캐시 확인 (파일 내용 해시가 같으면 재시작 후에도 파싱 생략)
+    disk_cache = get_disk_cache()
+    if disk_cache is not None:
+        df = disk_cache.get(file_path, variant)
+        if df is not None:
+            print(f"[INFO] '{file_path}' 디스크 캐시에서 로드")
+            dm.cache_file_data(file_path, df, variant)
+            return df
+
     print(f"[INFO] '{file_path}' 읽는 중…")
+    data = _read_rows(file_path, sheet, (backend or EXCEL_READER_BACKEND).lower())
+    df = _build_dataframe(data, header, schema)
+
+    # 캐시에 저장
+    dm.cache_file_data(file_path, df, variant)
+    if disk_cache is not None:
+        disk_cache.put(file_path, df, variant)
+    print(f"[INFO] '{file_path}' 캐시에 저장")
+
+    return df
+
+def is_excel_cached(file_path: str, sheet: int | str = 0, header: int | list[int] = 0,
+                    schema: dict | None = None) -> bool:
+    """read_excel_data 캐시에 해당 파일/시트/헤더/스키마가 있는지 확인"""
+    return get_data_manager().is_file_cached(file_path, _cache_variant(sheet, header, schema))
+
+def cache_excel_data(file_path: str, df: pd.DataFrame, sheet: int | str = 0, header: int | list[int] = 0,
+                     schema: dict | None = None):
+    """다른 프로세스에서 읽은 결과를 read_excel_data 캐시에 등록"""
+    get_data_manager().cache_file_data(file_path, df, _cache_variant(sheet, header, schema))
+
+def _cache_variant(sheet: int | str, header: int | list[int], schema: dict | None = None) -> str:
+    """캐시 항목 구분자 - 기본 옵션(0번 시트, 0행 헤더, 스키마 없음)은 빈 문자열"""
+    variant = '' if (sheet, header) == (0, 0) else f"{sheet}|{header}"
+    if schema:
+        get_data_manager()  # src 경로 등록
+        from services.input_schema import schema_digest
+        variant += f"|schema={schema_digest(schema)}"
+    return variant
+
+def _read_rows(file_path: str, sheet: int | str, backend: str) -> list:
+    """백엔드별로 시트의 사용 영역을 2‑D 행 목록으로 읽기"""
+    if backend == 'com':
+        return _read_rows_com(file_path, sheet)
+    if backend == 'openpyxl':
+        return _read_rows_openpyxl(file_path, sheet)
+    if backend != 'auto':
+        raise ValueError(f"지원하지 않는 Excel 읽기 백엔드: {backend}")
+
+    if not file_path.lower().endswith(_NATIVE_EXTENSIONS):
+        return _read_rows_com(file_path, sheet)
+    try:
+        return _read_rows_openpyxl(file_path, sheet)
+    except (ValueError, IndexError):
+        # 시트 선택 오류는 백엔드와 무관하므로 그대로 전달
+        raise
+    except Exception as e:
+        print(f"[WARN] openpyxl 읽기 실패, COM으로 재시도: {e}")
+        return _read_rows_com(file_path, sheet)
+
+def _read_rows_openpyxl(file_path: str, sheet: int | str) -> list:
+    """xlsx zip/XML을 openpyxl read_only 모드로 스트리밍 파싱 (Excel 불필요)"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        # -------- 시트 선택 로직 -------- #
+        if isinstance(sheet, str):
+            if sheet not in wb.sheetnames:
+                raise ValueError(f"'{sheet}' 시트를 찾을 수 없습니다. 존재 시트: {wb.sheetnames}")
+            ws = wb[sheet]
+        else:
+            max_idx = len(wb.worksheets) - 1
+            if not (0 <= sheet <= max_idx):
+                raise IndexError(f"시트 인덱스 {sheet} 범위 초과(0~{max_idx}).")
+            ws = wb.worksheets[sheet]
+
+        # -------- 데이터 추출 (UsedRange와 같이 dimension 시작 셀부터) -------- #
+        data = list(ws.iter_rows(min_row=ws.min_row or 1, min_col=ws.min_column or 1, values_only=True))
+    finally:
+        wb.close()
+
+    # dimension 정보가 없는 파일은 행 길이가 다를 수 있으므로 맞춘다
+    width = max((len(row) for row in data), default=0)
+    return [row if len(row) == width else row + (None,) * (width - len(row)) for row in data]
+
+def _read_rows_com(file_path: str, sheet: int | str) -> list:
+    """Excel COM(pywin32)으로 UsedRange 읽기 - Windows 전용 대체 경로"""
+    import win32com.client as win32
+
     excel, wb = None, None
     try:
         excel = win32.Dispatch("Excel.Application")
@@ -56,44 +175,284 @@ def read_excel_data(
             ws = wb.Worksheets(sheet + 1)   # COM은 1‑기준
 
         # -------- 데이터 추출 -------- #
-        used_range = ws.UsedRange
-        data = list(used_range.Value)           # 2‑D tuple → list 변환
-        data = [[cell if cell is not None else None for cell in row] for row in data]
-
-        # -------- DataFrame 구성 -------- #
-        if isinstance(header, list):
-            columns = pd.MultiIndex.from_arrays([data[h] for h in header])
-            df = pd.DataFrame(data[max(header)+1:], columns=columns)
-        else:
-            if header >= 0:
-                df = pd.DataFrame(data[header+1:], columns=data[header])
-            else:
-                df = pd.DataFrame(data)
-
-        # -------- 숫자/날짜 자동 형 변환 -------- #
-        # 안전한 숫자 변환: 각 컬럼을 개별적으로 처리
-        for col in df.columns:
-            try:
-                # Series인지 확인하고 처리
-                column_data = df[col]
-                if hasattr(column_data, 'dtype') and column_data.dtype == 'object':
-                    # errors='coerce'로 변경 (변환 불가능한 값은 NaN으로)
-                    numeric_series = pd.to_numeric(column_data, errors='coerce')
-                    # NaN이 아닌 값이 있으면 변환 적용
-                    if numeric_series.notna().any():
-                        df[col] = numeric_series.where(numeric_series.notna(), column_data)
-            except (TypeError, ValueError, AttributeError) as e:
-                # 변환할 수 없는 컬럼은 원본 유지
-                continue
-        
-        # 캐시에 저장
-        dm.cache_file_data(file_path, df)
-        print(f"[INFO] '{file_path}' 캐시에 저장")
-        
-        return df
+        return list(ws.UsedRange.Value)     # 2‑D tuple → 행 목록
 
     finally:
         if wb: wb.Close(False)
         if excel: excel.Quit()
         del wb, excel
         gc.collect()
+
+def _build_dataframe(data: list, header: int | list[int], schema: dict | None = None) -> pd.DataFrame:
+    """행 목록을 DataFrame으로 구성하고 스키마 형식 변환 (스키마가 없으면 숫자 컬럼 자동 변환)"""
+    # -------- DataFrame 구성 -------- #
+    if isinstance(header, list):
+        columns = pd.MultiIndex.from_arrays([data[h] for h in header])
+        df = pd.DataFrame(data[max(header)+1:], columns=columns)
+    else:
+        if header >= 0:
+            df = pd.DataFrame(data[header+1:], columns=data[header])
+        else:
+            df = pd.DataFrame(data)
+
+    # -------- 스키마 형식 변환 (선언된 컬럼만 한 번씩) -------- #
+    if schema:
+        get_data_manager()  # src 경로 등록
+        from services.input_schema import apply_input_schema
+        return apply_input_schema(df, schema)
+
+    # -------- 숫자/날짜 자동 형 변환 -------- #
+    # 안전한 숫자 변환: 각 컬럼을 개별적으로 처리
+    for col in df.columns:
+        try:
+            # Series인지 확인하고 처리
+            column_data = df[col]
+            if hasattr(column_data, 'dtype') and column_data.dtype == 'object':
+                # errors='coerce'로 변경 (변환 불가능한 값은 NaN으로)
+                numeric_series = pd.to_numeric(column_data, errors='coerce')
+                # NaN이 아닌 값이 있으면 변환 적용
+                if numeric_series.notna().any():
+                    df[col] = numeric_series.where(numeric_series.notna(), column_data)
+        except (TypeError, ValueError, AttributeError) as e:
+            # 변환할 수 없는 컬럼은 원본 유지
+            continue
+
+    return df
+
+# ------------------------------------------------------------------ #
+# 헤더 스키마 조회 (업로드 시 검증용 - 전체 파싱 없이 헤더/차원만 읽기)
+# ------------------------------------------------------------------ #
+_XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# 날짜로 표시되는 기본 제공 표시형식 ID (한국어 로캘 27~36, 50~58 포함)
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47} | set(range(50, 59))
+
+# 차원 정보가 없는 시트에서 행 수 추정에 쓰는 XML 앞부분 크기
+_PROBE_SCAN_BYTES = 256 * 1024
+
+def probe_excel_schema(file_path: str, sheet: int | str = 0, header: int | list[int] = 0,
+                       sample_rows: int = 50) -> dict:
+    """
+    Excel 파일의 헤더와 시트 차원만 읽어 스키마 반환 (전체 파싱 없음)
+    - xlsx는 zip 안의 시트 XML을 앞부분만 스트리밍하고 필요한 공유 문자열까지만 읽는다
+    - 그 외 형식(xls 등)은 read_excel_data로 전체를 읽어 정확한 값을 반환
+
+    Returns:
+        {'columns': 컬럼명 목록, 'row_count': 데이터 행 수(추정, 알 수 없으면 None),
+         'exact': row_count가 정확한 값인지, 'dtypes': 컬럼별 'number'/'date'/'text'/'bool'/'empty'}
+    """
+    header_rows = (max(header) + 1) if isinstance(header, list) else max(header + 1, 0)
+
+    if file_path.lower().endswith(_NATIVE_EXTENSIONS):
+        try:
+            rows, total_rows = _probe_rows_xlsx(file_path, sheet, header_rows + sample_rows)
+            sample = _build_dataframe(rows, header) if rows else pd.DataFrame()
+            row_count = None if total_rows is None else max(total_rows - header_rows, 0)
+            return _schema_of(sample, row_count, exact=False)
+        except (ValueError, IndexError):
+            raise
+        except Exception as e:
+            print(f"[WARN] 헤더 조회 실패, 전체 읽기로 대체: {e}")
+
+    df = read_excel_data(file_path, sheet=sheet, header=header)
+    return _schema_of(df, len(df), exact=True)
+
+def _schema_of(df: pd.DataFrame, row_count, exact: bool) -> dict:
+    return {
+        'columns': list(df.columns),
+        'row_count': row_count,
+        'exact': exact,
+        'dtypes': {col: _infer_kind(df[col]) for col in df.columns} if df.columns.is_unique else {},
+    }
+
+def _infer_kind(series: pd.Series) -> str:
+    """표본 값으로 컬럼 종류 추정 (값 종류가 섞여 있으면 text)"""
+    kinds = set(series.dropna().map(_value_kind))
+    if not kinds:
+        return 'empty'
+    return kinds.pop() if len(kinds) == 1 else 'text'
+
+def _value_kind(value) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return 'bool'
+    if isinstance(value, (int, float, np.number)):
+        return 'number'
+    if isinstance(value, (datetime, date, np.datetime64)):
+        return 'date'
+    return 'text'
+
+def _probe_rows_xlsx(file_path: str, sheet: int | str, max_rows: int) -> tuple:
+    """
+    시트 XML 앞부분에서 max_rows행을 읽어 (행 목록, 전체 행 수 추정)을 반환
+    - 전체 행 수는 dimension 요소 기준, 없으면 앞부분 행 밀도로 XML 크기에서 추정
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.cell import coordinate_from_string, column_index_from_string, range_boundaries
+
+    with zipfile.ZipFile(file_path) as zf:
+        sheet_xml, date1904 = _probe_sheet_part(zf, sheet)
+        date_styles = _probe_date_styles(zf)
+        sheet_size = zf.getinfo(sheet_xml).file_size
+
+        dimension = None
+        cells = {}                          # (행, 열) → (유형, 스타일, 원시값)
+        row_num, first_row, sampled_last = 0, None, 0
+        scan_bytes, reached_end = 0, True
+        with zf.open(sheet_xml) as f:
+            for event, elem in ET.iterparse(f, events=('end',)):
+                tag = elem.tag
+                if tag == f'{_XLSX_NS}dimension':
+                    dimension = range_boundaries(elem.get('ref'))
+                elif tag == f'{_XLSX_NS}row':
+                    row_num = int(elem.get('r', row_num + 1))
+                    if first_row is None:
+                        first_row = dimension[1] if dimension and dimension[1] else row_num
+                    if row_num < first_row + max_rows:
+                        sampled_last = row_num
+                        col_num = 0
+                        for c in elem.iter(f'{_XLSX_NS}c'):
+                            ref = c.get('r')
+                            col_num = column_index_from_string(coordinate_from_string(ref)[0]) if ref else col_num + 1
+                            cells[(row_num, col_num)] = (c.get('t', 'n'), int(c.get('s', 0)), _probe_raw_value(c))
+                    elif (dimension and dimension[3] and dimension[3] >= row_num) or f.tell() >= _PROBE_SCAN_BYTES:
+                        # 표본을 다 읽었고 전체 행 수를 알 수 있으면(차원 정보 또는 밀도 추정) 중단
+                        scan_bytes, reached_end = f.tell(), False
+                        break
+                    elem.clear()
+                elif tag == f'{_XLSX_NS}sheetData':
+                    break
+
+        if not cells:
+            return [], 0
+
+        # 공유 문자열은 필요한 인덱스까지만 읽기
+        needed = {int(raw) for kind, _, raw in cells.values() if kind == 's' and raw is not None}
+        shared = _probe_shared_strings(zf, max(needed)) if needed else []
+
+    min_row = dimension[1] if dimension and dimension[1] else min(r for r, _ in cells)
+    min_col = dimension[0] if dimension and dimension[0] else min(c for _, c in cells)
+    max_col = max(max(c for _, c in cells), (dimension[2] or 0) if dimension else 0)
+
+    rows = [
+        tuple(_probe_cell_value(cells.get((r, c)), shared, date_styles, date1904) for c in range(min_col, max_col + 1))
+        for r in range(min_row, sampled_last + 1)
+    ]
+
+    if reached_end:
+        total_rows = row_num - min_row + 1
+    elif dimension and dimension[3] and dimension[3] >= row_num:
+        total_rows = dimension[3] - min_row + 1
+    else:
+        total_rows = int((row_num - min_row + 1) * sheet_size / max(scan_bytes, 1))
+    return rows, total_rows
+
+def _probe_sheet_part(zf, sheet: int | str) -> tuple:
+    """워크북 XML에서 시트 XML 경로와 1904 날짜 체계 여부 확인"""
+    import posixpath
+    import xml.etree.ElementTree as ET
+
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    sheets = [(s.get('name'), s.get(f'{_REL_NS}id')) for s in workbook.iter(f'{_XLSX_NS}sheet')]
+    names = [name for name, _ in sheets]
+    if isinstance(sheet, str):
+        if sheet not in names:
+            raise ValueError(f"'{sheet}' 시트를 찾을 수 없습니다. 존재 시트: {names}")
+        rel_id = sheets[names.index(sheet)][1]
+    else:
+        max_idx = len(sheets) - 1
+        if not (0 <= sheet <= max_idx):
+            raise IndexError(f"시트 인덱스 {sheet} 범위 초과(0~{max_idx}).")
+        rel_id = sheets[sheet][1]
+
+    props = workbook.find(f'{_XLSX_NS}workbookPr')
+    date1904 = props is not None and props.get('date1904') in ('1', 'true')
+
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{_PKG_REL_NS}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            return path, date1904
+    raise KeyError(f"시트 관계 정보를 찾을 수 없습니다: {rel_id}")
+
+def _probe_date_styles(zf) -> set:
+    """날짜 표시형식을 쓰는 셀 스타일 인덱스"""
+    import xml.etree.ElementTree as ET
+    from openpyxl.styles.numbers import is_date_format
+
+    try:
+        styles = ET.fromstring(zf.read('xl/styles.xml'))
+    except KeyError:
+        return set()
+
+    custom_dates = {
+        int(fmt.get('numFmtId')) for fmt in styles.iter(f'{_XLSX_NS}numFmt')
+        if is_date_format(fmt.get('formatCode', ''))
+    }
+    cell_xfs = styles.find(f'{_XLSX_NS}cellXfs')
+    if cell_xfs is None:
+        return set()
+    return {
+        idx for idx, xf in enumerate(cell_xfs.iter(f'{_XLSX_NS}xf'))
+        if int(xf.get('numFmtId', 0)) in _BUILTIN_DATE_FORMATS | custom_dates
+    }
+
+def _probe_shared_strings(zf, max_index: int) -> list:
+    """공유 문자열을 max_index까지만 스트리밍으로 읽기 (윗주 rPh 제외)"""
+    import xml.etree.ElementTree as ET
+
+    strings = []
+    try:
+        f = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return strings
+    with f:
+        for event, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == f'{_XLSX_NS}si':
+                strings.append(_probe_text(elem))
+                elem.clear()
+                if len(strings) > max_index:
+                    break
+    return strings
+
+def _probe_text(elem) -> str:
+    """si/is 요소의 텍스트 (서식 있는 텍스트 조각 결합)"""
+    parts = []
+    for child in elem:
+        if child.tag == f'{_XLSX_NS}t':
+            parts.append(child.text or '')
+        elif child.tag == f'{_XLSX_NS}r':
+            parts.extend(t.text or '' for t in child.iter(f'{_XLSX_NS}t'))
+    return ''.join(parts)
+
+def _probe_raw_value(c):
+    if c.get('t') == 'inlineStr':
+        inline = c.find(f'{_XLSX_NS}is')
+        return _probe_text(inline) if inline is not None else None
+    v = c.find(f'{_XLSX_NS}v')
+    return v.text if v is not None else None
+
+def _probe_cell_value(cell, shared: list, date_styles: set, date1904: bool):
+    """원시 셀 값을 read_excel_data와 같은 파이썬 값으로 변환"""
+    if cell is None:
+        return None
+    kind, style, raw = cell
+    if raw is None:
+        return None
+    if kind == 's':
+        return shared[int(raw)]
+    if kind in ('str', 'inlineStr', 'e'):
+        return raw
+    if kind == 'b':
+        return raw == '1'
+    if kind == 'd':
+        return pd.Timestamp(raw).to_pydatetime()
+
+    if style in date_styles:
+        from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+        return from_excel(float(raw), CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900)
+    # openpyxl과 같은 규칙: 소수점/지수 표기가 있으면 실수, 아니면 정수
+    return float(raw) if '.' in raw or 'E' in raw.upper() else int(raw)
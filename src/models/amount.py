@@ -0,0 +1,83 @@
+"""
+금액 표현 - 원 단위 정수(int64)
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 모든 금액 컬럼의 표준 dtype (결측이 있는 컬럼은 nullable Int64)
+WON_DTYPE = 'int64'
+NULLABLE_WON_DTYPE = 'Int64'
+
+# 금액 컬럼 (입력 스키마의 amount 컬럼 + 대사 결과 컬럼) - 화면에 천 단위 구분자로 표시
+AMOUNT_COLUMNS = frozenset({
+    '매입에누리금액', '매입장려금금액', '매입조정금액', '매입금액', '최종매입금액',
+    '차변금액', '대변금액', '공급가액', '세액', '총액', '금액',
+    '국세청공급가액', '국세청세액', '최종지불금액', '지불예상금액',
+})
+
+# 부가세율 10% (분자/분모로 보관하여 정수 연산)
+VAT_NUMERATOR = 1
+VAT_DENOMINATOR = 10
+
+
+def to_won(values, missing: Optional[int] = None) -> pd.Series:
+    """
+    금액 컬럼을 원 단위 정수 Series로 변환
+
+    - 천 단위 구분자(,)가 있는 문자열도 처리
+    - 원 미만은 사사오입 (0.5 → 1, -0.5 → -1)
+    - 결측/변환 불가 값은 결측으로 남긴다 (결측이 있으면 Int64, 없으면 int64).
+      missing을 지정하면 결측을 그 금액으로 채워 항상 int64를 반환한다.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_integer_dtype(series.dtype):
+        if not pd.api.types.is_extension_array_dtype(series.dtype):
+            return series.astype(WON_DTYPE, copy=False)
+        if not series.hasnans:
+            return series.astype(WON_DTYPE)
+        return series.fillna(missing).astype(WON_DTYPE) if missing is not None else series.astype(NULLABLE_WON_DTYPE)
+
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        series = series.astype(str).str.replace(",", "", regex=False).str.strip()
+
+    numeric = pd.to_numeric(series, errors='coerce').astype('float64').to_numpy()
+    absent = np.isnan(numeric)
+    numeric = np.where(absent, 0.0, numeric)
+    rounded = (np.sign(numeric) * np.floor(np.abs(numeric) + 0.5)).astype(WON_DTYPE)
+    return _won_series(rounded, absent, missing, series)
+
+
+def won_values(amounts, missing: int = 0) -> np.ndarray:
+    """원 단위 금액 Series → int64 배열 (결측은 missing - 결측 행은 대사 후보에서 따로 제외해야 함)"""
+    return pd.Series(amounts).to_numpy(dtype=np.int64, na_value=missing)
+
+
+def missing_won(index: pd.Index, name: Optional[str] = None) -> pd.Series:
+    """모든 값이 결측인 금액 Series (Int64) - 대사 결과를 나중에 채우는 금액 컬럼용"""
+    return pd.Series(pd.arrays.IntegerArray(np.zeros(len(index), dtype=WON_DTYPE), np.ones(len(index), dtype=bool)),
+                     index=index, name=name)
+
+
+def vat_of(amounts: pd.Series) -> pd.Series:
+    """공급가액의 부가세 (10%, 원 미만 절사 - 0 방향, 결측은 결측)"""
+    amounts = to_won(amounts)
+    values = won_values(amounts)
+    vat = np.sign(values) * (np.abs(values) * VAT_NUMERATOR // VAT_DENOMINATOR)
+    return _won_series(vat.astype(WON_DTYPE), amounts.isna().to_numpy(), None, amounts)
+
+
+def with_vat(amounts: pd.Series) -> pd.Series:
+    """공급가액 + 부가세 (원 미만 절사)"""
+    amounts = to_won(amounts)
+    return amounts + vat_of(amounts)
+
+
+def _won_series(values: np.ndarray, absent: np.ndarray, missing: Optional[int], like: pd.Series) -> pd.Series:
+    """정수 배열 + 결측 표시 → 금액 Series (결측이 없거나 missing이 있으면 int64, 아니면 Int64)"""
+    if absent.any():
+        if missing is None:
+            return pd.Series(pd.arrays.IntegerArray(values, absent), index=like.index, name=like.name)
+        values = np.where(absent, missing, values).astype(WON_DTYPE)
+    return pd.Series(values, index=like.index, name=like.name)
@@ -7,6 +7,16 @@ from decimal import Decimal
 from datetime import date
 from .base_model import BaseModel
 
+
+def _to_decimal(value) -> Decimal:
+    """Decimal 변환 (Decimal은 그대로, 정수는 문자열 경유 없이 변환)"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
 @dataclass
 class Purchase(BaseModel):
     """매입 데이터"""
@@ -28,13 +38,13 @@ class Purchase(BaseModel):
         self.supplier_code = str(self.supplier_code)
         self.product_code = str(self.product_code)
 
-        # Decimal 변환
-        self.purchase_quantity = Decimal(str(self.purchase_quantity))
-        self.discount_amount = Decimal(str(self.discount_amount))
-        self.incentive_amount = Decimal(str(self.incentive_amount))
-        self.adjustment_amount = Decimal(str(self.adjustment_amount))
-        self.purchase_amount = Decimal(str(self.purchase_amount))
-        self.final_amount = Decimal(str(self.final_amount))
+        # Decimal 변환 (이미 Decimal이면 그대로 사용)
+        self.purchase_quantity = _to_decimal(self.purchase_quantity)
+        self.discount_amount = _to_decimal(self.discount_amount)
+        self.incentive_amount = _to_decimal(self.incentive_amount)
+        self.adjustment_amount = _to_decimal(self.adjustment_amount)
+        self.purchase_amount = _to_decimal(self.purchase_amount)
+        self.final_amount = _to_decimal(self.final_amount)
 
     @property
     def year(self) -> int:
@@ -69,7 +79,7 @@ class PurchaseSummary(BaseModel):
     def __post_init__(self):
         """초기화 후 처리"""
         self.supplier_code = str(self.supplier_code)
-        self.total_amount = Decimal(str(self.total_amount))
+        self.total_amount = _to_decimal(self.total_amount)
 
     @property
     def key(self) -> str:
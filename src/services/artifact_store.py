@@ -0,0 +1,153 @@
+"""
+대사 중간 산출물 저장소 - 바뀐 입력 파일의 하위 단계만 다시 계산
+"""
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from src.services.disk_cache import (
+    atomic_write, parquet_supported, read_parquet, remove_file, resolve_cache_dir, write_parquet
+)
+
+# 산출물에 영향을 주는 코드 (프로젝트 기준 경로) - 내용이 바뀌면 이전 산출물은 자동으로 무효화
+CODE_PATHS = ('kfunction.py', os.path.join('src', 'models'), os.path.join('src', 'services'))
+
+
+class ArtifactStore:
+    """
+    단계별 중간 산출물(DataFrame 등)을 단계 키와 함께 보관
+
+    - 단계 키는 대사 코드 해시(code_version)와 해당 단계가 의존하는 값(입력 파일 내용 해시,
+      입력 스키마, 대사 설정, 상위 단계 키)으로 만든다 (stage_key).
+      키가 같으면 저장된 산출물을 그대로 재사용할 수 있다.
+    - DataFrame은 Parquet, 그 외 값(경고 목록 등)은 단계별 목록 파일(JSON)에 저장한다.
+      실행 코드가 들어갈 수 있는 pickle은 쓰지도 읽지도 않는다.
+    - 단계마다 가장 최근 실행의 산출물 하나만 보관하므로 디스크 사용량이 늘지 않는다.
+    """
+
+    def __init__(self, store_dir: str, code_version: str):
+        self.store_dir = store_dir
+        self.code_version = code_version
+
+    def stage_key(self, stage: str, *parts) -> str:
+        """단계 이름 + 의존 값(입력 해시, 스키마, 설정, 상위 단계 키)으로 단계 키 생성"""
+        text = "|".join([self.code_version, stage] + [repr(part) for part in parts])
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        """저장된 산출물 반환 (없거나 키가 다르면 None)"""
+        manifest_path = self._manifest_path(stage)
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('key') != key:
+                return None
+            artifacts = {}
+            for name, entry in manifest['artifacts'].items():
+                if entry['kind'] == 'frame':
+                    artifacts[name] = read_parquet(os.path.join(self.store_dir, entry['file']))
+                else:
+                    artifacts[name] = entry['value']
+            return artifacts
+        except Exception as e:
+            print(f"[WARN] 중간 산출물 읽기 실패, 삭제: {stage} ({e})")
+            self._remove_stage(stage)
+            return None
+
+    def put(self, stage: str, key: str, artifacts: Dict[str, Any]):
+        """
+        산출물 저장 (실패해도 예외를 전파하지 않음)
+
+        DataFrame 파일을 먼저 쓰고 목록 파일을 마지막에 교체하므로, 중간에 멈춰도
+        이전 목록이 가리키는 파일은 그대로 남는다. 저장할 수 없는 값이 있으면 경고 후 저장하지 않는다.
+        """
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            entries = {}
+            for name, value in artifacts.items():
+                if not isinstance(value, pd.DataFrame):
+                    if json.loads(json.dumps(value, ensure_ascii=False)) != value:
+                        raise TypeError(f"JSON으로 그대로 저장할 수 없는 값: {name}")
+                    entries[name] = {'kind': 'value', 'value': value}
+            for name, value in artifacts.items():
+                if isinstance(value, pd.DataFrame):
+                    file_name = f"{stage}.{key[:12]}.{name}.parquet"
+                    atomic_write(os.path.join(self.store_dir, file_name),
+                                 lambda path, value=value: write_parquet(value, path))
+                    entries[name] = {'kind': 'frame', 'file': file_name}
+
+            atomic_write(self._manifest_path(stage), lambda path: self._write_manifest(path, key, entries))
+        except Exception as e:
+            print(f"[WARN] 중간 산출물 저장 안 함: {stage} ({e})")
+            return
+        keep = {entry['file'] for entry in entries.values() if entry['kind'] == 'frame'}
+        self._remove_stage(stage, keep={os.path.basename(self._manifest_path(stage))} | keep)
+
+    def clear(self):
+        """저장된 산출물 전체 삭제"""
+        if not os.path.isdir(self.store_dir):
+            return
+        for name in os.listdir(self.store_dir):
+            if name.endswith(('.parquet', '.json', '.pkl')):
+                remove_file(os.path.join(self.store_dir, name))
+
+    def _manifest_path(self, stage: str) -> str:
+        return os.path.join(self.store_dir, f"{stage}.json")
+
+    @staticmethod
+    def _write_manifest(path: str, key: str, entries: Dict[str, Any]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'artifacts': entries}, f, ensure_ascii=False)
+
+    def _remove_stage(self, stage: str, keep=frozenset()):
+        """단계의 파일 삭제 (keep에 있는 파일 제외, 이전 형식 파일 포함)"""
+        if not os.path.isdir(self.store_dir):
+            return
+        for name in os.listdir(self.store_dir):
+            if name.startswith(stage + '.') and name not in keep and not name.endswith('.tmp'):
+                remove_file(os.path.join(self.store_dir, name))
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(project_root: str) -> Optional[str]:
+    """대사 코드(CODE_PATHS 아래 .py 파일) 내용 해시 (소스를 읽을 수 없으면 None)"""
+    files = []
+    for code_path in CODE_PATHS:
+        full_path = os.path.join(project_root, code_path)
+        if os.path.isfile(full_path):
+            files.append(full_path)
+        for directory, _, names in os.walk(full_path):
+            files.extend(os.path.join(directory, name) for name in names if name.endswith('.py'))
+    if not files:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        for file_path in sorted(files):
+            digest.update(os.path.relpath(file_path, project_root).replace(os.sep, '/').encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def open_artifact_store(project_root: str) -> Optional[ArtifactStore]:
+    """캐시 디렉터리 아래 artifacts 폴더의 저장소 (디스크 캐시가 꺼져 있거나 사용할 수 없으면 None)"""
+    cache_dir = resolve_cache_dir(project_root)
+    if not cache_dir:
+        return None
+    if not parquet_supported():
+        print("[WARN] pyarrow가 설치되어 있지 않아 중간 산출물을 재사용하지 않습니다")
+        return None
+    version = code_version(project_root)
+    if version is None:
+        print("[WARN] 대사 코드를 읽을 수 없어 중간 산출물을 재사용하지 않습니다")
+        return None
+    return ArtifactStore(os.path.join(cache_dir, 'artifacts'), version)
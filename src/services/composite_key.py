@@ -0,0 +1,50 @@
+"""
+정수 복합 키 - 여러 키 컬럼을 int64 하나로 묶어 그룹화/조인에 사용 (문자열 키는 표시용으로만 생성)
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def dictionary_codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    값 → 정수 코드 (int64, 결측은 -1)
+
+    코드는 값의 정렬 순서를 따르므로 코드 순서가 원래 값(문자열 코드 등)의 정렬 순서와 같다.
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def lookup_codes(values: pd.Series, uniques: pd.Index) -> np.ndarray:
+    """다른 DataFrame의 값을 dictionary_codes의 코드로 변환 (사전에 없거나 결측이면 -1)"""
+    return uniques.get_indexer(pd.Index(values)).astype(np.int64, copy=False)
+
+
+def pack_codes(codes: Sequence[np.ndarray], sizes: Sequence[int]) -> np.ndarray:
+    """
+    코드 배열들을 혼합 진법으로 묶은 int64 키
+
+    - 앞 컬럼이 상위 자리이므로 키 순서가 컬럼 순서대로의 사전식 정렬 순서와 같다.
+    - 한 컬럼이라도 코드가 -1(결측)인 행의 키는 -1.
+    - 자리 수 곱이 int64 범위를 넘으면 중간 키를 다시 조밀한 코드로 바꿔서 이어 묶는다.
+      이때 키 값은 데이터에 따라 달라지므로, 서로 비교할 키는 한 번의 호출로 만들어야 한다.
+    """
+    key = np.zeros(len(codes[0]), dtype=np.int64)
+    missing = np.zeros(len(key), dtype=bool)
+    span = 1
+    for column_codes, size in zip(codes, sizes):
+        size = max(int(size), 1)
+        if span * size > INT64_MAX:
+            key, uniques = pd.factorize(key, sort=True)
+            key = key.astype(np.int64, copy=False)
+            span = len(uniques)
+        column_codes = np.asarray(column_codes, dtype=np.int64)
+        key = key * size + column_codes
+        span *= size
+        missing |= column_codes < 0
+    key[missing] = -1
+    return key
@@ -4,19 +4,42 @@
 from typing import List, Dict, Optional, Tuple, Any
 from decimal import Decimal
 import pandas as pd
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import os
 
+from src.models.amount import to_won
 from src.models import (
     Supplier, SupplierProduct, Purchase, PurchaseSummary,
     TaxInvoice, TaxInvoiceWIS, Payment, PaymentLedger,
     ProcessingFee
 )
 
+# 캐시에서 꺼낸 DataFrame은 복사 없이 공유하므로 Copy-on-Write 필요 (pandas 3.0부터 기본값)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# 파일 캐시 메모리 예산 기본값 (MB, 환경변수 SUBCON_CACHE_BUDGET_MB로 변경)
+DEFAULT_CACHE_BUDGET_MB = 1024
+
+
+class CacheEntry:
+    """파일 캐시 항목"""
+    __slots__ = ('signature', 'data', 'nbytes')
+
+    def __init__(self, signature: Optional[Tuple[int, int]], data: pd.DataFrame, nbytes: int):
+        self.signature = signature      # 원본 파일 (크기, 수정시각)
+        self.data = data
+        self.nbytes = nbytes
+
+
 class DataManager:
     """데이터 통합 관리 클래스"""
 
-    def __init__(self):
+    def __init__(self, cache_budget_bytes: Optional[int] = None):
+        """
+        Args:
+            cache_budget_bytes: 파일 캐시 메모리 예산 (None이면 SUBCON_CACHE_BUDGET_MB 또는 기본값)
+        """
         # 데이터 저장소
         self.suppliers: Dict[str, Supplier] = {}
         self.supplier_products: List[SupplierProduct] = []
@@ -28,8 +51,15 @@ class DataManager:
         self.payment_ledgers: Dict[str, PaymentLedger] = {}
         self.processing_fees: List[ProcessingFee] = []
         
-        # 파일 캐시 추가
-        self._file_cache: Dict[str, pd.DataFrame] = {}
+        # 파일 캐시 추가 (LRU 순서 - 마지막이 가장 최근 사용)
+        self._file_cache: 'OrderedDict[Tuple[str, str], CacheEntry]' = OrderedDict()
+        if cache_budget_bytes is None:
+            cache_budget_bytes = int(os.environ.get('SUBCON_CACHE_BUDGET_MB', DEFAULT_CACHE_BUDGET_MB)) * 1024 * 1024
+        self.cache_budget_bytes = cache_budget_bytes
+        self._cache_bytes = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
 
     def clear_all(self):
         """모든 데이터 초기화"""
@@ -42,32 +72,93 @@ class DataManager:
         self.payments.clear()
         self.payment_ledgers.clear()
         self.processing_fees.clear()
-        self._file_cache.clear()  # 파일 캐시도 초기화
+        self.clear_file_cache()  # 파일 캐시도 초기화
 
     # 파일 캐싱 관련 메서드
-    def cache_file_data(self, file_path: str, data: pd.DataFrame):
-        """파일 데이터 캐싱"""
-        normalized_path = os.path.normpath(file_path).lower()  # 경로 정규화
-        self._file_cache[normalized_path] = data.copy()  # 데이터 복사본 저장
+    def _cache_key(self, file_path: str, variant: str = '') -> Tuple[str, str]:
+        """캐시 키 - 정규화 경로 + 읽기 옵션(시트/헤더)"""
+        return os.path.normpath(file_path).lower(), variant
+
+    @staticmethod
+    def _file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+        """원본 파일 크기/수정시각 (같은 경로에 덮어쓴 파일 감지용)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def cache_file_data(self, file_path: str, data: pd.DataFrame, variant: str = ''):
+        """
+        파일 데이터 캐싱 - 예산을 넘으면 가장 오래 사용하지 않은 항목부터 제거
+        (얕은 복사 + Copy-on-Write이므로 호출자가 원본을 수정해도 캐시는 그대로)
+        """
+        key = self._cache_key(file_path, variant)
+        self._drop_entry(key)
+
+        nbytes = int(data.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.cache_budget_bytes:
+            print(f"[INFO] '{file_path}' 캐시 생략 ({nbytes / 1024 / 1024:.1f}MB, 예산 초과)")
+            return
+
+        self._file_cache[key] = CacheEntry(self._file_signature(file_path), data.copy(deep=False), nbytes)
+        self._cache_bytes += nbytes
+        while self._cache_bytes > self.cache_budget_bytes:
+            evicted_key, _ = next(iter(self._file_cache.items()))
+            self._drop_entry(evicted_key)
+            self._cache_evictions += 1
         
-    def get_cached_data(self, file_path: str) -> Optional[pd.DataFrame]:
-        """캐싱된 데이터 반환"""
-        normalized_path = os.path.normpath(file_path).lower()
-        return self._file_cache.get(normalized_path)
+    def get_cached_data(self, file_path: str, variant: str = '') -> Optional[pd.DataFrame]:
+        """
+        캐싱된 데이터 반환 (원본 파일이 바뀌었으면 항목을 버리고 None)
+        반환값은 Copy-on-Write 뷰이므로 수정해도 캐시에 영향 없음
+        """
+        key = self._cache_key(file_path, variant)
+        entry = self._lookup(key, file_path)
+        if entry is None:
+            self._cache_misses += 1
+            return None
+        self._cache_hits += 1
+        self._file_cache.move_to_end(key)
+        return entry.data.copy(deep=False)
         
-    def is_file_cached(self, file_path: str) -> bool:
-        """파일이 캐싱되어 있는지 확인"""
-        normalized_path = os.path.normpath(file_path).lower()
-        return normalized_path in self._file_cache
+    def is_file_cached(self, file_path: str, variant: str = '') -> bool:
+        """파일이 캐싱되어 있는지 확인 (LRU 순서/통계에 영향 없음)"""
+        return self._lookup(self._cache_key(file_path, variant), file_path) is not None
         
     def clear_file_cache(self):
         """파일 캐시만 초기화"""
         self._file_cache.clear()
+        self._cache_bytes = 0
         
     def get_cache_size(self) -> int:
         """캐시된 파일 수 반환"""
         return len(self._file_cache)
 
+    def get_cache_stats(self) -> Dict[str, int]:
+        """파일 캐시 통계 (항목 수, 사용/예산 바이트, 적중/미스/제거 횟수)"""
+        return {
+            'entries': len(self._file_cache),
+            'bytes': self._cache_bytes,
+            'budget_bytes': self.cache_budget_bytes,
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'evictions': self._cache_evictions,
+        }
+
+    def _lookup(self, key: Tuple[str, str], file_path: str) -> Optional[CacheEntry]:
+        """유효한 캐시 항목 조회 - 원본 파일이 바뀐 항목은 제거"""
+        entry = self._file_cache.get(key)
+        if entry is not None and entry.signature != self._file_signature(file_path):
+            self._drop_entry(key)
+            entry = None
+        return entry
+
+    def _drop_entry(self, key: Tuple[str, str]):
+        entry = self._file_cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry.nbytes
+
     # 협력사 관련 메서드
     def add_supplier(self, supplier: Supplier):
         """협력사 추가"""
@@ -95,20 +186,37 @@ class DataManager:
 
     def load_purchases_from_df(self, df: pd.DataFrame):
         """DataFrame에서 매입 데이터 로드"""
-        for _, row in df.iterrows():
+        # 금액 컬럼은 컬럼 단위로 원 단위 정수 변환 (행별 Decimal(str(...)) 변환 제거)
+        amount_columns = ['매입에누리금액', '매입장려금금액', '매입조정금액', '매입금액', '최종매입금액']
+        amounts = {
+            col: to_won(df[col], missing=0).tolist() if col in df.columns else [0] * len(df)
+            for col in amount_columns
+        }
+        quantities = (
+            pd.to_numeric(df['매입확정수량'], errors='coerce').fillna(0).tolist()
+            if '매입확정수량' in df.columns else [0] * len(df)
+        )
+        year_months = pd.to_numeric(df['년월'], errors='coerce').astype('int64').astype(str).tolist()
+        supplier_codes = df['협력사코드'].astype(str).tolist()
+        supplier_names = df['협력사명'].tolist()
+        product_codes = df['단품코드'].astype(str).tolist() if '단품코드' in df.columns else [''] * len(df)
+        product_names = df['단품명'].tolist() if '단품명' in df.columns else [''] * len(df)
+        tax_types = df['면과세구분명'].tolist() if '면과세구분명' in df.columns else ['과세'] * len(df)
+
+        for i in range(len(df)):
             purchase = Purchase(
-                year_month=str(int(row['년월'])),
-                supplier_code=str(row['협력사코드']),
-                supplier_name=row['협력사명'],
-                product_code=str(row.get('단품코드', '')),
-                product_name=row.get('단품명', ''),
-                tax_type=row.get('면과세구분명', '과세'),
-                purchase_quantity=Decimal(str(row.get('매입확정수량', 0))),
-                discount_amount=Decimal(str(row.get('매입에누리금액', 0))),
-                incentive_amount=Decimal(str(row.get('매입장려금금액', 0))),
-                adjustment_amount=Decimal(str(row.get('매입조정금액', 0))),
-                purchase_amount=Decimal(str(row.get('매입금액', 0))),
-                final_amount=Decimal(str(row.get('최종매입금액', 0)))
+                year_month=year_months[i],
+                supplier_code=supplier_codes[i],
+                supplier_name=supplier_names[i],
+                product_code=product_codes[i],
+                product_name=product_names[i],
+                tax_type=tax_types[i],
+                purchase_quantity=Decimal(str(quantities[i])),
+                discount_amount=Decimal(amounts['매입에누리금액'][i]),
+                incentive_amount=Decimal(amounts['매입장려금금액'][i]),
+                adjustment_amount=Decimal(amounts['매입조정금액'][i]),
+                purchase_amount=Decimal(amounts['매입금액'][i]),
+                final_amount=Decimal(amounts['최종매입금액'][i])
             )
             self.add_purchase(purchase)
 
@@ -208,7 +316,7 @@ class DataManager:
                 '협력사코드': summary.supplier_code,
                 '협력사명': summary.supplier_name,
                 '면과세구분명': summary.tax_type,
-                '최종매입금액': float(summary.total_amount),
+                '최종매입금액': int(summary.total_amount),
                 'key': summary.key
             })
 
@@ -0,0 +1,304 @@
+"""
+날짜 입력 정규화 - 컬럼 단위로 값 형식을 판별해 한 번의 벡터 연산으로 naive datetime64[ns] 변환
+
+판별 형식
+- datetime: datetime/Timestamp 객체 (COM의 pywintypes 포함, timezone이 있으면 벽시계 시각 유지하고 제거)
+- serial: Excel 날짜 일련번호 (1900 날짜 체계)
+- yyyymmdd: 8자리 정수 날짜 (20240105)
+- text:<형식>: 날짜 문자열 (ISO8601 또는 strptime 형식)
+- mixed: 위 종류가 섞인 컬럼 - 값 종류별로 나눠 각각 변환
+
+판별한 형식은 파일 레이아웃(헤더 구성) + 컬럼별로 기억하고 디스크 캐시 폴더에 보관하여,
+같은 양식의 다음 파일은 판별 없이 바로 변환한다 (변환되지 않는 값이 생기면 다시 판별).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Excel 1900 날짜 체계 기준일 (일련번호 1 = 1900-01-01, 1900-02-29 버그 이후 구간 기준)
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+# 일련번호 유효 범위 (1900-01-01 ~ 9999-12-31)
+SERIAL_RANGE = (1, 2958465)
+# 8자리 정수 날짜 범위
+YYYYMMDD_RANGE = (19000101, 99991231)
+
+# 문자열 형식 판별 후보 (앞에서부터 시도) 및 판별에 쓰는 표본 크기
+TEXT_FORMATS = ('ISO8601', '%Y.%m.%d', '%Y/%m/%d', '%Y.%m.%d %H:%M:%S', '%Y/%m/%d %H:%M:%S', '%Y%m%d')
+SAMPLE_SIZE = 200
+
+FORMAT_CACHE_FILE = 'date_formats.json'
+
+
+def layout_digest(columns: Iterable) -> str:
+    """파일 레이아웃(헤더 구성) 구분용 해시"""
+    text = "\x1f".join(str(column) for column in columns)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def normalize_dates(series: pd.Series, layout_key: Optional[str] = None) -> pd.Series:
+    """
+    날짜 컬럼을 naive datetime64[ns]로 변환 (변환 불가 값은 NaT)
+
+    Args:
+        layout_key: 판별 형식을 기억할 키 (파일 레이아웃 + 컬럼). None이면 매번 판별
+    """
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        return series.dt.tz_localize(None).astype('datetime64[ns]')
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return series.astype('datetime64[ns]')
+
+    if layout_key is not None:
+        cached = _format_cache().get(layout_key)
+        if cached is not None:
+            try:
+                converted = _convert(series, cached)
+            except (ValueError, TypeError, AttributeError):
+                # 기억한 형식과 값 종류가 다른 파일
+                converted = None
+            if converted is not None and not _has_unparsed(series, converted):
+                return converted
+
+    detected = detect_date_format(series)
+    converted = _convert(series, detected)
+    if layout_key is not None and detected != 'mixed' and converted.notna().any():
+        _format_cache().remember(layout_key, detected)
+    return converted
+
+
+def detect_date_format(series: pd.Series) -> str:
+    """컬럼 값 형식 판별 (값 종류는 C 수준 추론, 문자열 형식은 표본으로 판별)"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return 'mixed'
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return _number_format(series)
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ('datetime', 'datetime64', 'date'):
+        return 'datetime'
+    if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+        return _number_format(series)
+    if inferred == 'string':
+        return _text_format(series)
+    if inferred == 'empty':
+        return 'datetime'
+    return 'mixed'
+
+
+def _number_format(series: pd.Series) -> str:
+    numbers = pd.to_numeric(series, errors='coerce').dropna()
+    if len(numbers) and (numbers == np.floor(numbers)).all() and numbers.between(*YYYYMMDD_RANGE).all():
+        return 'yyyymmdd'
+    return 'serial'
+
+
+def _text_format(series: pd.Series) -> str:
+    texts = series.dropna().head(SAMPLE_SIZE).astype(str).str.strip()
+    sample = texts[texts != ""]
+    if len(sample) == 0:
+        return 'datetime'
+    for candidate in TEXT_FORMATS:
+        try:
+            parsed = pd.to_datetime(sample, format=candidate, errors='coerce')
+        except (ValueError, TypeError):
+            # 서로 다른 timezone offset이 섞인 ISO 문자열 등
+            continue
+        if parsed.notna().all():
+            return f"text:{candidate}"
+    return 'text:mixed'
+
+
+def _convert(series: pd.Series, fmt: str) -> pd.Series:
+    """판별 형식으로 컬럼 전체 변환"""
+    if fmt == 'datetime':
+        return _from_datetimes(series)
+    if fmt == 'serial':
+        return _from_serials(series)
+    if fmt == 'yyyymmdd':
+        return _from_yyyymmdd(series)
+    if fmt.startswith('text:'):
+        return _from_texts(series, fmt[len('text:'):])
+    return _from_mixed(series)
+
+
+def _from_datetimes(series: pd.Series) -> pd.Series:
+    try:
+        values = pd.to_datetime(series, errors='coerce')
+    except (ValueError, TypeError):
+        values = None
+    if values is None or _lost(series, values).any():
+        # naive/aware 또는 서로 다른 timezone이 섞인 경우
+        return _from_each(series)
+    return _naive(values)
+
+
+def _from_serials(series: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    valid = (numbers >= SERIAL_RANGE[0]) & (numbers <= SERIAL_RANGE[1])
+    # 일 단위 실수 → 밀리초 반올림 (Excel 시각 정밀도)
+    millis = np.round(np.where(valid, numbers, 0) * 86_400_000).astype(np.int64)
+    values = EXCEL_EPOCH.to_datetime64().astype('datetime64[ms]') + millis.astype('timedelta64[ms]')
+    values = values.astype('datetime64[ns]')
+    values[~valid] = np.datetime64('NaT')
+    return pd.Series(values, index=series.index)
+
+
+def _from_yyyymmdd(series: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(series, errors='coerce')
+    texts = numbers.where(numbers.between(*YYYYMMDD_RANGE)).astype('Int64').astype(str)
+    return pd.to_datetime(texts, format='%Y%m%d', errors='coerce').astype('datetime64[ns]')
+
+
+def _from_texts(series: pd.Series, fmt: str) -> pd.Series:
+    try:
+        values = _naive(pd.to_datetime(series, format=fmt, errors='coerce'))
+        # 앞뒤 공백이 있는 값만 다시 변환
+        retry = _lost(series, values)
+        if retry.any():
+            stripped = series[retry].astype(object).str.strip()
+            values[retry] = _naive(pd.to_datetime(stripped, format=fmt, errors='coerce')).to_numpy()
+    except (ValueError, TypeError):
+        return _from_each(series)
+    return values
+
+
+def _from_mixed(series: pd.Series) -> pd.Series:
+    """값 종류(날짜 객체/숫자/문자열)별로 나눠 각각 한 번씩 변환"""
+    values = series.to_numpy(dtype=object)
+    kinds = np.fromiter((_value_kind(value) for value in values), dtype=np.int8, count=len(values))
+    result = np.full(len(values), np.datetime64('NaT', 'ns'))
+    for kind in (1, 2, 3):
+        mask = kinds == kind
+        if mask.any():
+            part = pd.Series(values[mask])
+            result[mask] = _convert(part, _KIND_FORMATS[kind](part)).to_numpy()
+    return pd.Series(result, index=series.index)
+
+
+def _value_kind(value) -> int:
+    """0: 결측/기타, 1: 날짜 객체, 2: 숫자, 3: 문자열"""
+    if isinstance(value, (datetime, date, np.datetime64)):
+        return 1
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        return 0 if value != value else 2
+    return 0
+
+
+_KIND_FORMATS = {
+    1: lambda part: 'datetime',
+    2: _number_format,
+    3: _text_format,
+}
+
+
+def _from_each(series: pd.Series) -> pd.Series:
+    """값 단위 변환 (벡터 변환이 불가능한 혼합 timezone 컬럼용)"""
+    converted = []
+    for value in series.to_numpy(dtype=object):
+        try:
+            stamp = pd.Timestamp(value)
+        except (ValueError, TypeError):
+            stamp = pd.NaT
+        if stamp is not pd.NaT and stamp.tzinfo is not None:
+            stamp = stamp.tz_localize(None)
+        converted.append(stamp)
+    return pd.Series(pd.to_datetime(converted, errors='coerce'), index=series.index).astype('datetime64[ns]')
+
+
+def _naive(values: pd.Series) -> pd.Series:
+    """timezone이 있으면 벽시계 시각을 유지하고 제거"""
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = values.dt.tz_localize(None)
+    return values.astype('datetime64[ns]')
+
+
+def _lost(original: pd.Series, converted: pd.Series) -> np.ndarray:
+    """원본 값이 있는데 NaT가 된 행 (NaT 행에 대해서만 원본 결측 확인)"""
+    lost = converted.isna().to_numpy(dtype=bool, copy=True)
+    if lost.any():
+        lost[lost] = original[lost].notna().to_numpy(dtype=bool)
+    return lost
+
+
+def _has_unparsed(original: pd.Series, converted: pd.Series) -> bool:
+    """원본 값이 있는데 NaT가 된 행이 있는지"""
+    unparsed = _lost(original, converted)
+    if not unparsed.any():
+        return False
+    # 빈 문자열은 원래 날짜가 없는 값
+    return any(not (isinstance(value, str) and value.strip() == "") for value in original.to_numpy(dtype=object)[unparsed])
+
+
+class DateFormatCache:
+    """
+    레이아웃 키 → 판별 형식
+
+    디스크 캐시 폴더가 있으면 JSON 파일로 보관한다 (프로세스 풀 로드/재시작 후에도 유지).
+    여러 프로세스가 동시에 저장하면 마지막 저장이 남으며, 잃은 항목은 다음 로드에서 다시 판별한다.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._formats: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._load().get(key)
+
+    def remember(self, key: str, fmt: str):
+        with self._lock:
+            formats = self._load()
+            if formats.get(key) == fmt:
+                return
+            formats[key] = fmt
+            self._save(formats)
+
+    def _load(self) -> Dict[str, str]:
+        if self._formats is None:
+            self._formats = {}
+            if self.path:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._formats = dict(json.load(f))
+                except (OSError, ValueError, TypeError):
+                    pass
+        return self._formats
+
+    def _save(self, formats: Dict[str, str]):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(formats, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except Exception as e:
+            print(f"[WARN] 날짜 형식 캐시 저장 실패: {e}")
+
+
+_cache: Optional[DateFormatCache] = None
+
+
+def _format_cache() -> DateFormatCache:
+    global _cache
+    if _cache is None:
+        from src.services.disk_cache import resolve_cache_dir
+        cache_dir = resolve_cache_dir(PROJECT_ROOT)
+        _cache = DateFormatCache(os.path.join(cache_dir, FORMAT_CACHE_FILE) if cache_dir else None)
+    return _cache
@@ -0,0 +1,307 @@
+"""
+파싱된 Excel 데이터의 디스크 캐시 - 재시작 후에도 xlsx 파싱 생략
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.services.file_snapshot import content_digest
+
+
+class DiskCache:
+    """
+    파싱된 DataFrame을 열 지향 형식(Parquet)으로 디스크에 보관하는 캐시
+
+    - 항목 파일명은 원본 파일 내용 해시 + 읽기 옵션(시트/헤더)으로 결정되므로
+      같은 경로에 다른 파일을 덮어쓰면 자동으로 새 항목을 사용한다.
+    - 경로별 (크기, 수정시각, 해시) 색인을 두어 크기/수정시각이 같으면 해시 계산을 생략한다.
+    - Parquet로 그대로 표현할 수 없는 데이터(스키마에 없는 혼합 타입 컬럼 등)는 경고 후 캐시하지 않는다.
+      실행 코드가 들어갈 수 있는 pickle은 쓰지도 읽지도 않는다.
+    """
+
+    # 파서 로직이 바뀌면 올려서 이전 항목을 무효화
+    FORMAT_VERSION = 4
+
+    INDEX_FILE = 'index.json'
+
+    # Parquet 스키마 메타데이터에 원래 컬럼 이름/형식을 보관하는 키
+    METADATA_KEY = b'subcon'
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._index = None
+
+    # ---------- 공개 API ----------
+    def get(self, file_path: str, variant: str = '') -> Optional[pd.DataFrame]:
+        """캐시된 DataFrame 반환 (없거나 원본이 바뀌었으면 None)"""
+        digest = self._content_digest(file_path)
+        if digest is None:
+            return None
+
+        entry_path = self._entry_stem(digest, variant) + '.parquet'
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            return read_parquet(entry_path)
+        except Exception as e:
+            print(f"[WARN] 디스크 캐시 읽기 실패, 항목 삭제: {entry_path} ({e})")
+            remove_file(entry_path)
+            return None
+
+    def put(self, file_path: str, df: pd.DataFrame, variant: str = ''):
+        """DataFrame을 디스크 캐시에 저장 (실패해도 예외를 전파하지 않음)"""
+        digest = self._content_digest(file_path)
+        if digest is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(self._entry_stem(digest, variant) + '.parquet', lambda path: write_parquet(df, path))
+        except Exception as e:
+            print(f"[WARN] 디스크 캐시에 저장하지 않음: {file_path} ({e})")
+
+    def clear(self):
+        """디스크 캐시 전체 삭제"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.parquet', '.pkl', '.json')):
+                remove_file(os.path.join(self.cache_dir, name))
+        self._index = None
+
+    # ---------- 키/색인 ----------
+    def _content_digest(self, file_path: str) -> Optional[str]:
+        """원본 파일 내용 해시 - 크기/수정시각이 색인과 같으면 저장된 해시 재사용"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        index = self._load_index()
+        path_key = os.path.normcase(os.path.abspath(file_path))
+        entry = index.get(path_key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['digest']
+
+        digest = content_digest(file_path)
+        index[path_key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        if entry and entry['digest'] != digest:
+            self._prune_digest(entry['digest'])
+        self._save_index()
+        return digest
+
+    def _prune_digest(self, digest: str):
+        """덮어써져 더 이상 어떤 경로도 가리키지 않는 내용의 항목 삭제"""
+        if any(item['digest'] == digest for item in self._index.values()):
+            return
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(digest + '_'):
+                remove_file(os.path.join(self.cache_dir, name))
+
+    def _entry_stem(self, digest: str, variant: str) -> str:
+        options = hashlib.blake2b(f"{self.FORMAT_VERSION}|{variant}".encode('utf-8'), digest_size=6).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}_{options}")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(self._index_path, self._write_index)
+        except Exception as e:
+            print(f"[WARN] 디스크 캐시 색인 저장 실패: {e}")
+
+    def _write_index(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False)
+
+
+def atomic_write(path: str, writer):
+    """임시 파일에 쓴 뒤 교체 (동시 실행/중단 시 깨진 항목 방지)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        remove_file(tmp_path)
+        raise
+
+
+def remove_file(path: str):
+    """파일 삭제 (없거나 삭제할 수 없으면 무시)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def parquet_supported() -> bool:
+    """Parquet 입출력(pyarrow) 사용 가능 여부"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """
+    DataFrame을 Parquet로 저장 (원래 컬럼 이름/형식/인덱스는 스키마 메타데이터에 보관)
+
+    - object 컬럼은 값 종류가 한 가지(문자열/정수/실수/불리언/날짜 + 결측)인 경우만 저장하고
+      읽을 때 다시 object로 되돌린다 (스키마 형식 컬럼은 로드 시 이미 Parquet 형식으로 변환됨)
+    - 저장 후 다시 읽어 원본과 같은지 확인하고, 다르면 TypeError
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frame, metadata = _storable_frame(df)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        DiskCache.METADATA_KEY: json.dumps(metadata, ensure_ascii=False).encode('utf-8'),
+    })
+    pq.write_table(table, path, compression='zstd')
+
+    restored = read_parquet(path)
+    if not (restored.columns.equals(df.columns) and restored.index.equals(df.index)
+            and restored.dtypes.equals(df.dtypes) and restored.equals(df)):
+        raise TypeError("Parquet 왕복 후 데이터가 달라집니다")
+
+
+def read_parquet(path: str) -> pd.DataFrame:
+    """write_parquet으로 저장한 DataFrame 읽기"""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    metadata = json.loads(table.schema.metadata[DiskCache.METADATA_KEY].decode('utf-8'))
+    df = table.to_pandas()
+    for position in metadata['objects']:
+        df.isetitem(int(position), _to_objects(df.iloc[:, int(position)]))
+
+    index = metadata['index']
+    if index is not None:
+        values = df.iloc[:, -1]
+        df = df.iloc[:, :-1]
+        df.index = pd.Index(_to_objects(values) if index['object'] else values)
+        df.index.name = index['name']
+
+    labels = metadata['columns']
+    if metadata['multi_index']:
+        df.columns = pd.MultiIndex.from_tuples([tuple(label) for label in labels])
+    else:
+        df.columns = pd.Index(labels, dtype=None if all(isinstance(label, str) for label in labels) else object)
+    return df
+
+
+# object 컬럼 값 종류(infer_dtype) → 저장 형식 (없는 종류는 저장하지 않음)
+_OBJECT_STORAGE = {
+    'string': None,
+    'empty': None,
+    'integer': 'Int64',
+    'floating': 'float64',
+    'boolean': 'boolean',
+    'datetime': 'datetime64[ns]',
+    'datetime64': 'datetime64[ns]',
+}
+
+
+def _storable_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, dict]:
+    """Parquet로 저장할 프레임(컬럼명 c0, c1, ..., 인덱스는 마지막 컬럼)과 복원용 메타데이터"""
+    if df.shape[1] == 0:
+        raise TypeError("컬럼이 없는 DataFrame")
+    columns = [df.iloc[:, position] for position in range(df.shape[1])]
+    names = [f"c{position}" for position in range(df.shape[1])]
+
+    index = df.index
+    index_metadata = None
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        if isinstance(index, pd.MultiIndex):
+            raise TypeError("다중 인덱스 DataFrame")
+        columns.append(pd.Series(index, index=df.index))
+        names.append("index")
+        index_metadata = {'name': _label_value(index.name), 'object': index.dtype == object}
+
+    objects = []
+    for position, column in enumerate(columns):
+        if column.dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(column, skipna=True)
+        if kind not in _OBJECT_STORAGE:
+            label = "인덱스" if names[position] == "index" else df.columns[position]
+            raise TypeError(f"Parquet로 저장할 수 없는 컬럼: {label} ({kind})")
+        storage = _OBJECT_STORAGE[kind]
+        if storage is not None:
+            columns[position] = column.astype(storage)
+        if names[position] != "index":
+            objects.append(position)
+
+    frame = pd.concat([column.reset_index(drop=True) for column in columns], axis=1, keys=names)
+    multi_index = isinstance(df.columns, pd.MultiIndex)
+    labels = [[_label_value(part) for part in column] if multi_index else _label_value(column) for column in df.columns]
+    return frame, {'columns': labels, 'multi_index': multi_index, 'objects': objects, 'index': index_metadata}
+
+
+def _to_objects(values: pd.Series) -> pd.Series:
+    """저장 형식 컬럼 → object 컬럼 (결측은 None)"""
+    result = values.astype(object).to_numpy(copy=True)
+    result[values.isna().to_numpy()] = None
+    return pd.Series(result, index=values.index, dtype=object, name=values.name)
+
+
+def _label_value(value):
+    """컬럼 이름 → JSON 값 (결측은 None)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (str, bool, int, float, np.integer, np.floating)):
+        return value.item() if isinstance(value, np.generic) else value
+    raise TypeError(f"Parquet로 저장할 수 없는 컬럼 이름: {value!r}")
+
+
+def default_cache_dir() -> str:
+    """
+    사용자별 캐시 디렉터리 (저장소/공유 폴더가 아닌 현재 사용자 전용 위치)
+    - Windows: %LOCALAPPDATA%\\subcon\\cache
+    - 그 외: $XDG_CACHE_HOME/subcon (기본 ~/.cache/subcon)
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+        return os.path.join(base, 'subcon', 'cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'subcon')
+
+
+def resolve_cache_dir(project_root: str) -> Optional[str]:
+    """
+    디스크 캐시 디렉터리 결정
+    - 환경변수 SUBCON_CACHE_DIR (off/none이면 비활성화)
+    - config/app_config.json의 paths.cache_folder (상대 경로는 프로젝트 기준, off/none이면 비활성화)
+    - 기본값 사용자별 캐시 디렉터리 (default_cache_dir) - 지정하지 않았거나 빈 문자열이면 사용
+    """
+    configured = os.environ.get('SUBCON_CACHE_DIR', '').strip()
+    if not configured:
+        try:
+            with open(os.path.join(project_root, 'config', 'app_config.json'), 'r', encoding='utf-8') as f:
+                configured = json.load(f).get('paths', {}).get('cache_folder')
+        except (OSError, ValueError):
+            configured = None
+
+    configured = (configured or '').strip()
+    if configured.lower() in ('off', 'none'):
+        return None
+    if not configured:
+        return default_cache_dir()
+    return configured if os.path.isabs(configured) else os.path.join(project_root, configured)
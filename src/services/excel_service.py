@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from kfunction import read_excel_data
 
 from src.models import Supplier, Purchase, Payment, TaxInvoice
+from src.services.excel_writer import save_sheets
 
 
 class ExcelService:
@@ -140,8 +141,20 @@ class ExcelService:
         return tax_invoices
 
     @staticmethod
-    def export_to_excel(data: Dict, output_path: str):
-        """데이터를 Excel로 내보내기"""
+    def export_to_excel(data: Dict, output_path: str, streaming: bool = False):
+        """
+        데이터를 Excel로 내보내기
+
+        streaming=True면 시트를 하나씩 행 단위로 디스크에 기록하여
+        행 수와 무관하게 메모리 사용량이 일정하다 (대용량 결과용)
+        """
+        if streaming:
+            save_sheets(output_path, (
+                (sheet_name, ExcelService._to_frame(df_data)) for sheet_name, df_data in data.items()
+                if isinstance(df_data, (pd.DataFrame, list, dict))
+            ))
+            return
+
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             for sheet_name, df_data in data.items():
                 if isinstance(df_data, pd.DataFrame):
@@ -152,3 +165,12 @@ class ExcelService:
                 elif isinstance(df_data, dict):
                     df = pd.DataFrame([df_data])
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    @staticmethod
+    def _to_frame(df_data) -> pd.DataFrame:
+        """내보내기 데이터(DataFrame/레코드 목록/단일 레코드)를 DataFrame으로 변환"""
+        if isinstance(df_data, pd.DataFrame):
+            return df_data
+        if isinstance(df_data, dict):
+            return pd.DataFrame([df_data])
+        return pd.DataFrame(df_data)
@@ -0,0 +1,184 @@
+"""
+결과 Excel 저장 - openpyxl write-only 모드로 시트 단위 스트리밍 기록 (Excel 불필요)
+"""
+import os
+from copy import copy
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 열 너비 계산 시 2칸으로 보는 문자 (한글/한자/전각)
+_WIDE_CHAR_PATTERN = '[\u1100-\u11ff\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]'
+
+# Excel 최대 열 너비
+_MAX_COLUMN_WIDTH = 255
+
+# 한 번에 셀 값으로 변환하는 행 수 (변환 버퍼 크기 = 청크 × 열 수)
+CHUNK_ROWS = 5000
+
+# 진행률 콜백 호출 간격 (행)
+_PROGRESS_ROWS = 200
+
+
+def save_sheets(save_path: str, sheets_data: Iterable[Tuple[str, pd.DataFrame]], chunk_rows: int = CHUNK_ROWS,
+                progress_callback: Optional[Callable[[int, int], None]] = None):
+    """
+    여러 DataFrame을 하나의 xlsx 파일로 저장
+
+    기존 COM 저장(_apply_styles)과 같은 서식을 적용한다.
+    - 사용 영역 전체 얇은 테두리
+    - 헤더: 굵게, 가운데 정렬, 회색 배경
+    - 열 너비: 내용 길이에 맞춤 (AutoFit 대체)
+
+    write-only 시트는 행을 추가하는 즉시 임시 파일로 내보내고, 셀 값 변환도
+    chunk_rows 행 단위로 하므로 행 수와 무관하게 추가 메모리가 일정하다.
+    sheets_data는 제너레이터여도 되며 시트를 하나씩 꺼내 기록한다.
+
+    progress_callback(기록한 행 수, 전체 행 수)는 일정 행마다 호출되며, 예외를 던지면
+    저장을 중단한다 (파일은 마지막에 한 번에 만들어지므로 부분 파일이 남지 않음).
+    전체 행 수는 sheets_data가 목록일 때만 알 수 있고, 제너레이터면 0이다.
+    """
+    from openpyxl import Workbook
+
+    if isinstance(sheets_data, (list, tuple)):
+        total_rows = sum(len(df) for _, df in sheets_data if df is not None)
+    else:
+        total_rows = 0
+
+    wb = Workbook(write_only=True)
+    styles = _SheetStyles()
+    written = 0
+    for sheet_name, df in sheets_data:
+        ws = wb.create_sheet(title=sheet_name)
+        if df is None or df.empty:
+            continue
+        report = None
+        if progress_callback is not None:
+            report = lambda rows, base=written: progress_callback(base + rows, total_rows)
+        _write_sheet(ws, df, styles, chunk_rows, report)
+        written += len(df)
+
+    if not wb.worksheets:
+        wb.create_sheet()
+    wb.save(os.path.abspath(save_path))
+
+
+class _SheetStyles:
+    """셀 서식 (워크북 단위로 한 번만 생성)"""
+
+    def __init__(self):
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+        thin = Side(style='thin')
+        self.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        self.header_font = Font(bold=True)
+        self.header_alignment = Alignment(horizontal='center', vertical='center')
+        self.header_fill = PatternFill(fill_type='solid', start_color='FFD3D3D3', end_color='FFD3D3D3')
+        self.datetime_format = 'yyyy-mm-dd h:mm:ss'
+
+
+def _write_sheet(ws, df: pd.DataFrame, styles: _SheetStyles, chunk_rows: int = CHUNK_ROWS,
+                 report: Optional[Callable[[int], None]] = None):
+    """헤더 + 데이터 행 기록 (write-only 시트는 열 너비를 행보다 먼저 지정해야 함)"""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    headers = [_header_text(col) for col in df.columns]
+
+    # 1차: 청크 단위로 열 너비만 계산
+    widths = [_display_width([header]) for header in headers]
+    for chunk in _iter_chunks(df, chunk_rows):
+        for i, values in enumerate(chunk):
+            widths[i] = max(widths[i], _display_width(values))
+        if report is not None:
+            report(0)  # 기록 전 단계에서도 취소 확인 기회 제공
+
+    for col_idx, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, _MAX_COLUMN_WIDTH)
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = styles.header_font
+        cell.alignment = styles.header_alignment
+        cell.fill = styles.header_fill
+        cell.border = styles.border
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # 같은 서식의 셀은 스타일 배열을 공유 (셀마다 스타일 조회를 반복하지 않음)
+    template = WriteOnlyCell(ws)
+    template.border = styles.border
+    plain_style = copy(template._style)
+    template.number_format = styles.datetime_format
+    datetime_style = copy(template._style)
+
+    # 2차: 청크 단위로 변환하여 행 기록
+    rows_written = 0
+    for chunk in _iter_chunks(df, chunk_rows):
+        for row in zip(*chunk):
+            cells = []
+            for value in row:
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = datetime_style if isinstance(value, date) else plain_style
+                cells.append(cell)
+            ws.append(cells)
+            rows_written += 1
+            if report is not None and rows_written % _PROGRESS_ROWS == 0:
+                report(rows_written)
+    if report is not None:
+        report(rows_written)
+
+
+def _iter_chunks(df: pd.DataFrame, chunk_rows: int):
+    """chunk_rows 행씩 열별 셀 값 목록으로 변환하여 반환"""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield [_column_values(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+
+
+def _header_text(column) -> str:
+    if isinstance(column, tuple):
+        return "_".join(str(part) for part in column if not pd.isna(part))
+    return column if isinstance(column, str) else str(column)
+
+
+def _column_values(series: pd.Series) -> List:
+    """시트에 쓸 값 목록 - 결측은 빈 셀, 날짜는 timezone 제거 후 datetime"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = series.astype(object).to_numpy(copy=True)
+    elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        values = series.to_numpy(dtype=object, copy=True)
+    else:
+        values = np.array([_cell_value(v) for v in series.to_numpy(dtype=object)], dtype=object)
+
+    values[pd.isnull(values)] = None
+    return values.tolist()
+
+
+def _cell_value(value):
+    """object 컬럼 개별 값 변환"""
+    if isinstance(value, pd.Timestamp):
+        try:
+            # timezone 정보가 있는 경우 안전하게 제거
+            if value.tzinfo is not None:
+                value = value.tz_localize(None)
+            return value.to_pydatetime()
+        except Exception:
+            # 오류 발생 시 문자열로 변환
+            return str(value)
+    return value
+
+
+def _display_width(values: List) -> float:
+    """값들의 표시 길이 최댓값 (전각 문자는 2칸)"""
+    texts = pd.Series(values, dtype=object).dropna().astype(str)
+    if texts.empty:
+        return 0.0
+    display = texts.str.len() + texts.str.count(_WIDE_CHAR_PATTERN)
+    return float(display.max())
@@ -0,0 +1,133 @@
+"""
+입력 파일 스냅샷 - 검증 시점과 로드 시점의 파일 일관성 확인
+"""
+import hashlib
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_HASH_CHUNK = 1024 * 1024
+
+# 원격 파일시스템 (POSIX /proc/mounts 기준)
+_NETWORK_FS_TYPES = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', 'afs', '9p'}
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """파일 일관성 지문 (크기, 수정시각, 내용 해시 - 해시는 계산한 경우에만)"""
+    size: int
+    mtime_ns: int
+    digest: Optional[str] = None
+
+    def same_stat(self, other: 'FileFingerprint') -> bool:
+        """크기/수정시각이 같은지 확인"""
+        return (self.size, self.mtime_ns) == (other.size, other.mtime_ns)
+
+
+def content_digest(file_path: str) -> str:
+    """파일 내용 해시 (blake2b-160)"""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def take_fingerprint(file_path: str, with_digest: bool = False) -> FileFingerprint:
+    """
+    현재 파일 지문 생성
+
+    기본은 크기/수정시각만 (파일을 읽지 않음). 내용 해시는 with_digest일 때만 계산한다.
+    """
+    stat = os.stat(file_path)
+    return FileFingerprint(stat.st_size, stat.st_mtime_ns, content_digest(file_path) if with_digest else None)
+
+
+def is_network_path(file_path: str) -> bool:
+    """네트워크 공유(UNC, 네트워크 드라이브, 원격 마운트) 위의 파일인지 확인"""
+    path = os.path.abspath(file_path)
+    if path.startswith(('\\\\', '//')):
+        return True
+
+    if sys.platform == 'win32':
+        import ctypes
+        drive = os.path.splitdrive(path)[0]
+        if drive:
+            DRIVE_REMOTE = 4
+            return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == DRIVE_REMOTE
+        return False
+
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return False
+    # 가장 긴 마운트 지점이 해당 경로의 파일시스템
+    best = max((m for m in mounts if path == m[0] or path.startswith(m[0].rstrip('/') + '/')),
+               key=lambda m: len(m[0]), default=None)
+    return best is not None and best[1] in _NETWORK_FS_TYPES
+
+
+def prepare_snapshot(file_paths: Dict[str, str],
+                     validated: Optional[Dict[str, FileFingerprint]] = None,
+                     snapshot_dir: str = "data") -> Tuple[Dict[str, str], Dict[str, FileFingerprint], List[str]]:
+    """
+    로드할 파일 경로 결정 - 기본은 원본 경로를 그대로 사용
+
+    - 네트워크 공유의 파일: 로컬 snapshot_dir로 복사 (느린 반복 읽기/로드 중 변경 방지)
+    - 검증 시점 지문과 크기/수정시각이 다른 파일: 현재 내용을 snapshot_dir로 복사해 고정하고 알림
+    - 그 외: 복사 없이 원본 경로 (경로 기준 캐시가 검증 단계와 그대로 이어짐)
+
+    파일 내용은 읽지 않는다 (내용 해시는 필요한 곳에서 따로 계산).
+
+    Returns:
+        (키 → 로드 경로, 키 → 로드 시점 지문, 알림 메시지 목록)
+    """
+    validated = validated or {}
+    load_paths, fingerprints, notes = {}, {}, []
+
+    for key, src_path in file_paths.items():
+        if not src_path:
+            continue
+        expected = validated.get(key)
+
+        if is_network_path(src_path):
+            # 원격 파일은 한 번만 읽어 로컬로 복사한 뒤 복사본으로 지문 확인 (copy2는 수정시각 유지)
+            load_paths[key] = _copy_to_snapshot(src_path, snapshot_dir)
+            fingerprints[key] = take_fingerprint(load_paths[key])
+            notes.append(f"{Path(src_path).name}: 네트워크 경로 - 로컬 스냅샷으로 로드")
+            if expected is not None and not expected.same_stat(fingerprints[key]):
+                notes.append(f"{Path(src_path).name}: 검증 이후 파일이 변경되었습니다")
+            continue
+
+        current = take_fingerprint(src_path)
+        if expected is not None and not expected.same_stat(current):
+            # 변경된 내용을 복사본으로 고정 (로드 중 추가 변경 방지)
+            load_paths[key] = _copy_to_snapshot(src_path, snapshot_dir)
+            fingerprints[key] = take_fingerprint(load_paths[key])
+            notes.append(f"{Path(src_path).name}: 검증 이후 파일 변경 - 현재 내용의 스냅샷으로 로드")
+        else:
+            load_paths[key] = src_path
+            fingerprints[key] = current
+
+    return load_paths, fingerprints, notes
+
+
+def _copy_to_snapshot(src_path: str, snapshot_dir: str) -> str:
+    dest_dir = Path(snapshot_dir)
+    dest_dir.mkdir(exist_ok=True)
+    dest_path = dest_dir / Path(src_path).name
+    shutil.copy2(src_path, dest_path)
+    return str(dest_path)
+
+
+def find_changed(load_paths: Dict[str, str], fingerprints: Dict[str, FileFingerprint]) -> List[str]:
+    """로드 중 변경된 파일 키 목록 (크기/수정시각 비교)"""
+    changed = []
+    for key, path in load_paths.items():
+        if not take_fingerprint(path).same_stat(fingerprints[key]):
+            changed.append(key)
+    return changed
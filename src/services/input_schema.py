@@ -0,0 +1,188 @@
+"""
+입력 파일 스키마 - config/app_config.json의 input_schemas에 선언한 컬럼 형식으로 로드 시 한 번에 변환
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.models.amount import to_won
+from src.services.date_normalizer import layout_digest, normalize_dates
+
+# 컬럼 형식 → 변환 결과
+# - code: 코드/번호 문자열 (숫자 셀 1234.0 → "1234", 앞뒤 공백 제거, 빈 값은 결측)
+# - bizno: 사업자번호 문자열 (code + '-' 제거)
+# - integer: int64 (결측이 있으면 Int64)
+# - amount: 원 단위 정수 (결측/변환 불가는 결측 - 있으면 Int64, 없으면 int64)
+# - date: datetime64[ns] (date_normalizer - 일련번호/날짜 객체/문자열 판별, timezone 제거, 변환 불가는 NaT)
+# - label: 표시용 문자열 (빈 값은 결측)
+# - category: 반복되는 라벨 (COMPACT_LABELS면 Categorical - 값 사전 + 정수 코드, 아니면 label과 같음)
+COLUMN_KINDS = ('code', 'bizno', 'integer', 'amount', 'date', 'label', 'category')
+
+# 라벨/상태 컬럼 압축 표현: 'on'(기본) | 'off' (category 컬럼도 문자열로 유지)
+COMPACT_LABELS = os.environ.get('SUBCON_COMPACT_LABELS', 'on').strip().lower() not in ('0', 'off', 'false', 'no')
+
+
+def load_input_schemas(project_root: str) -> Dict[str, Dict]:
+    """
+    config/app_config.json의 input_schemas 읽기
+
+    Returns:
+        파일 키 → {'skip_rows': 헤더 다음에 건너뛸 데이터 행 수, 'columns': {컬럼명: 형식}}
+        (설정 파일이 없거나 읽을 수 없으면 빈 dict)
+    """
+    try:
+        with open(os.path.join(project_root, 'config', 'app_config.json'), 'r', encoding='utf-8') as f:
+            configured = json.load(f).get('input_schemas', {})
+    except (OSError, ValueError) as e:
+        print(f"[WARN] 입력 스키마 설정을 읽을 수 없습니다: {e}")
+        return {}
+
+    schemas = {}
+    for file_key, schema in configured.items():
+        columns = schema.get('columns', {})
+        unknown = sorted({kind for kind in columns.values() if kind not in COLUMN_KINDS})
+        if unknown:
+            raise ValueError(f"입력 스키마 '{file_key}'에 알 수 없는 컬럼 형식이 있습니다: {', '.join(unknown)}")
+        schemas[file_key] = {'skip_rows': int(schema.get('skip_rows', 0)), 'columns': dict(columns)}
+    return schemas
+
+
+def schema_digest(schema: Optional[Dict]) -> str:
+    """캐시 항목 구분용 스키마 해시 (스키마가 없으면 빈 문자열)"""
+    if not schema:
+        return ''
+    text = json.dumps({'schema': schema, 'compact_labels': COMPACT_LABELS}, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def flat_column_name(column) -> str:
+    """다중 헤더 컬럼은 결측이 아닌 단계를 '_'로 이어 스키마 컬럼명과 비교"""
+    if isinstance(column, tuple):
+        return "_".join(str(part) for part in column if not pd.isna(part))
+    return str(column)
+
+
+def apply_input_schema(df: pd.DataFrame, schema: Dict) -> pd.DataFrame:
+    """
+    스키마에 선언된 컬럼만 선언된 형식으로 변환 (컬럼당 한 번, 선언되지 않은 컬럼은 그대로)
+
+    skip_rows만큼 앞쪽 데이터 행(합계 행 등)을 먼저 제거한 뒤 변환한다.
+    파일에 없는 스키마 컬럼은 무시한다. 날짜 컬럼은 판별한 형식을 헤더 구성(레이아웃)별로 기억한다.
+    """
+    skip_rows = schema.get('skip_rows', 0)
+    if skip_rows:
+        df = df.iloc[skip_rows:].reset_index(drop=True)
+    else:
+        df = df.copy(deep=False)
+
+    columns = schema.get('columns', {})
+    names = [flat_column_name(column) for column in df.columns]
+    layout = layout_digest(names)
+    for position, name in enumerate(names):
+        kind = columns.get(name)
+        if kind == 'date':
+            df.isetitem(position, normalize_dates(df.iloc[:, position], f"{layout}|{name}"))
+        elif kind is not None:
+            df.isetitem(position, _CONVERTERS[kind](df.iloc[:, position]))
+    return df
+
+
+def _to_text(series: pd.Series, integral_numbers: bool) -> pd.Series:
+    """
+    문자열 컬럼으로 변환
+
+    integral_numbers가 True면 정수로 표현되는 숫자 셀은 소수점 없이 변환한다 (1234.0 → "1234").
+    문자열 셀은 숫자처럼 보여도 그대로 둔다 (앞자리 0 보존).
+    """
+    values = np.full(len(series), None, dtype=object)
+
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        is_text = np.zeros(len(series), dtype=bool)
+        numbers = pd.to_numeric(series, errors='coerce').astype('float64')
+    else:
+        # object 컬럼의 .str은 문자열이 아닌 값에 대해 결측을 반환
+        try:
+            text = series.astype(object).str.strip()
+        except AttributeError:
+            # 문자열 값이 하나도 없는 컬럼
+            text = pd.Series(np.nan, index=series.index, dtype=object)
+        is_text = text.notna().to_numpy()
+        values[is_text] = text.to_numpy(dtype=object)[is_text]
+        rest = series.where(~is_text)
+        numbers = pd.to_numeric(rest, errors='coerce').astype('float64')
+        # 숫자로 해석되지 않는 기타 값 (bool, 날짜 등)은 문자열 표현
+        other = (~is_text & rest.notna().to_numpy() & numbers.isna().to_numpy())
+        if other.any():
+            values[other] = [str(value) for value in series.to_numpy(dtype=object)[other]]
+
+    numbers = numbers.to_numpy()
+    finite = np.isfinite(numbers) & ~is_text
+    if finite.any():
+        found = numbers[finite]
+        if integral_numbers:
+            integral = found == np.floor(found)
+            texts = np.where(integral, found.astype(np.int64).astype(str), found.astype(str))
+        else:
+            texts = np.array([str(value) for value in series.to_numpy(dtype=object)[finite]], dtype=object)
+        values[finite] = texts
+
+    result = pd.Series(values, index=series.index, name=series.name)
+    return result.where(result != "")
+
+
+def _to_code(series: pd.Series) -> pd.Series:
+    return _to_text(series, integral_numbers=True)
+
+
+def _to_bizno(series: pd.Series) -> pd.Series:
+    return _to_code(series).str.replace("-", "", regex=False)
+
+
+def _to_label(series: pd.Series) -> pd.Series:
+    return _to_text(series, integral_numbers=False)
+
+
+def _to_category(series: pd.Series) -> pd.Series:
+    labels = _to_label(series)
+    return labels.astype('category') if COMPACT_LABELS else labels
+
+
+def compact_labels(series: pd.Series) -> pd.Series:
+    """값 종류가 적은 문자열 컬럼을 Categorical로 변환 (COMPACT_LABELS가 꺼져 있으면 그대로)"""
+    if not COMPACT_LABELS or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype('category')
+
+
+def status_column(index: pd.Index, categories, value=None) -> pd.Series:
+    """
+    고정된 값 사전을 쓰는 상태 컬럼 초기값 (모든 행이 value)
+
+    COMPACT_LABELS면 categories를 범주로 하는 Categorical이므로 범주에 없는 값은 기록할 수 없다.
+    """
+    if not COMPACT_LABELS:
+        return pd.Series(value, index=index, dtype=object if value is None else None)
+    codes = np.full(len(index), -1 if value is None else list(categories).index(value), dtype=np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=index)
+
+
+def _to_integer(series: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(series, errors='coerce')
+    if numbers.isna().any():
+        return numbers.round().astype('Int64')
+    return numbers.round().astype('int64')
+
+
+_CONVERTERS = {
+    'code': _to_code,
+    'bizno': _to_bizno,
+    'integer': _to_integer,
+    'amount': to_won,
+    'date': normalize_dates,
+    'label': _to_label,
+    'category': _to_category,
+}
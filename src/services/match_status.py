@@ -0,0 +1,118 @@
+"""
+대사 상태 코드 - 대사 단계는 정수 상태 코드/참조 행/순번 배열로 기록하고,
+표시 라벨(구분키, 대사여부 등)은 최종 결과 생성 시에만 만든다
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+# 대사상태 (int8) - 피벗/세금계산서 공통
+UNMATCHED = 0
+EXACT = 1            # 금액대사
+EXACT_MANUAL = 2     # 금액대사(수기확인)
+SEQUENTIAL = 3       # 순차대사
+PARTIAL = 4          # 부분대사
+PARTIAL_MANUAL = 5   # 부분대사(수기확인)
+
+MATCH_LABELS = ("", "금액대사", "금액대사(수기확인)", "순차대사", "부분대사", "수기확인")
+# 세금계산서 구분키에 "-순번"을 붙이는 단계 (1:N 대사)
+NUMBERED_MATCHES = (SEQUENTIAL, PARTIAL_MANUAL)
+
+# 지불상태 (int8) - 세금계산서 구분키2 / 지불보조장 구분키
+PAYMENT_NONE = 0
+PAYMENT_EXACT = 1          # 매입금액대사
+PAYMENT_COMBINATION = 2    # 매입순차대사(조합)
+
+PAYMENT_LABELS = ("", "매입금액대사", "매입순차대사(조합)")
+# 지불보조장 구분키에 "-순번"을 붙이는 상태
+NUMBERED_PAYMENTS = (PAYMENT_COMBINATION,)
+
+# 상태 컬럼
+STATUS = '대사상태'          # 대사상태 코드
+PIVOT_ROW = '대사피벗'       # 대사된 피벗 행 인덱스 (int32, 없으면 -1)
+ORDINAL = '대사순번'         # 같은 대사 안의 순번 (int32, 1부터, 없으면 0)
+PAYMENT_STATUS = '지불상태'  # 지불상태 코드
+TAX_ROW = '대사세금계산서'    # 대사된 세금계산서 행 인덱스 (int32, 없으면 -1)
+
+
+def status_array(length: int) -> np.ndarray:
+    """모든 행이 미대사인 상태 코드 배열"""
+    return np.zeros(length, dtype=np.int8)
+
+
+def row_array(length: int) -> np.ndarray:
+    """모든 행이 참조 없음(-1)인 참조 행 배열"""
+    return np.full(length, -1, dtype=np.int32)
+
+
+def ordinal_array(length: int) -> np.ndarray:
+    return np.zeros(length, dtype=np.int32)
+
+
+class MatchState:
+    """
+    대사 단계 동안 쓰는 상태 컬럼 배열 (행 위치 기준)
+
+    행 단위 기록은 numpy 배열에 하고, 단계가 끝나면 write_to로 DataFrame 컬럼에 한 번에 반영한다.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str]):
+        self._arrays = {column: df[column].to_numpy(copy=True) for column in columns}
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._arrays[column]
+
+    def write_to(self, df: pd.DataFrame):
+        for column, values in self._arrays.items():
+            df[column] = values
+
+
+def status_labels(codes, labels: Sequence[str], ordinals=None, numbered: Sequence[int] = (),
+                  missing=""):
+    """
+    상태 코드 → 표시 라벨 (object 배열)
+
+    numbered에 속한 코드는 "라벨-순번", 코드 0은 missing으로 표시한다.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    table = np.array(labels, dtype=object)
+    table[0] = missing
+    result = table[codes]
+
+    if ordinals is not None and len(numbered):
+        mask = np.isin(codes, numbered)
+        if mask.any():
+            suffixes = pd.Series(np.asarray(ordinals)[mask]).astype(str).to_numpy(dtype=object)
+            result[mask] = table[codes[mask]] + "-" + suffixes
+    return result
+
+
+def reference_labels(rows, labels: pd.Series, ordinals=None, missing=""):
+    """
+    참조 행의 라벨 (object 배열, 참조가 없으면 missing)
+
+    Args:
+        rows: 참조 행 인덱스 (-1은 참조 없음)
+        labels: 참조 대상 라벨 (참조 대상 DataFrame 인덱스 기준)
+        ordinals: 지정하면 "라벨-순번"
+    """
+    rows = np.asarray(rows)
+    result = np.full(len(rows), missing, dtype=object)
+    matched = rows >= 0
+    if matched.any():
+        found = labels.reindex(rows[matched]).astype(object).to_numpy(dtype=object)
+        if ordinals is not None:
+            suffixes = pd.Series(np.asarray(ordinals)[matched]).astype(str).to_numpy(dtype=object)
+            found = pd.Series(found).astype(str).to_numpy(dtype=object) + "-" + suffixes
+        result[matched] = found
+    return result
+
+
+def replace_columns(df: pd.DataFrame, internal: Sequence[str], columns: Dict[str, object]) -> pd.DataFrame:
+    """상태 컬럼(internal)을 빼고 그 첫 컬럼 자리에 표시 컬럼(columns)을 순서대로 넣은 DataFrame"""
+    position = df.columns.get_loc(internal[0])
+    result = df.drop(columns=list(internal))
+    for offset, (name, values) in enumerate(columns.items()):
+        result.insert(position + offset, name, values)
+    return result
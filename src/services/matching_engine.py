@@ -0,0 +1,484 @@
+"""
+대사 매칭 엔진 - 벡터화된 매칭 처리
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+
+# 금액대사 조인 키 (세금계산서 기준 컬럼명)
+EXACT_MATCH_KEYS = ['협력사코드', '작성년도', '작성월', '공급가액', '계산서구분']
+# 금액대사(수기확인) 조인 키 - 계산서구분 제외
+EXACT_MATCH_MANUAL_KEYS = ['협력사코드', '작성년도', '작성월', '공급가액']
+
+_RANK_COL = '__rank'
+
+
+def invoice_condition_for(tax_types: pd.Series, dtype=None) -> pd.Series:
+    """
+    면과세구분명 → 계산서구분 변환 (과세/영세: 일반세금계산서, 그 외: 일반계산서)
+
+    dtype에 세금계산서 계산서구분의 CategoricalDtype을 주면 같은 값 사전의 Categorical을
+    반환하므로 조인/그룹 비교가 문자열 대신 정수 코드로 이뤄진다 (사전에 없는 구분은 결측 -
+    해당 구분의 세금계산서가 없으므로 어차피 매칭되지 않음).
+    """
+    conditions = np.where(tax_types.isin(["과세", "영세"]), "일반세금계산서", "일반계산서")
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical(conditions, dtype=dtype), index=tax_types.index)
+    return pd.Series(conditions, index=tax_types.index)
+
+
+def rank_match(left: pd.DataFrame, right: pd.DataFrame, on: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    키 + 그룹 내 순번(rank) 조인으로 1:1 매칭을 일괄 처리한다.
+
+    left의 각 행을 순서대로 돌며 같은 키의 "아직 사용되지 않은 첫 번째" right 행을
+    가져가는 반복 로직과 동일한 결과를 낸다. 같은 키 안에서 n번째 left 행은
+    n번째 right 행과 짝지어진다.
+
+    Args:
+        left: 매칭 대상 (예: df_final_pivot), 행 순서가 처리 순서
+        right: 후보 (예: 미대사 세금계산서), 행 순서가 우선순위
+        on: 조인 키 컬럼 목록 (양쪽 동일 컬럼명)
+
+    Returns:
+        (left 인덱스 배열, right 인덱스 배열) - left 처리 순서로 정렬
+    """
+    if left.empty or right.empty:
+        empty = np.array([], dtype=object)
+        return empty, empty
+
+    # 키에 결측이 있는 행은 == 비교에서 매칭되지 않으므로 제외
+    left_keys = left[on].dropna()
+    right_keys = right[on].dropna()
+
+    left_keys = left_keys.assign(**{
+        _RANK_COL: left_keys.groupby(on, sort=False, observed=True).cumcount(),
+        '__left_order': np.arange(len(left_keys)),
+        '__left_index': left_keys.index
+    })
+    right_keys = right_keys.assign(**{
+        _RANK_COL: right_keys.groupby(on, sort=False, observed=True).cumcount(),
+        '__right_index': right_keys.index
+    })
+
+    joined = left_keys.merge(right_keys, on=on + [_RANK_COL], how='inner', sort=False)
+    joined = joined.sort_values('__left_order', kind='mergesort')
+
+    return joined['__left_index'].to_numpy(), joined['__right_index'].to_numpy()
+
+
+
+def shard_assignment(keys: pd.Series, n_shards: int) -> Dict:
+    """
+    병렬 처리용 키 → 분할 번호 배정
+
+    행 수가 많은 키부터 현재 가장 가벼운 분할에 배정한다 (같은 행 수는 먼저 나온 키 우선).
+    입력이 같으면 항상 같은 배정을 반환하며, 결측 키는 배정하지 않는다.
+    """
+    counts = keys.dropna().value_counts(sort=False)
+    first_seen = {key: i for i, key in enumerate(pd.unique(keys.dropna()))}
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], first_seen[item[0]]))
+    
+    loads = [0] * max(n_shards, 1)
+    assignment = {}
+    for key, count in ordered:
+        shard = min(range(len(loads)), key=lambda i: (loads[i], i))
+        assignment[key] = shard
+        loads[shard] += count
+    return assignment
+
+
+def shard_ids(keys: pd.Series, assignment: Dict) -> np.ndarray:
+    """행별 분할 번호 (배정되지 않은 키/결측은 -1)"""
+    return keys.map(assignment).fillna(-1).astype(np.int64).to_numpy()
+
+
+# 후보 버킷 키 (세금계산서 기준 컬럼명)
+BUCKET_KEYS = ['협력사코드', '작성년도', '작성월', '계산서구분']
+# 후보 금액 컬럼
+AMOUNT_KEY = '공급가액'
+
+
+class CandidateIndex:
+    """
+    세금계산서 후보 인덱스
+
+    (협력사코드, 작성년도, 작성월, 계산서구분) 버킷별로 df_tax_new의 행 위치를
+    정렬된 배열로 한 번만 구성하고, 모든 대사 단계가 이 인덱스에서 후보를 꺼내 쓴다.
+    대사 여부는 위치별 bool 배열로 관리하므로 claim/unclaim은 O(1)이며,
+    버킷 조회 시 이미 대사된 위치를 걸러 오름차순 위치 목록을 반환한다.
+    """
+    
+    def __init__(self, df_tax: pd.DataFrame):
+        self._df = df_tax
+        self._claimed = np.zeros(len(df_tax), dtype=bool)
+        self._buckets = {}
+        self._months = {}
+        self._orders = {}
+        
+        # 키나 공급가액이 결측인 세금계산서는 어떤 버킷에도 넣지 않음 (대사 후보 아님)
+        keys = df_tax[BUCKET_KEYS]
+        valid = keys.notna().all(axis=1).to_numpy() & df_tax[AMOUNT_KEY].notna().to_numpy()
+        valid_positions = np.flatnonzero(valid)
+        grouped = keys.iloc[valid_positions].groupby(BUCKET_KEYS, sort=False, observed=True).indices
+        
+        for key, local_positions in grouped.items():
+            positions = valid_positions[local_positions]
+            self._buckets[key] = positions
+            self._months.setdefault(key[:3], []).append(key)
+    
+    def __len__(self) -> int:
+        return len(self._claimed)
+    
+    def bucket(self, supplier, year, month, invoice_type=None, order_by: str = None) -> np.ndarray:
+        """
+        버킷의 미대사 후보 위치 반환
+
+        Args:
+            supplier, year, month: 협력사코드, 작성년도, 작성월
+            invoice_type: 계산서구분 (None이면 같은 년월의 모든 계산서구분)
+            order_by: 정렬 기준 컬럼 (None이면 위치 순서, 지정 시 안정 정렬, 결측은 마지막)
+
+        Returns:
+            미대사 후보의 df_tax 행 위치 배열
+        """
+        if invoice_type is None:
+            bucket_keys = self._months.get((supplier, year, month), [])
+        else:
+            bucket_keys = [(supplier, year, month, invoice_type)]
+        
+        parts = [self._ordered(key, order_by) for key in bucket_keys if key in self._buckets]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        if len(parts) == 1:
+            positions = parts[0]
+        else:
+            positions = np.concatenate(parts)
+            if order_by is None:
+                positions = np.sort(positions)
+            else:
+                values = self._df[order_by].to_numpy()[positions]
+                positions = positions[np.argsort(values, kind='stable')]
+        
+        return positions[~self._claimed[positions]]
+    
+    def _ordered(self, key, order_by: str = None) -> np.ndarray:
+        """버킷 위치를 order_by 기준으로 정렬한 배열 (버킷별로 한 번만 계산)"""
+        positions = self._buckets[key]
+        if order_by is None:
+            return positions
+        
+        cache_key = (key, order_by)
+        if cache_key not in self._orders:
+            values = self._df[order_by].to_numpy()[positions]
+            self._orders[cache_key] = positions[np.argsort(values, kind='stable')]
+        return self._orders[cache_key]
+    
+    def claim(self, positions):
+        """후보를 대사 처리됨으로 표시"""
+        self._claimed[positions] = True
+    
+    def unclaim(self, positions):
+        """대사 표시 해제"""
+        self._claimed[positions] = False
+    
+    def is_claimed(self, position) -> bool:
+        """대사 여부 확인"""
+        return bool(self._claimed[position])
+    
+    def unclaimed_mask(self) -> np.ndarray:
+        """미대사 위치 마스크 (df_tax 행 순서)"""
+        return ~self._claimed
+
+
+class FifoSumCursor:
+    """
+    FIFO 누적합 매칭 커서
+
+    정렬된 후보 금액의 누적합을 정수 배열로 한 번만 계산해 두고, 앞에서부터 후보를
+    소비하며 "남은 후보의 앞쪽 누적합이 목표 금액과 처음 같아지는 위치"를 찾는다.
+    FIFO 매칭은 항상 남은 후보의 앞부분을 가져가므로, 소비 후에도 누적합 배열을
+    다시 만들 필요 없이 시작 위치와 기준 합만 옮기면 된다.
+    누적합 (값, 위치) 정렬 배열에서 이진 탐색하므로 조회는 O(log n)이다.
+    """
+    
+    def __init__(self, positions: np.ndarray, amounts: np.ndarray):
+        """
+        Args:
+            positions: 후보 위치 (FIFO 순서)
+            amounts: positions 순서의 원 단위 정수 금액
+        """
+        self.positions = positions
+        self._prefix = np.cumsum(np.asarray(amounts, dtype=np.int64))
+        # 누적합 값 → 위치 오름차순 (같은 값이면 앞선 위치가 먼저)
+        order = np.lexsort((np.arange(len(self._prefix)), self._prefix))
+        self._sorted_sums = self._prefix[order]
+        self._sorted_ends = order
+        self._start = 0
+    
+    def remaining(self) -> np.ndarray:
+        """아직 소비되지 않은 후보 위치 (FIFO 순서)"""
+        return self.positions[self._start:]
+    
+    def take(self, target) -> Optional[np.ndarray]:
+        """
+        남은 후보 앞쪽에서 누적합이 target과 처음 같아지는 구간을 소비하여 반환
+
+        Returns:
+            선택된 후보 위치 배열 (없으면 None, 이 경우 아무것도 소비하지 않음)
+        """
+        base = self._prefix[self._start - 1] if self._start else 0
+        need = base + target
+        lo = np.searchsorted(self._sorted_sums, need, side='left')
+        hi = np.searchsorted(self._sorted_sums, need, side='right')
+        if lo == hi:
+            return None
+        
+        ends = self._sorted_ends[lo:hi]
+        k = np.searchsorted(ends, self._start, side='left')
+        if k == len(ends):
+            return None
+        
+        end = int(ends[k]) + 1
+        selected = self.positions[self._start:end]
+        self._start = end
+        return selected
+
+
+# ThresholdTree 빈 칸/제거된 후보 값 (어떤 임계값 조건도 만족하지 않음)
+_EMPTY_MAX = np.iinfo(np.int64).min
+_EMPTY_MIN = np.iinfo(np.int64).max
+
+
+class ThresholdTree:
+    """
+    순서 유지 금액 구간 트리
+
+    정렬된 후보(예: 국세청발급일 순) 금액으로 구간 최댓값/최솟값 트리를 구성하여
+    "start 이후 가장 앞선, 금액이 임계값 초과(또는 이하)인 후보"를 O(log n)에 찾는다.
+    대사된 후보는 remove()로 트리에서 빼며 역시 O(log n)이다.
+    """
+    
+    def __init__(self, amounts):
+        """
+        Args:
+            amounts: 후보 순서대로의 원 단위 정수 금액
+        """
+        amounts = np.asarray(amounts, dtype=np.int64)
+        self._n = len(amounts)
+        size = 1
+        while size < max(self._n, 1):
+            size *= 2
+        self._size = size
+        
+        max_tree = np.full(2 * size, _EMPTY_MAX, dtype=np.int64)
+        min_tree = np.full(2 * size, _EMPTY_MIN, dtype=np.int64)
+        max_tree[size:size + self._n] = amounts
+        min_tree[size:size + self._n] = amounts
+        level = size
+        while level > 1:
+            parents = np.arange(level // 2, level)
+            max_tree[parents] = np.maximum(max_tree[2 * parents], max_tree[2 * parents + 1])
+            min_tree[parents] = np.minimum(min_tree[2 * parents], min_tree[2 * parents + 1])
+            level //= 2
+        
+        # 노드 단위 조회/갱신은 파이썬 리스트가 numpy 스칼라 접근보다 빠름
+        self._max = max_tree.tolist()
+        self._min = min_tree.tolist()
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def first_above(self, threshold, start: int = 0) -> int:
+        """start 이후 금액 > threshold 인 첫 후보 순번 (없으면 -1)"""
+        return self._find(self._max, lambda value: value > threshold, start)
+    
+    def first_at_most(self, threshold, start: int = 0) -> int:
+        """start 이후 금액 <= threshold 인 첫 후보 순번 (없으면 -1)"""
+        return self._find(self._min, lambda value: value <= threshold, start)
+    
+    def remove(self, i: int):
+        """i번째 후보 제거"""
+        node = self._size + i
+        self._max[node] = _EMPTY_MAX
+        self._min[node] = _EMPTY_MIN
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            self._max[node] = max(self._max[left], self._max[right])
+            self._min[node] = min(self._min[left], self._min[right])
+            node //= 2
+    
+    def _find(self, tree: list, predicate, start: int) -> int:
+        if start >= self._n or not predicate(tree[1]):
+            return -1
+        
+        # 왼쪽부터 깊이 우선 - 조건을 만족하는 노드만 내려감
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if hi <= start or not predicate(tree[node]):
+                continue
+            if hi - lo == 1:
+                return lo
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return -1
+
+
+def month_window(years, months, span: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    작성년월별 허용 회계일 범위 (해당 월 1일 ~ span개월 뒤 전날, 양끝 포함)
+
+    Returns:
+        (하한, 상한) datetime64[ns] 배열 - 년/월이 결측이면 NaT
+    """
+    years = pd.to_numeric(pd.Series(years), errors='coerce').to_numpy(dtype=float)
+    months = pd.to_numeric(pd.Series(months), errors='coerce').to_numpy(dtype=float)
+    valid = ~(np.isnan(years) | np.isnan(months))
+    
+    month_index = np.zeros(len(years), dtype=np.int64)
+    month_index[valid] = (years[valid].astype(np.int64) - 1970) * 12 + months[valid].astype(np.int64) - 1
+    lower = month_index.astype('datetime64[M]').astype('datetime64[ns]')
+    upper = (month_index + span).astype('datetime64[M]').astype('datetime64[ns]') - np.timedelta64(1, 'D')
+    lower[~valid] = np.datetime64('NaT')
+    upper[~valid] = np.datetime64('NaT')
+    return lower, upper
+
+
+class LedgerIndex:
+    """
+    지불보조장 후보 인덱스
+
+    거래처번호별로 회계일 순 정렬된 전표 위치를 한 번만 구성하고, 허용 회계일 구간은
+    이진 탐색으로 찾는다. 위치는 지불보조장 DataFrame의 행 위치(0부터)이며,
+    대사 여부는 위치별 bool 배열로 관리한다.
+    """
+    
+    def __init__(self, vendors: pd.Series, dates: pd.Series, amounts: pd.Series, claimed: np.ndarray):
+        """
+        Args:
+            vendors: 거래처번호
+            dates: 회계일 (datetime, NaT 전표는 어떤 구간에도 포함되지 않음)
+            amounts: 원 단위 정수 금액 (결측 전표는 어떤 구간에도 포함되지 않음)
+            claimed: 이미 대사된 전표 표시
+        """
+        amounts = pd.Series(amounts).reset_index(drop=True)
+        self._vendors = pd.Series(vendors).reset_index(drop=True)
+        self._dates = pd.Series(dates).reset_index(drop=True).to_numpy(dtype='datetime64[ns]')
+        self._amounts = amounts.to_numpy(dtype=np.int64, na_value=0)
+        self._claimed = np.asarray(claimed, dtype=bool).copy()
+        
+        self._valid = ~np.isnat(self._dates) & self._vendors.notna().to_numpy() & amounts.notna().to_numpy()
+        self._valid_positions = np.flatnonzero(self._valid)
+        
+        # 거래처별 회계일 순 (같은 날짜는 원래 행 순서)
+        vendor_codes, vendor_uniques = pd.factorize(self._vendors.iloc[self._valid_positions], sort=False)
+        dates_i8 = self._dates[self._valid_positions].view(np.int64)
+        order = np.lexsort((self._valid_positions, dates_i8, vendor_codes))
+        self._by_vendor = self._valid_positions[order]
+        self._vendor_dates = dates_i8[order]
+        bounds = np.searchsorted(vendor_codes[order], np.arange(len(vendor_uniques) + 1))
+        self._vendor_ranges = {
+            vendor: (int(bounds[code]), int(bounds[code + 1])) for code, vendor in enumerate(vendor_uniques)
+        }
+    
+    def __len__(self) -> int:
+        return len(self._claimed)
+    
+    def is_claimed(self, position) -> bool:
+        return bool(self._claimed[position])
+    
+    def claim(self, positions):
+        """전표를 대사 처리됨으로 표시"""
+        self._claimed[positions] = True
+    
+    def match_exact(self, vendors, amounts, lower, upper) -> np.ndarray:
+        """
+        1:1 금액 매칭 일괄 처리
+
+        요청 순서대로 "같은 거래처, 같은 금액, 회계일 구간 내 미대사 전표 중 회계일이
+        가장 빠른 것"을 하나씩 가져가는 반복 처리와 같은 결과를 낸다. 후보 구간은
+        (거래처, 금액, 회계일) 정렬 배열에서 한 번에 이진 탐색하고, 앞선 요청이 가져간
+        전표는 다음 미대사 전표 포인터로 건너뛴다.
+
+        Args:
+            vendors, amounts, lower, upper: 요청별 거래처번호, 금액, 회계일 하한/상한(포함)
+
+        Returns:
+            요청별 매칭된 전표 위치 (없으면 -1) - 매칭된 전표는 claim 처리됨
+        """
+        vendors = pd.Series(vendors).reset_index(drop=True)
+        amounts = np.asarray(amounts, dtype=np.int64)
+        lower = np.asarray(lower, dtype='datetime64[ns]')
+        upper = np.asarray(upper, dtype='datetime64[ns]')
+        result = np.full(len(vendors), -1, dtype=np.int64)
+        if len(vendors) == 0 or len(self._valid_positions) == 0:
+            return result
+        
+        # (거래처, 금액) 그룹 번호를 지불보조장/요청에 공통으로 부여
+        book = self._valid_positions
+        keys = pd.DataFrame({
+            'vendor': pd.concat([self._vendors.iloc[book], vendors], ignore_index=True),
+            'amount': np.concatenate([self._amounts[book], amounts]),
+        })
+        group = keys.groupby(['vendor', 'amount'], sort=False).ngroup().to_numpy()
+        book_group, request_group = group[:len(book)], group[len(book):]
+        
+        # 회계일/구간 경계를 하나의 순위로 변환해 (그룹, 회계일) 합성 키로 정렬
+        book_dates = self._dates[book].view(np.int64)
+        request_valid = (request_group >= 0) & ~np.isnat(lower) & ~np.isnat(upper)
+        all_dates = np.unique(np.concatenate([
+            book_dates, lower[request_valid].view(np.int64), upper[request_valid].view(np.int64)
+        ]))
+        n_ranks = len(all_dates)
+        
+        book_keys = book_group.astype(np.int64) * n_ranks + np.searchsorted(all_dates, book_dates)
+        order = np.argsort(book_keys, kind='stable')
+        sorted_keys = book_keys[order]
+        sorted_positions = book[order]
+        
+        requests = np.flatnonzero(request_valid)
+        base = request_group[requests].astype(np.int64) * n_ranks
+        starts = np.searchsorted(sorted_keys, base + np.searchsorted(all_dates, lower[requests].view(np.int64)), side='left')
+        ends = np.searchsorted(sorted_keys, base + np.searchsorted(all_dates, upper[requests].view(np.int64)), side='right')
+        
+        # 다음 미대사 슬롯 포인터 (대사된 슬롯은 오른쪽으로 연결)
+        next_free = list(range(len(sorted_positions) + 1))
+        for slot in np.flatnonzero(self._claimed[sorted_positions]).tolist():
+            next_free[slot] = slot + 1
+        
+        def find(slot):
+            root = slot
+            while next_free[root] != root:
+                root = next_free[root]
+            while next_free[slot] != root:
+                next_free[slot], slot = root, next_free[slot]
+            return root
+        
+        for request, start, end in zip(requests.tolist(), starts.tolist(), ends.tolist()):
+            if start >= end:
+                continue
+            slot = find(start)
+            if slot < end:
+                result[request] = sorted_positions[slot]
+                next_free[slot] = slot + 1
+        
+        matched = result[result >= 0]
+        self._claimed[matched] = True
+        return result
+    
+    def window(self, vendor, lower, upper) -> np.ndarray:
+        """거래처의 회계일 구간(양끝 포함) 내 미대사 전표 위치 (회계일 순)"""
+        vendor_range = self._vendor_ranges.get(vendor)
+        if vendor_range is None or pd.isna(lower) or pd.isna(upper):
+            return np.array([], dtype=np.intp)
+        
+        lo, hi = vendor_range
+        dates = self._vendor_dates[lo:hi]
+        start = lo + np.searchsorted(dates, np.datetime64(lower, 'ns').view(np.int64), side='left')
+        end = lo + np.searchsorted(dates, np.datetime64(upper, 'ns').view(np.int64), side='right')
+        positions = self._by_vendor[start:end]
+        return positions[~self._claimed[positions]]
@@ -0,0 +1,105 @@
+"""
+대사 진행률 보고 및 협조적 취소
+"""
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+class ReconciliationCancelled(BaseException):
+    """
+    사용자 취소로 대사 처리를 중단할 때 발생
+
+    단계별 `except Exception` 처리에서 다른 오류로 감싸이지 않도록 BaseException을 상속한다.
+    """
+
+
+class ProgressTracker:
+    """
+    단계 가중치 기반 진행률 보고 + 취소 확인
+
+    - progress_callback(percent, message, eta_seconds): percent는 0~100 실수,
+      eta_seconds는 경과 시간과 진행률로 계산한 남은 시간 (계산 불가 시 None)
+    - cancel_callback(): True를 반환하면 다음 확인 시점에 ReconciliationCancelled 발생
+    - 행 단위 step()은 자주 호출해도 되며, 취소 확인은 check_interval,
+      진행률 보고는 report_interval 간격으로만 수행한다.
+    """
+
+    def __init__(self, stages: Sequence[Tuple[str, float]] = (),
+                 progress_callback: Optional[Callable[[float, str, Optional[float]], None]] = None,
+                 cancel_callback: Optional[Callable[[], bool]] = None,
+                 report_interval: float = 0.2, check_interval: float = 0.05):
+        """
+        Args:
+            stages: (단계 이름, 가중치) 목록 - 진행률은 가중치 비율로 배분
+        """
+        total = sum(weight for _, weight in stages) or 1.0
+        self._offsets: Dict[str, Tuple[float, float]] = {}
+        offset = 0.0
+        for name, weight in stages:
+            self._offsets[name] = (offset / total * 100, weight / total * 100)
+            offset += weight
+
+        self.progress_callback = progress_callback
+        self.cancel_callback = cancel_callback
+        self.report_interval = report_interval
+        self.check_interval = check_interval
+
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self._last_check = 0.0
+        self._stage = None
+        self._span = None
+        self._message = ""
+        self._percent = 0.0
+
+    def stage(self, name: str, message: str, through: Optional[str] = None):
+        """
+        단계 시작 (항상 보고 및 취소 확인)
+
+        through를 지정하면 name부터 through 단계까지를 하나의 단계로 보고 step()을 배분한다.
+        """
+        self._stage = name
+        self._message = message
+        self._percent = self._offsets.get(name, (self._percent, 0.0))[0]
+        self._span = None
+        if through in self._offsets and name in self._offsets:
+            end = sum(self._offsets[through])
+            self._span = (self._percent, end - self._percent)
+        self.check()
+        self._report()
+
+    def step(self, done: int, total: int):
+        """현재 단계 내 진행 (done/total)"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self.check()
+        if self._stage in self._offsets and total > 0:
+            start, span = self._span or self._offsets[self._stage]
+            self._percent = start + span * min(done / total, 1.0)
+        if now - self._last_report >= self.report_interval:
+            self._report()
+
+    def check(self):
+        """취소 요청 확인"""
+        self._last_check = time.monotonic()
+        if self.cancel_callback is not None and self.cancel_callback():
+            raise ReconciliationCancelled("사용자가 대사 처리를 취소했습니다")
+
+    def finish(self, message: str = "완료"):
+        self._stage = None
+        self._message = message
+        self._percent = 100.0
+        self._report()
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """남은 예상 시간 (진행률 1% 미만이면 None)"""
+        if self._percent < 1.0:
+            return None
+        elapsed = time.monotonic() - self._started
+        return elapsed * (100.0 - self._percent) / self._percent
+
+    def _report(self):
+        self._last_report = time.monotonic()
+        if self.progress_callback is not None:
+            self.progress_callback(self._percent, self._message, self.eta_seconds)
@@ -3,23 +3,123 @@
 """
 import pandas as pd
 import numpy as np
-import win32com.client as win32
 import os
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
 # kfunction 모듈 경로 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from kfunction import read_excel_data
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+from kfunction import read_excel_data, is_excel_cached, cache_excel_data
 
+from src.models.amount import missing_won, to_won, with_vat, won_values
 from src.models.reconciliation_models import DataContainer
+from src.services.matching_engine import (
+    EXACT_MATCH_KEYS, EXACT_MATCH_MANUAL_KEYS, CandidateIndex, FifoSumCursor, LedgerIndex, ThresholdTree,
+    invoice_condition_for, month_window, rank_match, shard_assignment, shard_ids
+)
+from src.services.subset_sum_solver import SubsetSumSolver
+from src.services.excel_writer import save_sheets
+from src.services.progress import ProgressTracker
+from src.services.artifact_store import ArtifactStore, open_artifact_store
+from src.services.composite_key import dictionary_codes, lookup_codes, pack_codes
+from src.services.file_snapshot import FileFingerprint, content_digest
+from src.services.date_normalizer import normalize_dates
+from src.services.input_schema import (
+    COMPACT_LABELS, compact_labels, load_input_schemas, schema_digest, status_column
+)
+from src.services import match_status as ms
+
+# 결과 Excel 저장 백엔드: 'openpyxl'(xlsx 직접 기록, 기본) | 'com'(Excel 실행, Windows 전용)
+EXCEL_WRITER_BACKEND = os.environ.get('SUBCON_EXCEL_WRITER', 'openpyxl').lower()
+
+# 병렬 대사 프로세스 수: 'auto'(대용량일 때 CPU 수) | 숫자 (1이면 항상 순차)
+MATCH_WORKERS = os.environ.get('SUBCON_MATCH_WORKERS', 'auto')
+
+
+def _read_workbook(file_path: str, read_kwargs: Dict) -> pd.DataFrame:
+    """프로세스 풀 작업 함수 - 파일 하나를 읽어 DataFrame 반환"""
+    return read_excel_data(file_path, **read_kwargs)
+
+
+def _match_shard(pivot: pd.DataFrame, tax: pd.DataFrame, solver_settings: Dict):
+    """프로세스 풀 작업 함수 - 협력사 분할 하나에 대해 Step A → D 대사"""
+    service = ReconciliationService()
+    service.subset_sum_solver = SubsetSumSolver(**solver_settings)
+    service.df_final_pivot = pivot
+    # 후보 인덱스는 행 위치 기반이므로 분할 안에서 RangeIndex로 처리 후 원래 인덱스 복원
+    service.df_tax_new = tax.reset_index(drop=True)
+    service.candidate_index = CandidateIndex(service.df_tax_new)
+    service._run_matching_cascade()
+    service.df_tax_new.index = tax.index
+    return service.df_final_pivot, service.df_tax_new, service.match_warnings
+
+
+def _payment_shard(tax: pd.DataFrame, book: pd.DataFrame, solver_settings: Dict):
+    """프로세스 풀 작업 함수 - 사업자번호 분할 하나에 대해 지불보조장 대사"""
+    service = ReconciliationService()
+    service.subset_sum_solver = SubsetSumSolver(**solver_settings)
+    service.df_tax_new = tax
+    service.filtered_df_book = book
+    service._match_payment_book()
+    return service.df_tax_new, service.filtered_df_book, service.match_warnings
 
 
 class ReconciliationService:
     """매입대사2.ipynb의 로직을 그대로 이식한 서비스"""
     
+    # 입력 파일 로드 사양: (파일 키, 표시명, read_excel_data 인자, 필수 여부)
+    # 컬럼 형식(코드/금액/날짜/라벨)은 config/app_config.json의 input_schemas로 로드 시 변환
+    LOAD_SPECS = [
+        ('standard', '기준', {}, True),
+        ('purchase_detail', '협력사단품별매입', {'header': 0}, True),
+        ('tax_invoice', '매입세금계산서', {'header': [0, 1]}, True),
+        ('payment_ledger', '지불보조장', {}, True),
+        ('tax_invoice_wis', '매입세금계산서(WIS)', {}, True),
+        ('processing_fee', '임가공비', {}, False),
+    ]
+    
+    # 파일 키 → 로드 결과를 담을 속성
+    LOAD_TARGETS = {
+        'standard': 'df_standard',
+        'purchase_detail': 'df',
+        'tax_invoice': 'df_tax_hifi',
+        'payment_ledger': 'df_book',
+        'tax_invoice_wis': 'df_num',
+        'processing_fee': 'df_processing',
+    }
+    
+    # 병렬 대사 자동 사용 기준 행 수 / 최대 프로세스 수 / 분할 작업 대기 중 취소 확인 간격(초)
+    PARALLEL_MIN_ROWS = 20000
+    MAX_MATCH_WORKERS = 32
+    WAIT_INTERVAL = 0.2
+    
+    # 지불보조장 대사 허용 회계일 범위: 세금계산서 작성월부터 개월 수
+    PAYMENT_WINDOW_MONTHS = 2
+    
+    # 기간 필터 대상 입력: 파일 키 → (기준 컬럼, 형식, 종료월 이후 포함할 개월 수)
+    PERIOD_FILTERS = {
+        'purchase_detail': ('년월', 'yyyymm', 0),
+        'tax_invoice_wis': ('계산서작성일', 'date', 0),
+        'payment_ledger': ('회계일', 'date', PAYMENT_WINDOW_MONTHS - 1),
+    }
+    
+    # 진행률 단계와 가중치 (대략적인 소요 시간 비율)
+    PROGRESS_STAGES = (
+        ('preprocess', 5),
+        ('tax_invoice', 5),
+        ('exact', 4),
+        ('sequential', 12),
+        ('partial', 8),
+        ('partial_manual', 8),
+        ('payment_book', 25),
+        ('final', 3),
+        ('export', 30),
+    )
+    
     def __init__(self):
         self.data_container = DataContainer()
         
@@ -37,90 +137,94 @@ class ReconciliationService:
         self.filtered_df_book = None
         self.final_merged_df = None
         
-    def load_all_data(self, file_paths: Dict[str, str]):
-        """모든 Excel 파일 로드"""
+        # 대사 후보 인덱스 (_process_matching에서 구성)
+        self.candidate_index = None
+        
+        # 조합 탐색기 (예산은 max_nodes / time_limit 속성으로 조정)
+        self.subset_sum_solver = SubsetSumSolver()
+        self.match_warnings: List[str] = []
+        
+        # 진행률/취소 (process_reconciliation 호출 시 콜백과 함께 재생성)
+        self.progress = ProgressTracker()
+        
+        # 병렬 대사 프로세스 수 설정 (MATCH_WORKERS 참고)
+        self.match_workers = MATCH_WORKERS
+        
+        # 증분 재대사: 입력 파일 내용 해시(load_all_data에서 기록) + 단계별 중간 산출물 저장소
+        self.input_digests: Dict[str, str] = {}
+        self.artifact_store: Optional[ArtifactStore] = open_artifact_store(PROJECT_ROOT)
+        self.reused_stages: List[str] = []
+        
+        # 대사 기간 (시작일, 종료일) - process_reconciliation에서 지정, None이면 입력 전체 처리
+        self.period: Optional[Tuple[datetime, datetime]] = None
+        
+        # 파일 키 → 입력 스키마 (config/app_config.json의 input_schemas)
+        self.input_schemas: Dict[str, Dict] = load_input_schemas(PROJECT_ROOT)
+        
+    def load_all_data(self, file_paths: Dict[str, str], parallel: bool = False, max_workers: Optional[int] = None,
+                      fingerprints: Optional[Dict[str, FileFingerprint]] = None):
+        """
+        모든 Excel 파일 로드
+        
+        Args:
+            file_paths: 파일 키 → 경로
+            parallel: True면 캐시에 없는 파일들을 프로세스 풀에서 동시에 파싱
+                      (xlsx 파싱은 CPU/GIL 바운드이므로 스레드 대신 프로세스 사용)
+            max_workers: 프로세스 수 (기본: 파일 수와 CPU 수 중 작은 값)
+            fingerprints: 파일 키 → 이미 계산한 파일 지문 (없는 파일은 내용 해시를 새로 계산)
+        """
         errors = []
         loaded_files = []
+        self.input_digests = {}
         
         # 필수 파일 체크
-        required_files = ['standard', 'purchase_detail', 'tax_invoice', 'payment_ledger', 'tax_invoice_wis']
+        required_files = [key for key, _, _, required in self.LOAD_SPECS if required]
         missing_files = [f for f in required_files if f not in file_paths or not file_paths[f]]
         
         if missing_files:
             raise ValueError(f"필수 파일이 누락되었습니다: {', '.join(missing_files)}")
         
+        # 읽기 인자에 파일별 입력 스키마 추가 (로드 결과가 바로 최종 형식)
+        specs = [
+            (key, label, {**read_kwargs, 'schema': self._input_schema(key)}, required)
+            for key, label, read_kwargs, required in self.LOAD_SPECS if file_paths.get(key)
+        ]
+        
         try:
-            # 1. 기준 데이터 로드
-            if 'standard' in file_paths:
-                try:
-                    self.df_standard = read_excel_data(file_paths['standard'])
-                    if self.df_standard is None or len(self.df_standard) == 0:
-                        raise ValueError("기준 데이터가 비어있습니다")
-                    print(f"기준 데이터 로드: {len(self.df_standard)}건")
-                    loaded_files.append('standard')
-                except Exception as e:
-                    errors.append(f"기준 파일 로드 오류: {str(e)}")
-                    raise
-            
-            # 2. 협력사단품별매입 로드
-            if 'purchase_detail' in file_paths:
-                try:
-                    self.df = read_excel_data(file_paths['purchase_detail'], header=0)
-                    # Grand Total 행 제거 (노트북 로직)
-                    if len(self.df) > 0:
-                        self.df = self.df.drop(0).reset_index(drop=True)
-                    if self.df is None or len(self.df) == 0:
-                        raise ValueError("협력사단품별매입 데이터가 비어있습니다")
-                    print(f"협력사단품별매입 로드: {len(self.df)}건")
-                    loaded_files.append('purchase_detail')
-                except Exception as e:
-                    errors.append(f"협력사단품별매입 파일 로드 오류: {str(e)}")
-                    raise
-            
-            # 3. 매입세금계산서 로드
-            if 'tax_invoice' in file_paths:
-                try:
-                    self.df_tax_hifi = read_excel_data(file_paths['tax_invoice'], header=[0,1])
-                    if self.df_tax_hifi is None or len(self.df_tax_hifi) == 0:
-                        raise ValueError("매입세금계산서 데이터가 비어있습니다")
-                    print(f"매입세금계산서 로드: {len(self.df_tax_hifi)}건")
-                    loaded_files.append('tax_invoice')
-                except Exception as e:
-                    errors.append(f"매입세금계산서 파일 로드 오류: {str(e)}")
-                    raise
-            
-            # 4. 지불보조장 로드
-            if 'payment_ledger' in file_paths:
-                try:
-                    self.df_book = read_excel_data(file_paths['payment_ledger'])
-                    if self.df_book is None or len(self.df_book) == 0:
-                        raise ValueError("지불보조장 데이터가 비어있습니다")
-                    print(f"지불보조장 로드: {len(self.df_book)}건")
-                    loaded_files.append('payment_ledger')
-                except Exception as e:
-                    errors.append(f"지불보조장 파일 로드 오류: {str(e)}")
-                    raise
+            if parallel:
+                raw_results = self._read_files_parallel(specs, file_paths, max_workers)
+            else:
+                raw_results = {}
             
-            # 5. 매입세금계산서(WIS) 로드
-            if 'tax_invoice_wis' in file_paths:
+            for key, label, read_kwargs, required in specs:
                 try:
-                    self.df_num = read_excel_data(file_paths['tax_invoice_wis'])
-                    if self.df_num is None or len(self.df_num) == 0:
-                        raise ValueError("매입세금계산서(WIS) 데이터가 비어있습니다")
-                    print(f"매입세금계산서(WIS) 로드: {len(self.df_num)}건")
-                    loaded_files.append('tax_invoice_wis')
+                    if key in raw_results:
+                        result = raw_results[key]
+                        if isinstance(result, Exception):
+                            raise result
+                    else:
+                        result = read_excel_data(file_paths[key], **read_kwargs)
+                    
+                    setattr(self, self.LOAD_TARGETS[key], self._finalize_loaded(key, label, result))
+                    print(f"{label} 로드: {len(getattr(self, self.LOAD_TARGETS[key]))}건")
+                    loaded_files.append(key)
+                    
+                    # 내용 해시는 중간 산출물 재사용 키에만 필요 - 지문에 없으면 여기서(작업 스레드) 계산
+                    fingerprint = (fingerprints or {}).get(key)
+                    if self.artifact_store is not None:
+                        self.input_digests[key] = (fingerprint.digest if fingerprint and fingerprint.digest
+                                                   else content_digest(file_paths[key]))
                 except Exception as e:
-                    errors.append(f"매입세금계산서(WIS) 파일 로드 오류: {str(e)}")
-                    raise
+                    if not required:
+                        print(f"{label} 파일 로드 경고: {str(e)} (선택 파일이므로 계속 진행)")
+                        continue
+                    errors.append(f"{label} 파일 로드 오류: {str(e)}")
+                    # 순차 모드는 첫 오류에서 중단, 병렬 모드는 모든 파일의 오류를 모아서 보고
+                    if not parallel:
+                        raise
             
-            # 6. 임가공비 로드 (선택사항)
-            if 'processing_fee' in file_paths and file_paths['processing_fee']:
-                try:
-                    self.df_processing = read_excel_data(file_paths['processing_fee'])
-                    print(f"임가공비 로드: {len(self.df_processing)}건")
-                    loaded_files.append('processing_fee')
-                except Exception as e:
-                    print(f"임가공비 파일 로드 경고: {str(e)} (선택 파일이므로 계속 진행)")
+            if errors:
+                raise ValueError(errors[0])
                     
             print(f"\n✅ 파일 로드 완료: {len(loaded_files)}개 파일")
                 
@@ -131,8 +235,58 @@ class ReconciliationService:
                 error_msg = f"데이터 로드 실패: {str(e)}"
             raise Exception(error_msg)
     
-    def process_reconciliation(self, start_date: datetime, end_date: datetime) -> Dict:
-        """매입대사 처리 - 노트북 로직 그대로 구현"""
+    def _read_files_parallel(self, specs, file_paths: Dict[str, str], max_workers: Optional[int] = None) -> Dict:
+        """캐시에 없는 파일을 프로세스 풀에서 동시에 읽기 (키 → DataFrame 또는 Exception)"""
+        pending = [
+            (key, read_kwargs) for key, _, read_kwargs, _ in specs
+            if not is_excel_cached(file_paths[key], **read_kwargs)
+        ]
+        if len(pending) < 2:
+            return {}
+        
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        print(f"📥 {len(pending)}개 파일 병렬 로드 (프로세스 {workers}개)")
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_read_workbook, file_paths[key], read_kwargs): (key, read_kwargs)
+                for key, read_kwargs in pending
+            }
+            for future in as_completed(futures):
+                key, read_kwargs = futures[future]
+                try:
+                    df = future.result()
+                    # 자식 프로세스의 캐시는 사라지므로 현재 프로세스 캐시에 저장
+                    cache_excel_data(file_paths[key], df, **read_kwargs)
+                    results[key] = df
+                except Exception as e:
+                    results[key] = e
+        return results
+    
+    def _input_schema(self, key: str) -> Dict:
+        """파일 키의 입력 스키마 (없으면 설정 오류)"""
+        if key not in self.input_schemas:
+            raise ValueError(f"config/app_config.json에 '{key}' 입력 스키마(input_schemas)가 없습니다")
+        return self.input_schemas[key]
+    
+    def _finalize_loaded(self, key: str, label: str, df: pd.DataFrame) -> pd.DataFrame:
+        """로드 직후 확인 - 빈 데이터 (Grand Total 행 제거/형식 변환은 입력 스키마에서 처리)"""
+        if key != 'processing_fee' and (df is None or len(df) == 0):
+            raise ValueError(f"{label} 데이터가 비어있습니다")
+        return df
+    
+    def process_reconciliation(self, start_date: datetime, end_date: datetime,
+                               progress_callback=None, cancel_callback=None, incremental: bool = True) -> Dict:
+        """
+        매입대사 처리 - 노트북 로직 그대로 구현
+        
+        Args:
+            progress_callback: (진행률 0~100, 단계 메시지, 남은 예상 시간(초) 또는 None) 보고 함수
+            cancel_callback: True 반환 시 다음 확인 시점에 ReconciliationCancelled로 중단
+            incremental: True면 입력이 바뀌지 않은 단계의 저장된 산출물을 재사용
+                         (load_all_data로 로드해 입력 해시가 있을 때만 적용)
+        """
         results = {
             'period': {
                 'start': start_date.strftime('%Y-%m-%d'),
@@ -141,50 +295,88 @@ class ReconciliationService:
             'summary': {},
             'output_path': None,
             'errors': [],
-            'warnings': []
+            'warnings': [],
+            'reused_stages': []
         }
         
+        self.progress = ProgressTracker(self.PROGRESS_STAGES, progress_callback, cancel_callback)
+        self.subset_sum_solver.cancel_check = self.progress.check
+        
         try:
+            self.match_warnings = []
+            
             # 0. 날짜 유효성 검증
             if start_date > end_date:
                 raise ValueError(f"시작일({start_date})이 종료일({end_date})보다 늦습니다")
             
-            # 1. 데이터 전처리 및 피벗
-            print("📊 데이터 전처리 시작...")
-            try:
-                self._preprocess_and_pivot()
-                print(f"✅ 피벗 데이터 생성 완료: {len(self.df_final_pivot)}건")
-            except Exception as e:
-                raise Exception(f"데이터 전처리 실패: {str(e)}")
+            # 이후 모든 단계는 기간 안의 입력 행만 처리 (단계 키에도 기간이 포함됨)
+            self.period = (start_date, end_date)
             
-            # 2. 세금계산서 데이터 처리
-            print("📄 세금계산서 데이터 처리 시작...")
-            try:
-                self._process_tax_invoices()
-                print(f"✅ 세금계산서 처리 완료: {len(self.df_tax_new)}건")
-            except Exception as e:
-                raise Exception(f"세금계산서 처리 실패: {str(e)}")
+            # 증분 재대사: 입력이 그대로인 가장 하위 단계의 산출물부터 이어서 처리
+            self.reused_stages = []
+            stage_keys = self._stage_keys(start_date, end_date) if incremental else {}
+            if self._restore_stage('payment', stage_keys):
+                resume_from = 'payment'
+            elif self._restore_stage('match', stage_keys):
+                resume_from = 'match'
+            else:
+                resume_from = None
             
-            # 3. 대사 처리 (노트북의 복잡한 로직)
-            print("🔄 대사 처리 시작...")
-            try:
-                self._process_matching()
-                print("✅ 대사 처리 완료")
-            except Exception as e:
-                raise Exception(f"대사 처리 실패: {str(e)}")
+            if resume_from is None:
+                # 1. 데이터 전처리 및 피벗
+                print("📊 데이터 전처리 시작...")
+                self.progress.stage('preprocess', "데이터 전처리 및 피벗")
+                if not self._restore_stage('pivot', stage_keys):
+                    try:
+                        self._preprocess_and_pivot()
+                        print(f"✅ 피벗 데이터 생성 완료: {len(self.df_final_pivot)}건")
+                    except Exception as e:
+                        raise Exception(f"데이터 전처리 실패: {str(e)}")
+                    self._persist_stage('pivot', stage_keys)
+                
+                # 2. 세금계산서 데이터 처리
+                print("📄 세금계산서 데이터 처리 시작...")
+                self.progress.stage('tax_invoice', "세금계산서 데이터 처리")
+                if not self._restore_stage('tax', stage_keys):
+                    try:
+                        self._process_tax_invoices()
+                        print(f"✅ 세금계산서 처리 완료: {len(self.df_tax_new)}건")
+                    except Exception as e:
+                        raise Exception(f"세금계산서 처리 실패: {str(e)}")
+                    self._persist_stage('tax', stage_keys)
+                
+                # 3. 대사 처리 (노트북의 복잡한 로직)
+                print("🔄 대사 처리 시작...")
+                try:
+                    self._process_matching()
+                    print("✅ 대사 처리 완료")
+                except Exception as e:
+                    raise Exception(f"대사 처리 실패: {str(e)}")
+                self._persist_stage('match', stage_keys)
             
-            # 4. 지불보조장 대사
-            print("💳 지불보조장 대사 시작...")
-            try:
-                self._process_payment_book()
-                if hasattr(self, 'filtered_df_book'):
-                    print(f"✅ 지불보조장 대사 완료: {len(self.filtered_df_book)}건")
-            except Exception as e:
-                results['warnings'].append(f"지불보조장 대사 경고: {str(e)}")
-                print(f"⚠️ 지불보조장 대사 경고: {str(e)}")
+            if resume_from != 'payment':
+                # 4. 지불보조장 대사
+                print("💳 지불보조장 대사 시작...")
+                self.progress.stage('payment_book', "지불보조장 대사")
+                try:
+                    self._process_payment_book()
+                    if hasattr(self, 'filtered_df_book'):
+                        print(f"✅ 지불보조장 대사 완료: {len(self.filtered_df_book)}건")
+                    self._persist_stage('payment', stage_keys)
+                except Exception as e:
+                    results['warnings'].append(f"지불보조장 대사 경고: {str(e)}")
+                    print(f"⚠️ 지불보조장 대사 경고: {str(e)}")
+            
+            if self.reused_stages:
+                print(f"♻️ 입력이 바뀌지 않아 재사용한 단계: {', '.join(self.reused_stages)}")
+            results['reused_stages'] = list(self.reused_stages)
+            
+            # 조합 탐색 예산 초과 경고
+            results['warnings'].extend(self.match_warnings)
             
             # 5. 최종 결과 생성
             print("📝 최종 결과 생성...")
+            self.progress.stage('final', "최종 결과 생성")
             try:
                 self._create_final_results()
                 print("✅ 최종 결과 생성 완료")
@@ -193,6 +385,7 @@ class ReconciliationService:
             
             # 6. Excel 파일 생성
             print("💾 Excel 파일 생성...")
+            self.progress.stage('export', "Excel 파일 생성")
             try:
                 output_path = self._save_to_excel()
                 results['output_path'] = output_path
@@ -214,6 +407,7 @@ class ReconciliationService:
             except Exception as e:
                 results['warnings'].append(f"요약 정보 생성 경고: {str(e)}")
             
+            self.progress.finish("대사 처리 완료")
             return results
             
         except Exception as e:
@@ -221,6 +415,95 @@ class ReconciliationService:
             results['summary'] = {'status': 'failed', 'error': str(e)}
             raise Exception(f"대사 처리 실패: {str(e)}")
     
+    # 증분 재대사 단계: (의존 입력 파일 키, 상위 단계, 저장할 속성)
+    # tax는 피벗에 있는 협력사코드의 계산서만 남기므로 pivot에 의존한다
+    INCREMENTAL_STAGES = {
+        'pivot': (('purchase_detail', 'standard'), (), ('df_final_pivot',)),
+        'tax': (('tax_invoice_wis', 'tax_invoice'), ('pivot',), ('df_tax_new',)),
+        'match': ((), ('pivot', 'tax'), ('df_final_pivot', 'df_tax_new', 'match_warnings')),
+        'payment': (('payment_ledger',), ('match',), ('df_final_pivot', 'df_tax_new', 'filtered_df_book', 'match_warnings')),
+    }
+    
+    # 조합 탐색기(SubsetSumSolver) 예산이 결과에 영향을 주는 단계
+    SOLVER_STAGES = ('match', 'payment')
+    
+    def _stage_keys(self, start_date: datetime, end_date: datetime) -> Dict[str, str]:
+        """
+        단계별 키 (입력 해시가 없으면 빈 dict)
+        
+        의존 입력 파일 해시 + 입력 스키마 + 라벨 압축 여부 + 조합 탐색 예산(대사 단계) + 상위 단계 키 + 대사 기간.
+        대사 코드 자체가 바뀐 경우는 저장소의 코드 해시(code_version)로 구분된다.
+        """
+        if self.artifact_store is None:
+            return {}
+        
+        keys = {}
+        period = (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+        for stage, (inputs, upstream, _) in self.INCREMENTAL_STAGES.items():
+            if any(key not in self.input_digests for key in inputs) or any(up not in keys for up in upstream):
+                continue
+            keys[stage] = self.artifact_store.stage_key(
+                stage, period,
+                [self.input_digests[key] for key in inputs],
+                [schema_digest(self.input_schemas.get(key)) for key in inputs],
+                COMPACT_LABELS,
+                self._solver_settings() if stage in self.SOLVER_STAGES else None,
+                [keys[up] for up in upstream]
+            )
+        return keys
+    
+    def _restore_stage(self, stage: str, stage_keys: Dict[str, str]) -> bool:
+        """저장된 단계 산출물이 있으면 복원"""
+        if stage not in stage_keys:
+            return False
+        artifacts = self.artifact_store.get(stage, stage_keys[stage])
+        if artifacts is None:
+            return False
+        for name, value in artifacts.items():
+            setattr(self, name, value)
+        self.reused_stages.append(stage)
+        return True
+    
+    def _persist_stage(self, stage: str, stage_keys: Dict[str, str]):
+        """단계 산출물 저장 (이후 실행에서 입력이 같으면 재사용)"""
+        if stage not in stage_keys:
+            return
+        outputs = self.INCREMENTAL_STAGES[stage][2]
+        self.artifact_store.put(stage, stage_keys[stage], {name: getattr(self, name) for name in outputs})
+    
+    def input_in_period(self, file_key: str) -> Optional[pd.DataFrame]:
+        """
+        로드한 입력 중 대사 기간에 해당하는 행만 반환 (PERIOD_FILTERS 기준)
+        
+        - 협력사단품별매입: 년월이 시작월~종료월
+        - 매입세금계산서(WIS): 계산서작성일이 시작월 1일~종료월 말일
+        - 지불보조장: 회계일이 시작월 1일~(종료월 + 지불 허용 기간) 말일
+        
+        기간이 지정되지 않았거나 기준 컬럼이 없으면 입력 전체를 그대로 반환한다.
+        """
+        df = getattr(self, self.LOAD_TARGETS[file_key])
+        if df is None or self.period is None or file_key not in self.PERIOD_FILTERS:
+            return df
+        column, kind, extra_months = self.PERIOD_FILTERS[file_key]
+        if column not in df.columns:
+            return df
+        
+        start, end = self.period
+        if kind == 'yyyymm':
+            values = pd.to_numeric(df[column], errors='coerce')
+            mask = values.between(start.year * 100 + start.month, end.year * 100 + end.month)
+        else:
+            # 시작월 1일 이상, (종료월 + extra_months) 다음 달 1일 미만
+            lower = month_window([start.year], [start.month])[0][0]
+            upper = month_window([end.year], [end.month], span=extra_months + 1)[1][0] + np.timedelta64(1, 'D')
+            values = normalize_dates(df[column])
+            mask = (values >= lower) & (values < upper)
+        return df[mask.to_numpy(dtype=bool)]
+    
+    def _period_text(self) -> str:
+        start, end = self.period
+        return f"{start.strftime('%Y-%m-%d')} ~ {end.strftime('%Y-%m-%d')}"
+    
     def _preprocess_and_pivot(self):
         """데이터 전처리 및 피벗 - 노트북 로직"""
         try:
@@ -236,48 +519,66 @@ class ReconciliationService:
             if missing_cols:
                 raise ValueError(f"협력사단품별매입 파일에 필수 컬럼이 없습니다: {', '.join(missing_cols)}")
             
-            # 그룹화하여 최종매입금액 합계
-            self.df_pivot = self.df.groupby(["년월", "협력사코드", "단품코드", "면과세구분명"]).agg({
-                "최종매입금액": "sum",
-                "협력사명": "first",
-                "단품명": "first"
-            }).reset_index()
-            
-            # 컬럼 순서 조정
-            self.df_pivot = self.df_pivot[["년월", "협력사코드", "협력사명", "단품코드", "단품명", "면과세구분명", "최종매입금액"]]
-            
-            # 기준 데이터와 조인
-            df_standard_subset = self.df_standard[['협력사코드', '단품코드']].drop_duplicates(subset=['협력사코드', '단품코드'])
-            
-            # 타입 변환
-            try:
-                self.df_pivot['협력사코드'] = self.df_pivot['협력사코드'].astype(int).astype(str)
-                df_standard_subset['협력사코드'] = df_standard_subset['협력사코드'].astype(int).astype(str)
-                self.df_pivot['단품코드'] = self.df_pivot['단품코드'].astype(int).astype(str)
-                df_standard_subset['단품코드'] = df_standard_subset['단품코드'].astype(int).astype(str)
-            except Exception as e:
-                raise ValueError(f"협력사코드/단품코드 타입 변환 실패: {str(e)}")
-            
-            # Inner join
-            df_final = pd.merge(self.df_pivot, df_standard_subset, on=['협력사코드', '단품코드'], how='inner')
-            
-            if len(df_final) == 0:
+            # 대사 기간의 매입만 사용
+            df = self.input_in_period('purchase_detail')
+            if len(df) == 0:
+                raise ValueError(f"대사 기간({self._period_text()})의 협력사단품별매입 데이터가 없습니다")
+            if len(df) < len(self.df):
+                print(f"  - 기간 필터: 협력사단품별매입 {len(self.df)}건 → {len(df)}건")
+            
+            # 키 컬럼을 정수 코드로 (코드 순서 = 값 정렬 순서, 결측 -1)
+            month_codes, months = dictionary_codes(df["년월"])
+            vendor_codes, vendors = dictionary_codes(df["협력사코드"])
+            item_codes, items = dictionary_codes(df["단품코드"])
+            type_codes, types = dictionary_codes(df["면과세구분명"])
+            
+            # 년월/협력사/단품/면과세별 최종매입금액 합계 (int64 복합 키, 키 결측 행 제외)
+            item_keys = pack_codes([month_codes, vendor_codes, item_codes, type_codes],
+                                   [len(months), len(vendors), len(items), len(types)])
+            valid = np.flatnonzero(item_keys >= 0)
+            df_items = pd.DataFrame({
+                "행": valid,
+                "협력사명": df["협력사명"].array[valid],
+                "최종매입금액": won_values(df["최종매입금액"])[valid],
+            }).groupby(item_keys[valid], sort=True).agg({"행": "first", "협력사명": "first", "최종매입금액": "sum"})
+            item_rows = df_items["행"].to_numpy()
+            
+            # 기준 데이터와 조인 - 협력사코드/단품코드 쌍을 같은 사전의 코드로 묶어 포함 여부만 확인
+            df_standard_subset = self.df_standard[['협력사코드', '단품코드']]
+            pair_keys = pack_codes(
+                [np.concatenate([vendor_codes[item_rows], lookup_codes(df_standard_subset['협력사코드'], vendors)]),
+                 np.concatenate([item_codes[item_rows], lookup_codes(df_standard_subset['단품코드'], items)])],
+                [len(vendors), len(items)])
+            standard_keys = pair_keys[len(item_rows):]
+            joined = np.isin(pair_keys[:len(item_rows)], standard_keys[standard_keys >= 0])
+            
+            if not joined.any():
                 raise ValueError("기준 데이터와 매칭되는 데이터가 없습니다")
             
-            # 협력사별 집계
-            self.df_final_pivot = df_final.groupby(["년월", "협력사코드", "면과세구분명"]).agg({
-                "협력사명": "first",
-                "최종매입금액": "sum"
-            }).reset_index()
-            
-            self.df_final_pivot = self.df_final_pivot[["년월", "협력사코드", "협력사명", "면과세구분명", "최종매입금액"]]
-            
-            # 정렬 및 key 생성
-            self.df_final_pivot = self.df_final_pivot.sort_values(by=["협력사코드", "년월", "면과세구분명"])
+            # 협력사별 집계 (협력사명은 단품코드 순으로 첫 값)
+            item_rows = item_rows[joined]
+            vendor_keys = pack_codes([month_codes[item_rows], vendor_codes[item_rows], type_codes[item_rows]],
+                                     [len(months), len(vendors), len(types)])
+            df_vendors = pd.DataFrame({
+                "행": item_rows,
+                "협력사명": df_items["협력사명"].array[joined],
+                "최종매입금액": df_items["최종매입금액"].array[joined],
+            }).groupby(vendor_keys, sort=True).agg({"행": "first", "협력사명": "first", "최종매입금액": "sum"})
+            
+            # 표시용 키 컬럼은 그룹별 첫 행에서 가져옴
+            vendor_rows = df_vendors["행"].to_numpy()
+            self.df_final_pivot = df[["년월", "협력사코드", "면과세구분명"]].take(vendor_rows).reset_index(drop=True)
+            self.df_final_pivot.insert(2, "협력사명", df_vendors["협력사명"].array)
+            self.df_final_pivot["최종매입금액"] = df_vendors["최종매입금액"].array
+            
+            # 정렬 (협력사코드, 년월, 면과세구분명) 및 key 생성
+            order = np.argsort(pack_codes([vendor_codes[vendor_rows], month_codes[vendor_rows], type_codes[vendor_rows]],
+                                          [len(vendors), len(months), len(types)]), kind='stable')
+            self.df_final_pivot = self.df_final_pivot.take(order)
             self.df_final_pivot["key"] = (
-                self.df_final_pivot["년월"].astype(int).astype(str) + 
-                self.df_final_pivot["협력사코드"].astype(str) + 
-                self.df_final_pivot["면과세구분명"]
+                self.df_final_pivot["년월"].astype(str) + 
+                self.df_final_pivot["협력사코드"] + 
+                self.df_final_pivot["면과세구분명"].astype(str)
             )
             
             # 0원 제외
@@ -289,24 +590,6 @@ class ReconciliationService:
         except Exception as e:
             raise Exception(f"데이터 전처리 실패: {str(e)}")
     
-    def _safe_remove_tz(self, s: pd.Series) -> pd.Series:
-        """
-        개별 Timestamp 단위로 timezone을 제거한다.
-        tz-aware → tz-naive로 변환, NaT/naive 값은 그대로 둔다.
-        
-        Args:
-            s: pandas Series (datetime 타입)
-        
-        Returns:
-            timezone이 제거된 pandas Series
-        """
-        def remove_tz_element(x):
-            if isinstance(x, pd.Timestamp) and x.tzinfo is not None:
-                return x.tz_localize(None)
-            return x
-        
-        return s.apply(remove_tz_element)
-    
     def _find_date_column(self, df, keyword):
         """날짜 컬럼을 동적으로 찾는 헬퍼 함수"""
         # 첫 번째 시도: 완전 일치 + nan 없음
@@ -339,17 +622,15 @@ class ReconciliationService:
             if missing_cols:
                 raise ValueError(f"매입세금계산서(WIS)에 필수 컬럼이 없습니다: {', '.join(missing_cols)}")
             
-            # df_num에서 필요한 컬럼만 추출 (명시적 복사로 SettingWithCopyWarning 방지)
-            self.df_tax = self.df_num[required_cols].copy()
+            # 대사 기간의 세금계산서만 사용
+            df_num = self.input_in_period('tax_invoice_wis')
+            if len(df_num) < len(self.df_num):
+                print(f"  - 기간 필터: 매입세금계산서(WIS) {len(self.df_num)}건 → {len(df_num)}건")
             
-            # 타입 변환
-            try:
-                self.df_final_pivot['협력사코드'] = self.df_final_pivot['협력사코드'].astype(str)
-                self.df_tax['협력사코드'] = self.df_tax['협력사코드'].astype(str)
-            except Exception as e:
-                raise ValueError(f"협력사코드 타입 변환 실패: {str(e)}")
+            # df_num에서 필요한 컬럼만 추출 (명시적 복사로 SettingWithCopyWarning 방지)
+            self.df_tax = df_num[required_cols].copy()
             
-            # 필터링
+            # 필터링 (협력사코드는 양쪽 모두 코드 문자열)
             self.df_tax_sort = self.df_tax[self.df_tax.협력사코드.isin(self.df_final_pivot.협력사코드.tolist())]
             
             if len(self.df_tax_sort) == 0:
@@ -413,17 +694,12 @@ class ReconciliationService:
                 self.df_tax_new = self.df_tax_sort.copy()
                 self.df_tax_new['국세청작성일'] = None
                 self.df_tax_new['국세청발급일'] = None
-                self.df_tax_new['업체사업자번호'] = self.df_tax_new['사업자번호']
+                self.df_tax_new['업체사업자번호'] = self.df_tax_new['사업자번호'].str.replace("-", "", regex=False)
             
-            # 날짜 변환 및 안전한 timezone 제거
+            # 날짜 정규화 (로드 시 변환된 컬럼은 그대로, 조회 실패로 None인 컬럼은 NaT)
             try:
-                self.df_tax_new['국세청작성일'] = pd.to_datetime(self.df_tax_new['국세청작성일'], errors='coerce')
-                self.df_tax_new['국세청발급일'] = pd.to_datetime(self.df_tax_new['국세청발급일'], errors='coerce')
-                
-                # 개별 Timestamp 단위로 안전하게 timezone 제거
                 for col in ['국세청작성일', '국세청발급일']:
-                    if col in self.df_tax_new.columns:
-                        self.df_tax_new[col] = self._safe_remove_tz(self.df_tax_new[col])
+                    self.df_tax_new[col] = normalize_dates(self.df_tax_new[col])
                         
             except Exception as e:
                 print(f"⚠️ 날짜 변환 경고: {str(e)}")
@@ -431,9 +707,6 @@ class ReconciliationService:
                 self.df_tax_new['국세청작성일'] = None
                 self.df_tax_new['국세청발급일'] = None
             
-            # 업체사업자번호 정리
-            self.df_tax_new["업체사업자번호"] = self.df_tax_new["업체사업자번호"].astype(str).str.replace("-", "", regex=True)
-            
         except Exception as e:
             raise Exception(f"세금계산서 데이터 처리 실패: {str(e)}")
     
@@ -466,7 +739,7 @@ class ReconciliationService:
                 # 국세청작성일이 없거나 사용 불가한 경우 계산서작성일 사용
                 print(f"⚠️ 국세청작성일 사용 불가, 계산서작성일 사용: {str(e)}")
                 try:
-                    self.df_tax_new['계산서작성일'] = pd.to_datetime(self.df_tax_new['계산서작성일'], errors='coerce')
+                    self.df_tax_new['계산서작성일'] = normalize_dates(self.df_tax_new['계산서작성일'])
                     # 계산서작성일도 안전하게 접근
                     date_series = self.df_tax_new['계산서작성일']
                     if hasattr(date_series, 'dt'):
@@ -487,21 +760,19 @@ class ReconciliationService:
                     self.df_tax_new['작성년도'] = now.year
                     self.df_tax_new['작성월'] = now.month
             
-            # 공급가액, 세액 숫자 변환
-            try:
-                self.df_tax_new["공급가액"] = pd.to_numeric(self.df_tax_new["공급가액"], errors="coerce")
-                self.df_tax_new["세액"] = pd.to_numeric(self.df_tax_new["세액"], errors="coerce")
-            except Exception as e:
-                raise ValueError(f"금액 변환 실패: {str(e)}")
+            # 대사 상태 컬럼 추가 (대사여부/구분키 라벨은 최종 결과 생성 시 만듦)
+            self.df_tax_new[ms.STATUS] = ms.status_array(len(self.df_tax_new))
+            self.df_tax_new[ms.PIVOT_ROW] = ms.row_array(len(self.df_tax_new))
+            self.df_tax_new[ms.ORDINAL] = ms.ordinal_array(len(self.df_tax_new))
             
-            # 대사여부, 구분키 컬럼 추가
-            self.df_tax_new['대사여부'] = ""
-            self.df_tax_new['구분키'] = ""
+            # 후보 인덱스 구성 (행 위치 기반이므로 RangeIndex 보장)
+            self.df_tax_new = self.df_tax_new.reset_index(drop=True)
+            self.candidate_index = CandidateIndex(self.df_tax_new)
             
             # df_final_pivot 처리
             try:
-                self.df_final_pivot['년'] = self.df_final_pivot['년월'].astype(str).str[:4].astype(int)
-                self.df_final_pivot['월'] = self.df_final_pivot['년월'].astype(str).str[4:6].astype(int)
+                self.df_final_pivot['년'] = self.df_final_pivot['년월'] // 100
+                self.df_final_pivot['월'] = self.df_final_pivot['년월'] % 100
             except Exception as e:
                 raise ValueError(f"년월 분리 실패: {str(e)}")
             
@@ -510,215 +781,289 @@ class ReconciliationService:
             self.df_final_pivot['국세청발급일'] = None
             self.df_final_pivot['국세청공급가액'] = None
             self.df_final_pivot['국세청세액'] = None
-            self.df_final_pivot['구분키'] = ""
+            self.df_final_pivot[ms.STATUS] = ms.status_array(len(self.df_final_pivot))
             self.df_final_pivot['국세청승인번호'] = None
             self.df_final_pivot['업체사업자번호'] = None
             
-            tolerance = 1e-6
-            
-            # Step A: 금액대사 (1:1 대사)
-            try:
-                self._process_exact_matching(tolerance)
-                matched_count = len(self.df_final_pivot[self.df_final_pivot['구분키'] == '금액대사'])
-                print(f"  - 금액대사 완료: {matched_count}건")
-            except Exception as e:
-                print(f"⚠️ 금액대사 경고: {str(e)}")
-            
-            # Step A-2: 금액대사(수기확인)
-            try:
-                self._process_exact_matching_manual(tolerance)
-                matched_count = len(self.df_final_pivot[self.df_final_pivot['구분키'] == '금액대사(수기확인)'])
-                print(f"  - 금액대사(수기확인) 완료: {matched_count}건")
-            except Exception as e:
-                print(f"⚠️ 금액대사(수기확인) 경고: {str(e)}")
-            
-            # Step B: 순차대사 (1:N 대사)
-            try:
-                self._process_sequential_matching(tolerance)
-                matched_count = len(self.df_final_pivot[self.df_final_pivot['구분키'] == '순차대사'])
-                print(f"  - 순차대사 완료: {matched_count}건")
-            except Exception as e:
-                print(f"⚠️ 순차대사 경고: {str(e)}")
-            
-            # Step C: 부분대사
-            try:
-                self._process_partial_matching(tolerance)
-                matched_count = len(self.df_final_pivot[self.df_final_pivot['구분키'] == '부분대사'])
-                print(f"  - 부분대사 완료: {matched_count}건")
-            except Exception as e:
-                print(f"⚠️ 부분대사 경고: {str(e)}")
+            # Step A ~ D: 협력사코드 단위로 독립적이므로 대용량이면 협력사별 분할 병렬 처리
+            workers = self._resolve_workers(len(self.df_final_pivot))
+            if workers > 1:
+                self._run_matching_parallel(workers)
+            else:
+                self._run_matching_cascade()
             
-            # Step D: 부분대사(수기확인)
-            try:
-                self._process_partial_matching_manual(tolerance)
-                matched_count = len(self.df_final_pivot[self.df_final_pivot['구분키'] == '수기확인'])
-                print(f"  - 부분대사(수기확인) 완료: {matched_count}건")
-            except Exception as e:
-                print(f"⚠️ 부분대사(수기확인) 경고: {str(e)}")
+            counts = np.bincount(self.df_final_pivot[ms.STATUS].to_numpy(), minlength=len(ms.MATCH_LABELS))
+            for status, name in self.MATCH_STAGE_NAMES:
+                print(f"  - {name} 완료: {int(counts[status])}건")
                 
             # 전체 대사 결과 요약
             total_count = len(self.df_final_pivot)
-            matched_total = len(self.df_final_pivot[self.df_final_pivot['구분키'] != ''])
+            matched_total = int(counts.sum() - counts[ms.UNMATCHED])
             print(f"  - 전체 대사율: {matched_total}/{total_count} ({matched_total/total_count*100:.1f}%)")
             
         except Exception as e:
             raise Exception(f"대사 처리 실패: {str(e)}")
     
-    def _process_exact_matching(self, tolerance):
-        """금액대사 (1:1 정확한 매칭)"""
-        for idx, row in self.df_final_pivot.iterrows():
-            협력사코드_final = row['협력사코드']
-            년도_final = row['년']
-            월_final = row['월']
-            금액_final = row['최종매입금액']
-            
-            # 면과세구분에 따른 계산서구분
-            if row['면과세구분명'] in ["과세", "영세"]:
-                invoice_condition = "일반세금계산서"
-            else:
-                invoice_condition = "일반계산서"
-            
-            condition = (
-                (self.df_tax_new['협력사코드'] == 협력사코드_final) &
-                (self.df_tax_new['작성년도'] == 년도_final) &
-                (self.df_tax_new['작성월'] == 월_final) &
-                (self.df_tax_new['공급가액'] == 금액_final) &
-                (self.df_tax_new['대사여부'] == "") &
-                (self.df_tax_new['계산서구분'] == invoice_condition)
-            )
-            df_candidates = self.df_tax_new.loc[condition]
-            
-            if not df_candidates.empty:
-                first_index = df_candidates.index[0]
-                mapped_date = self.df_tax_new.at[first_index, '국세청작성일']
-                mapped_issue_date = self.df_tax_new.at[first_index, '국세청발급일']
-                mapped_supply = self.df_tax_new.at[first_index, '공급가액']
-                mapped_tax = self.df_tax_new.at[first_index, '세액']
-                
-                self.df_final_pivot.at[idx, '국세청작성일'] = mapped_date
-                self.df_final_pivot.at[idx, '국세청발급일'] = mapped_issue_date
-                self.df_final_pivot.at[idx, '국세청공급가액'] = mapped_supply
-                self.df_final_pivot.at[idx, '국세청세액'] = mapped_tax
-                self.df_final_pivot.at[idx, '구분키'] = "금액대사"
-                self.df_final_pivot.at[idx, '국세청승인번호'] = self.df_tax_new.at[first_index, '국세청승인번호']
-                self.df_final_pivot.at[idx, '업체사업자번호'] = self.df_tax_new.at[first_index, '업체사업자번호']
-                
-                self.df_tax_new.at[first_index, '대사여부'] = f"{row['key']}-1"
-                self.df_tax_new.at[first_index, '구분키'] = "금액대사"
+    # 대사상태 코드 → 단계 표시 이름
+    MATCH_STAGE_NAMES = (
+        (ms.EXACT, '금액대사'),
+        (ms.EXACT_MANUAL, '금액대사(수기확인)'),
+        (ms.SEQUENTIAL, '순차대사'),
+        (ms.PARTIAL, '부분대사'),
+        (ms.PARTIAL_MANUAL, '부분대사(수기확인)'),
+    )
+    
+    # 비고 컬럼 값 사전 (압축 표현에서 Categorical 범주)
+    REMARK_STATUS = ["", "확인요청"]
+    
+    def _run_matching_cascade(self):
+        """Step A → D 대사 (df_final_pivot / df_tax_new / candidate_index 대상)"""
+        steps = (
+            ('exact', "금액대사", self._process_exact_matching),                         # Step A: 1:1 대사
+            (None, "금액대사(수기확인)", self._process_exact_matching_manual),             # Step A-2
+            ('sequential', "순차대사", self._process_sequential_matching),               # Step B: 1:N 대사
+            ('partial', "부분대사", self._process_partial_matching),                     # Step C
+            ('partial_manual', "부분대사(수기확인)", self._process_partial_matching_manual),  # Step D
+        )
+        # 세금계산서 대사 상태는 단계 동안 배열에 기록하고 끝나면 컬럼에 반영
+        self.tax_state = ms.MatchState(self.df_tax_new, (ms.STATUS, ms.PIVOT_ROW, ms.ORDINAL))
+        try:
+            for stage, name, step in steps:
+                if stage:
+                    self.progress.stage(stage, name)
+                try:
+                    step()
+                except Exception as e:
+                    print(f"⚠️ {name} 경고: {str(e)}")
+        finally:
+            self.tax_state.write_to(self.df_tax_new)
+    
+    def _resolve_workers(self, n_rows: int) -> int:
+        """병렬 대사 프로세스 수 (MATCH_WORKERS: 'auto'면 PARALLEL_MIN_ROWS 이상일 때 CPU 수만큼)"""
+        setting = str(self.match_workers).strip().lower()
+        if setting == 'auto':
+            if n_rows < self.PARALLEL_MIN_ROWS:
+                return 1
+            return min(os.cpu_count() or 1, self.MAX_MATCH_WORKERS)
+        try:
+            return max(int(setting), 1)
+        except ValueError:
+            return 1
+    
+    def _solver_settings(self) -> Dict:
+        return {
+            'max_nodes': self.subset_sum_solver.max_nodes,
+            'time_limit': self.subset_sum_solver.time_limit,
+            'max_dp_bits': self.subset_sum_solver.max_dp_bits,
+            'max_memo': self.subset_sum_solver.max_memo,
+        }
     
-    def _process_exact_matching_manual(self, tolerance):
+    def _run_matching_parallel(self, workers: int):
+        """
+        협력사코드별로 df_final_pivot / df_tax_new를 나누어 Step A → D를 프로세스 풀에서 실행
+        
+        모든 대사 단계는 같은 협력사코드끼리만 비교하고, 분할 안에서는 원래 행 순서를
+        유지하므로 결과는 순차 실행과 같다. 분할 결과는 원래 인덱스 순서로 합친다.
+        """
+        pivot, tax = self.df_final_pivot, self.df_tax_new
+        # 피벗 행이 없는 협력사의 세금계산서는 어떤 단계에서도 대사되지 않으므로 분할하지 않음(-1)
+        assignment = shard_assignment(pivot['협력사코드'], workers)
+        pivot_shards = shard_ids(pivot['협력사코드'], assignment)
+        tax_shards = shard_ids(tax['협력사코드'], assignment)
+        
+        tasks = [
+            (pivot[pivot_shards == shard], tax[tax_shards == shard])
+            for shard in sorted(set(assignment.values()))
+        ]
+        print(f"  - 협력사별 병렬 대사: {len(tasks)}개 분할 (프로세스 {workers}개)")
+        self.progress.stage('exact', "협력사별 병렬 대사", through='partial_manual')
+        
+        results = self._run_shards(_match_shard, tasks, workers)
+        
+        pivot_parts = [pivot[pivot_shards < 0]] + [result[0] for result in results]
+        tax_parts = [tax[tax_shards < 0]] + [result[1] for result in results]
+        self.df_final_pivot = pd.concat(pivot_parts).loc[pivot.index]
+        self.df_tax_new = pd.concat(tax_parts).loc[tax.index]
+        for result in results:
+            self.match_warnings.extend(result[2])
+        
+        # 이후 단계가 같은 후보 상태를 보도록 대사 표시를 인덱스에 반영
+        self.candidate_index = CandidateIndex(self.df_tax_new)
+        self.candidate_index.claim(np.flatnonzero(self.df_tax_new[ms.STATUS].to_numpy() != ms.UNMATCHED))
+    
+    def _run_payment_parallel(self, workers: int):
+        """
+        사업자번호(업체사업자번호 = 거래처번호)별로 세금계산서/지불보조장을 나누어 프로세스 풀에서 대사
+        
+        지불보조장 대사는 같은 사업자번호끼리만 비교하므로 결과는 순차 실행과 같다.
+        분할마다 생기는 분할납부 컬럼은 순차 실행과 같은 순서로 정렬해 합친다.
+        """
+        tax, book = self.df_tax_new, self.filtered_df_book
+        assignment = shard_assignment(book['거래처번호'], workers)
+        tax_shards = shard_ids(tax['업체사업자번호'], assignment)
+        book_shards = shard_ids(book['거래처번호'], assignment)
+        
+        tasks = [
+            (tax[tax_shards == shard], book[book_shards == shard])
+            for shard in sorted(set(assignment.values()))
+        ]
+        print(f"  - 사업자번호별 병렬 지불보조장 대사: {len(tasks)}개 분할 (프로세스 {workers}개)")
+        
+        results = self._run_shards(_payment_shard, tasks, workers)
+        
+        merged_tax = pd.concat([tax[tax_shards < 0]] + [result[0] for result in results]).loc[tax.index]
+        added = [col for col in merged_tax.columns if col not in tax.columns]
+        # 분할납부{n}_금액, 분할납부{n}_월 순 (순차 실행 시 컬럼 생성 순서)
+        added.sort(key=lambda col: (int(col[4:].split('_')[0]), col.endswith('_월')))
+        self.df_tax_new = merged_tax[list(tax.columns) + added]
+        self.filtered_df_book = pd.concat([book[book_shards < 0]] + [result[1] for result in results]).loc[book.index]
+        for result in results:
+            self.match_warnings.extend(result[2])
+    
+    def _run_shards(self, function, tasks, workers: int) -> List:
+        """
+        분할 작업을 프로세스 풀에서 실행하고 작업 순서대로 결과 반환
+        
+        취소 요청은 WAIT_INTERVAL마다 확인하며, 취소 시 대기 중인 작업은 버리고 즉시 중단한다.
+        """
+        settings = self._solver_settings()
+        results = [None] * len(tasks)
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(tasks)))
+        try:
+            futures = {executor.submit(function, *task, settings): i for i, task in enumerate(tasks)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=self.WAIT_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                self.progress.step(len(tasks) - len(pending), len(tasks))
+        finally:
+            # 정상 종료 시에는 모두 끝난 상태, 취소/오류 시에는 남은 작업을 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+    
+    def _process_exact_matching(self):
+        """금액대사 (1:1 정확한 매칭) - 해시 조인 + 그룹 내 순번으로 일괄 처리"""
+        pivot_keys = self._build_pivot_match_keys(self.df_final_pivot)
+        unclaimed = self.df_tax_new[self.candidate_index.unclaimed_mask()]
+        
+        pivot_idx, tax_idx = rank_match(pivot_keys, unclaimed[EXACT_MATCH_KEYS], EXACT_MATCH_KEYS)
+        self._apply_one_to_one_matches(pivot_idx, tax_idx, ms.EXACT)
+    
+    def _process_exact_matching_manual(self):
         """금액대사(수기확인) - 면과세 조건 제외"""
-        for idx, row in self.df_final_pivot.iterrows():
-            if pd.notnull(row['국세청작성일']):
-                continue
-                
-            협력사코드_final = row['협력사코드']
-            년도_final = row['년']
-            월_final = row['월']
-            금액_final = row['최종매입금액']
-            
-            condition = (
-                (self.df_tax_new['협력사코드'] == 협력사코드_final) &
-                (self.df_tax_new['작성년도'] == 년도_final) &
-                (self.df_tax_new['작성월'] == 월_final) &
-                (self.df_tax_new['공급가액'] == 금액_final) &
-                (self.df_tax_new['대사여부'] == "")
+        pending = self.df_final_pivot[pd.isnull(self.df_final_pivot['국세청작성일'])]
+        pivot_keys = self._build_pivot_match_keys(pending)
+        unclaimed = self.df_tax_new[self.candidate_index.unclaimed_mask()]
+        
+        pivot_idx, tax_idx = rank_match(
+            pivot_keys[EXACT_MATCH_MANUAL_KEYS],
+            unclaimed[EXACT_MATCH_MANUAL_KEYS],
+            EXACT_MATCH_MANUAL_KEYS
+        )
+        self._apply_one_to_one_matches(pivot_idx, tax_idx, ms.EXACT_MANUAL)
+    
+    def _build_pivot_match_keys(self, pivot: pd.DataFrame) -> pd.DataFrame:
+        """df_final_pivot 행을 세금계산서 컬럼명 기준의 매칭 키로 변환"""
+        return pd.DataFrame({
+            '협력사코드': pivot['협력사코드'],
+            '작성년도': pivot['년'],
+            '작성월': pivot['월'],
+            '공급가액': pivot['최종매입금액'],
+            '계산서구분': invoice_condition_for(pivot['면과세구분명'], self.df_tax_new['계산서구분'].dtype)
+        }, index=pivot.index)
+    
+    def _apply_one_to_one_matches(self, pivot_idx, tax_idx, status: int):
+        """1:1 매칭 결과를 df_final_pivot / df_tax_new에 일괄 기록 (세금계산서 순번은 1)"""
+        if len(pivot_idx) == 0:
+            return
+        
+        column_map = {
+            '국세청작성일': '국세청작성일',
+            '국세청발급일': '국세청발급일',
+            '국세청공급가액': '공급가액',
+            '국세청세액': '세액',
+            '국세청승인번호': '국세청승인번호',
+            '업체사업자번호': '업체사업자번호'
+        }
+        for pivot_col, tax_col in column_map.items():
+            self.df_final_pivot.loc[pivot_idx, pivot_col] = (
+                self.df_tax_new.loc[tax_idx, tax_col].astype(object).to_numpy()
             )
-            df_candidates = self.df_tax_new.loc[condition]
-            
-            if not df_candidates.empty:
-                first_index = df_candidates.index[0]
-                mapped_date = self.df_tax_new.at[first_index, '국세청작성일']
-                mapped_issue_date = self.df_tax_new.at[first_index, '국세청발급일']
-                mapped_supply = self.df_tax_new.at[first_index, '공급가액']
-                mapped_tax = self.df_tax_new.at[first_index, '세액']
+        self.df_final_pivot.loc[pivot_idx, ms.STATUS] = status
+        
+        tax_idx = tax_idx.astype(np.intp)
+        self.tax_state[ms.STATUS][tax_idx] = status
+        self.tax_state[ms.PIVOT_ROW][tax_idx] = np.asarray(pivot_idx, dtype=np.int32)
+        self.tax_state[ms.ORDINAL][tax_idx] = 1
+        self.candidate_index.claim(tax_idx)
+    
+    def _mark_invoices(self, positions, pivot_idx, status: int):
+        """선택된 세금계산서에 대사 상태/피벗 행/순번(1부터) 표시 후 후보 인덱스에서 제외"""
+        positions = np.asarray(positions, dtype=np.intp)
+        self.tax_state[ms.STATUS][positions] = status
+        self.tax_state[ms.PIVOT_ROW][positions] = pivot_idx
+        self.tax_state[ms.ORDINAL][positions] = np.arange(1, len(positions) + 1)
+        self.candidate_index.claim(positions)
+    
+    def _process_sequential_matching(self):
+        """
+        순차대사 (1:N 매칭) - 노트북 로직에 따라 FIFO 방식으로 처리
+        
+        후보 버킷(협력사코드, 년, 월, 계산서구분)끼리는 서로 후보를 공유하지 않으므로
+        미대사 피벗 행을 버킷별로 모아 피벗 순서대로 처리한다. 버킷 후보는 국세청작성일
+        순으로 한 번만 정렬하고 누적합 커서(FifoSumCursor)로 목표 금액 구간을 찾으며,
+        FIFO 매칭 결과는 마지막에 한 번에 기록한다.
+        """
+        pivot = self.df_final_pivot
+        pending = pivot[pivot['국세청작성일'].isna()]
+        if pending.empty:
+            return
+        
+        bucket_keys = pending[['협력사코드', '년', '월']].assign(
+            계산서구분=invoice_condition_for(pending['면과세구분명'], self.df_tax_new['계산서구분'].dtype)
+        )
+        groups = bucket_keys.groupby(['협력사코드', '년', '월', '계산서구분'], sort=False, observed=True).indices
+        
+        amounts = won_values(self.df_tax_new['공급가액'])
+        targets = pending['최종매입금액'].to_numpy()
+        pivot_keys = pending['key'].to_numpy()
+        fifo_matches = []  # (피벗 인덱스, 선택된 세금계산서 위치)
+        done, total = 0, len(pending)
+        
+        for (supplier, year, month, invoice_type), rows in groups.items():
+            cursor = None
+            for row_pos in rows:
+                done += 1
+                self.progress.step(done, total)
                 
-                self.df_final_pivot.at[idx, '국세청작성일'] = mapped_date
-                self.df_final_pivot.at[idx, '국세청발급일'] = mapped_issue_date
-                self.df_final_pivot.at[idx, '국세청공급가액'] = mapped_supply
-                self.df_final_pivot.at[idx, '국세청세액'] = mapped_tax
-                self.df_final_pivot.at[idx, '구분키'] = "금액대사(수기확인)"
-                self.df_final_pivot.at[idx, '국세청승인번호'] = self.df_tax_new.at[first_index, '국세청승인번호']
-                self.df_final_pivot.at[idx, '업체사업자번호'] = self.df_tax_new.at[first_index, '업체사업자번호']
+                if cursor is None:
+                    positions = self.candidate_index.bucket(
+                        supplier, year, month, invoice_type, order_by='국세청작성일'
+                    )
+                    cursor = FifoSumCursor(positions, amounts[positions])
                 
-                self.df_tax_new.at[first_index, '대사여부'] = f"{row['key']}-1"
-                self.df_tax_new.at[first_index, '구분키'] = "금액대사(수기확인)"
-    
-    def _process_sequential_matching(self, tolerance):
-        """순차대사 (1:N 매칭) - 노트북 로직에 따라 FIFO 방식으로 처리"""
-        for idx, row in self.df_final_pivot.iterrows():
-            if pd.notnull(row['국세청작성일']):
-                continue
+                candidates = cursor.remaining()
+                if len(candidates) == 0:
+                    continue
                 
-            협력사코드_final = row['협력사코드']
-            년도_final = row['년']
-            월_final = row['월']
-            target_amount = row['최종매입금액']
-            
-            # 면과세구분에 따른 계산서구분
-            if row['면과세구분명'] in ["과세", "영세"]:
-                invoice_condition = "일반세금계산서"
-            else:
-                invoice_condition = "일반계산서"
-            
-            # 후보 찾기
-            candidates = self.df_tax_new[
-                (self.df_tax_new['협력사코드'] == 협력사코드_final) &
-                (self.df_tax_new['작성년도'] == 년도_final) &
-                (self.df_tax_new['작성월'] == 월_final) &
-                (self.df_tax_new['대사여부'] == "") &
-                (self.df_tax_new['계산서구분'] == invoice_condition)
-            ]
-            
-            if candidates.empty:
-                continue
-            
-            # 후보들을 국세청작성일 기준 오름차순(FIFO)로 정렬
-            candidates = candidates.sort_values(by='국세청작성일')
-            cumulative_sum = 0.0
-            selected_indices = []
-            
-            # FIFO 방식으로 누적합 계산
-            for cand_idx, cand_row in candidates.iterrows():
-                cumulative_sum += cand_row['공급가액']
-                selected_indices.append(cand_idx)
+                idx = pending.index[row_pos]
+                selected = cursor.take(targets[row_pos])
+                if selected is not None:
+                    self.candidate_index.claim(selected)
+                    fifo_matches.append((idx, selected))
+                    continue
                 
-                # 누적합이 목표 금액과 일치하면 매칭
-                if np.abs(cumulative_sum - target_amount) < tolerance:
-                    # 날짜는 가장 빠른 것 사용
-                    mapped_date = candidates.loc[selected_indices, '국세청작성일'].min()
-                    mapped_issue_date = candidates.loc[selected_indices, '국세청발급일'].min()
-                    mapped_supply = cumulative_sum
-                    mapped_tax = candidates.loc[selected_indices, '세액'].sum()
-                    
-                    self.df_final_pivot.at[idx, '국세청작성일'] = mapped_date
-                    self.df_final_pivot.at[idx, '국세청발급일'] = mapped_issue_date
-                    self.df_final_pivot.at[idx, '국세청공급가액'] = mapped_supply
-                    self.df_final_pivot.at[idx, '국세청세액'] = mapped_tax
-                    self.df_final_pivot.at[idx, '구분키'] = "순차대사"
-                    
-                    # 첫 번째 매칭된 세금계산서 정보
-                    first_idx = selected_indices[0]
-                    self.df_final_pivot.at[idx, '국세청승인번호'] = candidates.loc[first_idx, '국세청승인번호']
-                    self.df_final_pivot.at[idx, '업체사업자번호'] = candidates.loc[first_idx, '업체사업자번호']
-                    
-                    # 선택된 각 세금계산서에 대사여부 표시
-                    for i, sel_idx in enumerate(selected_indices, start=1):
-                        self.df_tax_new.at[sel_idx, '대사여부'] = f"{row['key']}-{i}"
-                        self.df_tax_new.at[sel_idx, '구분키'] = f"순차대사-{i}"
-                    break
-            
-            # FIFO로 안되면 부분집합 합 찾기 (백트래킹)
-            else:
+                # FIFO로 안되면 부분집합 합 찾기 (백트래킹)
                 found, indices = self._find_subset_sum_all_combinations(
-                    candidates['공급가액'],
-                    target_amount,
-                    tolerance
+                    pd.Series(amounts[candidates], index=candidates),
+                    targets[row_pos],
+                    context=f"순차대사 {pivot_keys[row_pos]}"
                 )
                 
                 if found and len(indices) > 0:
-                    # 실제 인덱스로 변환
-                    actual_indices = [candidates.index[idx] for idx in indices]
+                    # 반환값은 candidates의 인덱스 레이블 (= df_tax_new 행 위치)
+                    actual_indices = list(indices)
                     
                     # 첫 번째 매칭된 세금계산서 정보를 pivot에 기록
                     first_tax_idx = actual_indices[0]
@@ -726,199 +1071,186 @@ class ReconciliationService:
                     mapped_issue_date = self.df_tax_new.at[first_tax_idx, '국세청발급일']
                     
                     # 합계 계산
-                    total_supply = sum(self.df_tax_new.at[idx, '공급가액'] for idx in actual_indices)
-                    total_tax = sum(self.df_tax_new.at[idx, '세액'] for idx in actual_indices)
+                    total_supply = self.df_tax_new.loc[actual_indices, '공급가액'].sum()
+                    total_tax = self.df_tax_new.loc[actual_indices, '세액'].sum()
                     
                     self.df_final_pivot.at[idx, '국세청작성일'] = mapped_date
                     self.df_final_pivot.at[idx, '국세청발급일'] = mapped_issue_date
                     self.df_final_pivot.at[idx, '국세청공급가액'] = total_supply
                     self.df_final_pivot.at[idx, '국세청세액'] = total_tax
-                    self.df_final_pivot.at[idx, '구분키'] = "순차대사"
+                    self.df_final_pivot.at[idx, ms.STATUS] = ms.SEQUENTIAL
                     self.df_final_pivot.at[idx, '국세청승인번호'] = self.df_tax_new.at[first_tax_idx, '국세청승인번호']
                     self.df_final_pivot.at[idx, '업체사업자번호'] = self.df_tax_new.at[first_tax_idx, '업체사업자번호']
                     
-                    # 선택된 각 세금계산서에 대사여부 표시
-                    for i, actual_idx in enumerate(actual_indices, start=1):
-                        self.df_tax_new.at[actual_idx, '대사여부'] = f"{row['key']}-{i}"
-                        self.df_tax_new.at[actual_idx, '구분키'] = f"순차대사-{i}"
+                    # 선택된 각 세금계산서에 대사 상태 표시
+                    self._mark_invoices(actual_indices, idx, ms.SEQUENTIAL)
+                    
+                    # 임의 위치가 빠졌으므로 다음 행에서 남은 후보로 커서 재구성
+                    cursor = None
+        
+        self._apply_group_matches(fifo_matches, ms.SEQUENTIAL)
     
-    def _process_partial_matching(self, tolerance):
-        """부분대사 - 금액이 더 큰 세금계산서와 1:1 매칭"""
-        for idx, row in self.df_final_pivot.iterrows():
-            if pd.notnull(row['국세청작성일']):
-                continue
-                
-            협력사코드_final = row['협력사코드']
-            년도_final = row['년']
-            월_final = row['월']
-            target_amount = row['최종매입금액']
-            
-            # 면과세구분에 따른 계산서구분
-            if row['면과세구분명'] in ["과세", "영세"]:
-                invoice_condition = "일반세금계산서"
-            else:
-                invoice_condition = "일반계산서"
-            
-            # 후보 찾기: 공급가액이 target_amount보다 큰 경우
-            candidates = self.df_tax_new[
-                (self.df_tax_new['협력사코드'] == 협력사코드_final) &
-                (self.df_tax_new['작성년도'] == 년도_final) &
-                (self.df_tax_new['작성월'] == 월_final) &
-                (self.df_tax_new['대사여부'] == "") &
-                (self.df_tax_new['계산서구분'] == invoice_condition) &
-                (self.df_tax_new['공급가액'] > target_amount)
-            ]
-            
-            if candidates.empty:
-                continue
-                
-            # 국세청발급일이 가장 빠른 것 선택 (오름차순 정렬)
-            candidates = candidates.sort_values(by='국세청발급일', ascending=True)
-            
-            # 첫 번째 후보 선택
-            candidate_index = candidates.index[0]
-            candidate_row = candidates.loc[candidate_index]
-            
-            # 매핑
-            mapped_date = candidate_row['국세청작성일']
-            mapped_issue_date = candidate_row['국세청발급일']
-            mapped_supply = candidate_row['공급가액']
-            mapped_tax = candidate_row['세액']
-            
-            self.df_final_pivot.at[idx, '국세청작성일'] = mapped_date
-            self.df_final_pivot.at[idx, '국세청발급일'] = mapped_issue_date
-            self.df_final_pivot.at[idx, '국세청공급가액'] = mapped_supply
-            self.df_final_pivot.at[idx, '국세청세액'] = mapped_tax
-            self.df_final_pivot.at[idx, '구분키'] = "부분대사"
-            self.df_final_pivot.at[idx, '국세청승인번호'] = candidate_row['국세청승인번호']
-            self.df_final_pivot.at[idx, '업체사업자번호'] = candidate_row['업체사업자번호']
-            
-            # 1:1 매칭이므로 번호는 -1로 표시
-            self.df_tax_new.at[candidate_index, '대사여부'] = f"{row['key']}-1"
-            self.df_tax_new.at[candidate_index, '구분키'] = "부분대사"
+    def _apply_group_matches(self, matches, status: int, latest_dates: bool = False):
+        """
+        1:N 매칭 결과 일괄 기록 후 선택된 세금계산서를 후보 인덱스에서 제외
+        
+        matches: (피벗 인덱스, 선택된 세금계산서 위치 배열) 목록
+        날짜는 선택 내 가장 빠른 날짜 (latest_dates=True면 가장 늦은 날짜), 금액은 합계,
+        승인번호/사업자번호는 첫 번째 세금계산서 기준
+        """
+        if not matches:
+            return
+        
+        pivot_idx = [match[0] for match in matches]
+        lengths = np.array([len(match[1]) for match in matches])
+        positions = np.concatenate([match[1] for match in matches])
+        segment = np.repeat(np.arange(len(matches)), lengths)
+        firsts = positions[np.concatenate(([0], np.cumsum(lengths)[:-1]))]
+        
+        selected = self.df_tax_new.iloc[positions][['국세청작성일', '국세청발급일', '공급가액', '세액']]
+        date_agg = 'max' if latest_dates else 'min'
+        aggregated = selected.reset_index(drop=True).groupby(segment, sort=True).agg({
+            '국세청작성일': date_agg,
+            '국세청발급일': date_agg,
+            '공급가액': 'sum',
+            '세액': 'sum',
+        })
+        
+        column_map = {
+            '국세청작성일': aggregated['국세청작성일'],
+            '국세청발급일': aggregated['국세청발급일'],
+            '국세청공급가액': aggregated['공급가액'],
+            '국세청세액': aggregated['세액'],
+            '국세청승인번호': self.df_tax_new['국세청승인번호'].iloc[firsts],
+            '업체사업자번호': self.df_tax_new['업체사업자번호'].iloc[firsts],
+        }
+        for pivot_col, values in column_map.items():
+            self.df_final_pivot.loc[pivot_idx, pivot_col] = values.astype(object).to_numpy()
+        self.df_final_pivot.loc[pivot_idx, ms.STATUS] = status
+        
+        # 세금계산서 대사 상태/피벗 행/순번 (1, 2, ...)
+        ordinals = np.arange(len(positions)) - np.repeat(np.cumsum(lengths) - lengths, lengths) + 1
+        self.tax_state[ms.STATUS][positions] = status
+        self.tax_state[ms.PIVOT_ROW][positions] = np.repeat(np.asarray(pivot_idx, dtype=np.int32), lengths)
+        self.tax_state[ms.ORDINAL][positions] = ordinals
+        self.candidate_index.claim(positions)
     
-    def _process_partial_matching_manual(self, tolerance):
-        """부분대사(수기확인) - 여러 후보 합산 후 매칭"""
-        for idx, row in self.df_final_pivot.iterrows():
-            if pd.notnull(row['국세청작성일']):
-                continue
-                
-            협력사코드_final = row['협력사코드']
-            년도_final = row['년']
-            월_final = row['월']
-            target_amount = row['최종매입금액']
-            
-            # 면과세구분에 따른 계산서구분
-            if row['면과세구분명'] in ["과세", "영세"]:
-                invoice_condition = "일반세금계산서"
-            else:
-                invoice_condition = "일반계산서"
-            
-            # 후보 찾기: 공급가액이 target_amount 이하인 경우
-            candidates = self.df_tax_new[
-                (self.df_tax_new['협력사코드'] == 협력사코드_final) &
-                (self.df_tax_new['작성년도'] == 년도_final) &
-                (self.df_tax_new['작성월'] == 월_final) &
-                (self.df_tax_new['대사여부'] == "") &
-                (self.df_tax_new['계산서구분'] == invoice_condition)
-            ]
-            candidates = candidates[candidates['공급가액'] <= target_amount]
-            
-            if candidates.empty:
+    def _process_partial_matching(self):
+        """
+        부분대사 - 금액이 더 큰 세금계산서와 1:1 매칭
+        
+        피벗 행마다 "국세청발급일이 가장 빠른, 공급가액이 목표보다 큰 미대사 세금계산서"를
+        찾는다. 버킷별로 발급일 순 임계값 트리(ThresholdTree)를 한 번 구성해 O(log n)에 조회하고
+        결과는 마지막에 일괄 기록한다.
+        """
+        pivot_idx, tax_idx = [], []
+        for (idx, _, target), positions, tree in self._iter_partial_queries('국세청발급일'):
+            found = tree.first_above(target)
+            if found < 0:
                 continue
-                
-            # 국세청발급일이 늦은 순으로 정렬 (오름차순)
-            candidates = candidates.sort_values(by='국세청발급일', ascending=True)
-            
-            cumulative_sum = 0.0
-            selected_indices = []
+            tree.remove(found)
+            pivot_idx.append(idx)
+            tax_idx.append(positions[found])
+        
+        # 1:1 매칭이므로 번호는 -1로 표시
+        self._apply_one_to_one_matches(np.array(pivot_idx, dtype=np.int32), np.array(tax_idx, dtype=np.intp), ms.PARTIAL)
+    
+    def _process_partial_matching_manual(self):
+        """
+        부분대사(수기확인) - 여러 후보 합산 후 매칭
+        
+        국세청발급일 순으로 공급가액이 목표 이하인 미대사 세금계산서를 누적하여 합계가
+        목표를 처음 초과하는 시점까지 선택한다. 다음 후보는 임계값 트리에서 O(log n)에 찾는다.
+        """
+        amounts = won_values(self.df_tax_new['공급가액'])
+        matches = []
+        for (idx, _, target), positions, tree in self._iter_partial_queries('국세청발급일'):
+            cumulative_sum = 0
+            selected = []
+            found = tree.first_at_most(target)
             
             # 누적 합이 target_amount를 초과할 때까지 선택
-            for cand_idx, cand_row in candidates.iterrows():
-                cumulative_sum += cand_row['공급가액']
-                selected_indices.append(cand_idx)
-                if cumulative_sum > target_amount:
+            while found >= 0:
+                cumulative_sum += amounts[positions[found]]
+                selected.append(found)
+                if cumulative_sum > target:
                     break
+                found = tree.first_at_most(target, found + 1)
             
             # 누적 합이 target_amount보다 큰 경우에만 매칭
-            if cumulative_sum > target_amount and len(selected_indices) > 0:
-                # 대표 날짜는 가장 늦은 날짜로 설정
-                representative_date = candidates.loc[selected_indices, '국세청작성일'].max()
-                representative_issue_date = candidates.loc[selected_indices, '국세청발급일'].max()
-                mapped_supply = cumulative_sum
-                mapped_tax = candidates.loc[selected_indices, '세액'].sum()
-                
-                self.df_final_pivot.at[idx, '국세청작성일'] = representative_date
-                self.df_final_pivot.at[idx, '국세청발급일'] = representative_issue_date
-                self.df_final_pivot.at[idx, '국세청공급가액'] = mapped_supply
-                self.df_final_pivot.at[idx, '국세청세액'] = mapped_tax
-                self.df_final_pivot.at[idx, '구분키'] = "수기확인"
-                
-                # 첫 번째 매칭된 것의 정보 사용
-                first_idx = selected_indices[0]
-                self.df_final_pivot.at[idx, '국세청승인번호'] = candidates.loc[first_idx, '국세청승인번호']
-                self.df_final_pivot.at[idx, '업체사업자번호'] = candidates.loc[first_idx, '업체사업자번호']
-                
-                # 선택된 각 세금계산서에 대사여부 표시
-                for i, sel_idx in enumerate(selected_indices, start=1):
-                    self.df_tax_new.at[sel_idx, '대사여부'] = f"{row['key']}-{i}"
-                    self.df_tax_new.at[sel_idx, '구분키'] = f"수기확인-{i}"
+            if cumulative_sum > target and selected:
+                for found in selected:
+                    tree.remove(found)
+                matches.append((idx, positions[selected]))
+        
+        # 대표 날짜는 가장 늦은 날짜로 설정
+        self._apply_group_matches(matches, ms.PARTIAL_MANUAL, latest_dates=True)
+    
+    def _iter_partial_queries(self, order_by: str):
+        """
+        미대사 피벗 행을 후보 버킷별로 피벗 순서대로 반환
+        
+        Yields:
+            ((피벗 인덱스, 피벗 key, 최종매입금액), order_by 순 미대사 후보 위치, 해당 후보 금액 트리)
+            - 같은 버킷의 행은 같은 트리를 공유하므로 매칭 시 tree.remove()로 후보를 빼야 함
+        """
+        pivot = self.df_final_pivot
+        pending = pivot[pivot['국세청작성일'].isna()]
+        if pending.empty:
+            return
+        
+        bucket_keys = pending[['협력사코드', '년', '월']].assign(
+            계산서구분=invoice_condition_for(pending['면과세구분명'], self.df_tax_new['계산서구분'].dtype)
+        )
+        groups = bucket_keys.groupby(['협력사코드', '년', '월', '계산서구분'], sort=False, observed=True).indices
+        
+        amounts = won_values(self.df_tax_new['공급가액'])
+        targets = pending['최종매입금액'].to_numpy()
+        pivot_keys = pending['key'].to_numpy()
+        done, total = 0, len(pending)
+        
+        for (supplier, year, month, invoice_type), rows in groups.items():
+            positions = self.candidate_index.bucket(supplier, year, month, invoice_type, order_by=order_by)
+            tree = ThresholdTree(amounts[positions]) if len(positions) else None
+            for row_pos in rows:
+                done += 1
+                self.progress.step(done, total)
+                if tree is None:
+                    continue
+                yield (pending.index[row_pos], pivot_keys[row_pos], targets[row_pos]), positions, tree
     
-    def _find_subset_sum_all_combinations(self, amounts, target, tolerance=1e-6):
+    def _find_subset_sum_all_combinations(self, amounts, target, context=None):
         """
         부분집합의 합이 target과 일치하는 인덱스 찾기
-        DFS를 사용한 백트래킹 구현
+        SubsetSumSolver(원 단위 정수, 탐색 예산 제한)에 위임
         
-        amounts: 금액이 들어있는 Series
-        target: 목표 금액
-        tolerance: float 비교를 위한 허용 오차
+        amounts: 원 단위 금액이 들어있는 Series
+        target: 목표 금액 (원)
+        context: 예산 초과 시 경고 메시지에 표시할 대상 정보
         반환값: (True, [인덱스 리스트]) 또는 (False, [])
         """
-        # Series를 (인덱스, 금액) 튜플 리스트로 변환
-        candidate_items = [(idx, amt) for idx, amt in amounts.items()]
-        result_container = {'found': False, 'indices': []}
-        
-        def dfs(start_idx, current_sum, chosen_indices):
-            if result_container['found']:
-                return
-            if np.abs(current_sum - target) < tolerance:
-                result_container['found'] = True
-                result_container['indices'] = chosen_indices[:]
-                return
-            if start_idx >= len(candidate_items):
-                return
-            if current_sum > target:
-                return
-                
-            # 현재 원소 포함
-            cand_idx, cand_amt = candidate_items[start_idx]
-            dfs(start_idx + 1, current_sum + cand_amt, chosen_indices + [cand_idx])
-            # 현재 원소 미포함
-            dfs(start_idx + 1, current_sum, chosen_indices)
-            
-        dfs(0, 0.0, [])
-        return (True, result_container['indices']) if result_container['found'] else (False, [])
+        result = self.subset_sum_solver.solve(amounts, target)
+        
+        if result.exhausted:
+            message = (f"조합 탐색 예산 초과로 건너뜀: {context or ''} "
+                       f"(목표 {target:,.0f}원, 후보 {len(amounts)}건, 탐색 {result.nodes:,}회)")
+            print(f"⚠️ {message}")
+            self.match_warnings.append(message)
+            
+        return (True, result.indices) if result.found else (False, [])
     
     def _process_payment_book(self):
         """지불보조장 대사"""
         print("DEBUG: _process_payment_book() 시작")
         
-        # 거래처번호 변환
-        def convert_vendor_to_string(val):
-            if pd.isna(val):
-                return ''
-            elif isinstance(val, (int, float)):
-                return str(int(val))
-            else:
-                return str(val)
-        
-        self.df_book['거래처번호'] = self.df_book['거래처번호'].apply(convert_vendor_to_string)
+        # 대사 기간 + 지불 허용 기간의 전표만 사용 (거래처번호는 로드 시 코드 문자열로 변환됨)
+        df_book = self.input_in_period('payment_ledger')
         
-        # 필터링
-        print(f"DEBUG: df_book 행 수: {len(self.df_book)}")
+        # 필터링 (사업자번호가 없는 전표/피벗 행끼리는 대응시키지 않음)
+        print(f"DEBUG: df_book 행 수: {len(self.df_book)} (기간 내 {len(df_book)})")
         print(f"DEBUG: df_final_pivot의 업체사업자번호 개수: {len(self.df_final_pivot['업체사업자번호'].unique())}")
-        self.filtered_df_book = self.df_book[
-            self.df_book['거래처번호'].isin(self.df_final_pivot['업체사업자번호'])
+        self.filtered_df_book = df_book[
+            df_book['거래처번호'].isin(self.df_final_pivot['업체사업자번호'].dropna())
         ]
         
         if not self.filtered_df_book.empty:
@@ -927,10 +1259,8 @@ class ReconciliationService:
                 "거래처번호", "거래처명", "차변금액", "대변금액"
             ]]
             
-            # 차변금액, 대변금액 변환
-            self.filtered_df_book["차변금액"] = self.filtered_df_book["차변금액"].str.replace(",", "", regex=True).astype(float)
-            self.filtered_df_book["대변금액"] = self.filtered_df_book["대변금액"].str.replace(",", "", regex=True).astype(float)
-            self.filtered_df_book = self.filtered_df_book[self.filtered_df_book['차변금액'] != 0]
+            # 0원 전표 제외 (차변금액이 비어 있는 전표는 남기되 대사 후보에서는 제외됨)
+            self.filtered_df_book = self.filtered_df_book[self.filtered_df_book['차변금액'].ne(0).fillna(True).to_numpy(dtype=bool)]
             
             # match_tax_and_book 로직 적용
             self._process_payment_book_matching()
@@ -941,123 +1271,153 @@ class ReconciliationService:
         print(f"DEBUG: 국세청공급가액 컬럼 존재: {'국세청공급가액' in self.df_final_pivot.columns}")
         print(f"DEBUG: 국세청세액 컬럼 존재: {'국세청세액' in self.df_final_pivot.columns}")
         
-        self.df_final_pivot["국세청공급가액"] = self.df_final_pivot["국세청공급가액"].fillna(0)
-        self.df_final_pivot["국세청세액"] = self.df_final_pivot["국세청세액"].fillna(0)
+        self.df_final_pivot["국세청공급가액"] = to_won(self.df_final_pivot["국세청공급가액"], missing=0)
+        self.df_final_pivot["국세청세액"] = to_won(self.df_final_pivot["국세청세액"], missing=0)
         self.df_final_pivot["지불예상금액"] = self.df_final_pivot["국세청공급가액"] + self.df_final_pivot["국세청세액"]
         
         print("DEBUG: 지불예상금액 계산 완료")
         print(f"DEBUG: 지불예상금액 컬럼 생성됨: {'지불예상금액' in self.df_final_pivot.columns}")
     
-    def _process_payment_book_matching(self, tolerance=1e-6):
+    def _process_payment_book_matching(self):
         """
         세금계산서(df_tax_new)와 지불보조장(filtered_df_book) 대사
         노트북의 match_tax_and_book 함수 로직 이식
         """
-        # 필요한 컬럼 생성
-        if '구분키2' not in self.df_tax_new.columns:
-            self.df_tax_new['구분키2'] = None
+        # 필요한 컬럼 생성 (구분키2/구분키/Key 라벨은 최종 결과 생성 시 만듦)
+        if ms.PAYMENT_STATUS not in self.df_tax_new.columns:
+            self.df_tax_new[ms.PAYMENT_STATUS] = ms.status_array(len(self.df_tax_new))
         if '차변금액' not in self.df_tax_new.columns:
-            self.df_tax_new['차변금액'] = None
+            self.df_tax_new['차변금액'] = missing_won(self.df_tax_new.index)
         if '전표번호' not in self.df_tax_new.columns:
             self.df_tax_new['전표번호'] = None
         if '회계일' not in self.df_tax_new.columns:
             self.df_tax_new['회계일'] = None
         if '비고' not in self.df_tax_new.columns:
-            self.df_tax_new['비고'] = ""
+            self.df_tax_new['비고'] = status_column(self.df_tax_new.index, self.REMARK_STATUS, "")
             
         # filtered_df_book에 필요한 컬럼 생성
-        if '구분키' not in self.filtered_df_book.columns:
-            self.filtered_df_book['구분키'] = ""
-        if 'Key' not in self.filtered_df_book.columns:
-            self.filtered_df_book['Key'] = None
+        if ms.PAYMENT_STATUS not in self.filtered_df_book.columns:
+            self.filtered_df_book[ms.PAYMENT_STATUS] = ms.status_array(len(self.filtered_df_book))
+            self.filtered_df_book[ms.TAX_ROW] = ms.row_array(len(self.filtered_df_book))
+            self.filtered_df_book[ms.ORDINAL] = ms.ordinal_array(len(self.filtered_df_book))
             
         # 회계일 datetime 변환
         if not pd.api.types.is_datetime64_any_dtype(self.filtered_df_book['회계일']):
-            self.filtered_df_book['회계일'] = pd.to_datetime(self.filtered_df_book['회계일'], errors='coerce')
-            
-        # 각 세금계산서에 대해 매칭 처리
-        for idx, tax_row in self.df_tax_new.iterrows():
-            # 이미 대사처리된 경우 건너뛰기
-            if tax_row['구분키'] in [None, "", np.nan]:
-                continue
-            if tax_row['구분키2'] not in [None, "", np.nan]:
-                continue
-                
-            # 대사금액 계산: 공급가액 + 세액
-            pivot_amount = tax_row['공급가액'] + tax_row['세액']
-            pivot_biz = tax_row['업체사업자번호']
-            pivot_year = tax_row['작성년도']
-            pivot_month = tax_row['작성월']
-            
-            # 허용 회계일 범위: pivot_month의 1일부터 +2개월 마지막 날까지
-            allowed_lower = pd.Timestamp(pivot_year, pivot_month, 1)
-            allowed_upper = allowed_lower + pd.DateOffset(months=2) - pd.DateOffset(days=1)
-            
-            # 후보 필터링
-            candidates = self.filtered_df_book[
-                (self.filtered_df_book['거래처번호'] == pivot_biz) &
-                (self.filtered_df_book['구분키'] == "") &
-                (self.filtered_df_book['회계일'] >= allowed_lower) &
-                (self.filtered_df_book['회계일'] <= allowed_upper)
-            ]
-            
-            if candidates.empty:
-                continue
-                
-            # 회계일 기준 오름차순 정렬
-            candidates = candidates.sort_values(by='회계일')
-            
-            # 1) 1:1 매칭 시도
-            exact_match = candidates[np.abs(candidates['차변금액'] - pivot_amount) < tolerance]
-            if not exact_match.empty:
-                candidate_index = exact_match.index[0]
-                candidate_row = candidates.loc[candidate_index]
-                
-                self.df_tax_new.at[idx, '구분키2'] = "매입금액대사"
-                self.df_tax_new.at[idx, '차변금액'] = candidate_row['차변금액']
-                self.df_tax_new.at[idx, '전표번호'] = candidate_row['전표번호']
-                self.df_tax_new.at[idx, '회계일'] = candidate_row['회계일'].strftime("%Y-%m-%d")
-                
-                # filtered_df_book 업데이트
-                self.filtered_df_book.at[candidate_index, 'Key'] = tax_row['대사여부']
-                self.filtered_df_book.at[candidate_index, '구분키'] = "매입금액대사"
+            self.filtered_df_book['회계일'] = normalize_dates(self.filtered_df_book['회계일'])
+        
+        # 사업자번호 단위로 독립적이므로 대용량이면 사업자번호별 분할 병렬 처리
+        workers = self._resolve_workers(len(self.filtered_df_book))
+        if workers > 1:
+            self._run_payment_parallel(workers)
+        else:
+            self._match_payment_book()
+    
+    def _match_payment_book(self):
+        """지불보조장 대사 본 처리 (필요한 컬럼/회계일 타입이 준비된 상태)"""
+        # 지불 상태는 대사 동안 배열에 기록하고 끝나면 컬럼에 반영
+        self.payment_state = ms.MatchState(self.df_tax_new, (ms.PAYMENT_STATUS,))
+        self.book_state = ms.MatchState(self.filtered_df_book, (ms.PAYMENT_STATUS, ms.TAX_ROW, ms.ORDINAL))
+        try:
+            self._match_payment_rows()
+        finally:
+            self.payment_state.write_to(self.df_tax_new)
+            self.book_state.write_to(self.filtered_df_book)
+    
+    def _match_payment_rows(self):
+        """세금계산서 순서대로 지불보조장 1:1 → 조합 대사"""
+        # 대사 대상: 세금계산서 대사가 끝났고 지불보조장 대사 전인 세금계산서 (공급가액/세액 결측 제외)
+        tax = self.df_tax_new
+        eligible = np.flatnonzero(
+            (tax[ms.STATUS].to_numpy() != ms.UNMATCHED) &
+            (tax[ms.PAYMENT_STATUS].to_numpy() == ms.PAYMENT_NONE) &
+            tax['공급가액'].notna().to_numpy() & tax['세액'].notna().to_numpy()
+        )
+        if len(eligible) == 0:
+            return
+        
+        book = self.filtered_df_book
+        ledger = LedgerIndex(book['거래처번호'], book['회계일'], book['차변금액'],
+                             claimed=book[ms.PAYMENT_STATUS].to_numpy() != ms.PAYMENT_NONE)
+        
+        # 대사금액: 공급가액 + 세액, 허용 회계일 범위: 작성월 1일부터 +2개월 마지막 날까지
+        targets = tax.iloc[eligible]
+        amounts = won_values(targets['공급가액'] + targets['세액'])
+        vendors = targets['업체사업자번호']
+        lower, upper = month_window(targets['작성년도'], targets['작성월'], span=self.PAYMENT_WINDOW_MONTHS)
+        
+        # 1) 1:1 매칭 일괄 처리 (세금계산서 순서대로 회계일이 가장 빠른 같은 금액 전표)
+        self.progress.step(0, len(eligible))
+        matched = ledger.match_exact(vendors, amounts, lower, upper)
+        hit = matched >= 0
+        if hit.any():
+            tax_positions = eligible[hit]
+            book_positions = matched[hit]
+            tax_labels = tax.index[tax_positions]
+            self.payment_state[ms.PAYMENT_STATUS][tax_positions] = ms.PAYMENT_EXACT
+            self.df_tax_new.loc[tax_labels, '차변금액'] = won_values(book['차변금액'].iloc[book_positions])
+            self.df_tax_new.loc[tax_labels, '전표번호'] = book['전표번호'].iloc[book_positions].astype(object).to_numpy()
+            self.df_tax_new.loc[tax_labels, '회계일'] = (
+                book['회계일'].iloc[book_positions].dt.strftime("%Y-%m-%d").astype(object).to_numpy()
+            )
+            self.book_state[ms.PAYMENT_STATUS][book_positions] = ms.PAYMENT_EXACT
+            self.book_state[ms.TAX_ROW][book_positions] = np.asarray(tax_labels, dtype=np.int32)
+            self.book_state[ms.ORDINAL][book_positions] = 1
+        
+        # 2) 1:1 매칭 실패 건은 부분조합(매입순차대사(조합)) 매칭 시도 - 세금계산서 순서대로
+        remaining = np.flatnonzero(~hit)
+        for done, k in enumerate(remaining, start=1):
+            self.progress.step(int(hit.sum()) + done, len(eligible))
+            positions = ledger.window(vendors.iloc[k], lower[k], upper[k])
+            if len(positions) == 0:
                 continue
-                
-            # 2) 1:1 매칭 실패 시, 부분조합(매입순차대사(조합)) 매칭 시도
+            
+            candidates = book.iloc[positions]
+            tax_idx = tax.index[eligible[k]]
             subset_found, subset_indices = self._find_subset_sum_all_combinations(
                 candidates['차변금액'],
-                pivot_amount,
-                tolerance
+                amounts[k],
+                context=f"지불보조장 {tax.at[tax_idx, '국세청승인번호']}"
             )
             
             if subset_found and len(subset_indices) > 0:
-                subset_cands = candidates.loc[subset_indices]
-                self.df_tax_new.at[idx, '구분키2'] = "매입순차대사(조합)"
-                self.df_tax_new.at[idx, '차변금액'] = subset_cands['차변금액'].sum()
-                self.df_tax_new.at[idx, '전표번호'] = subset_cands.iloc[0]['전표번호']
-                self.df_tax_new.at[idx, '회계일'] = subset_cands['회계일'].max().strftime("%Y-%m-%d")
+                book_positions = book.index.get_indexer(subset_indices)
+                ledger.claim(book_positions)
+                self._apply_ledger_combination(tax_idx, candidates.loc[subset_indices], eligible[k], book_positions)
+    
+    def _apply_ledger_combination(self, idx, subset_cands: pd.DataFrame, tax_position: int, book_positions: np.ndarray):
+        """지불보조장 조합 매칭 결과 기록 (idx: 세금계산서 인덱스, 위치는 상태 배열 기록용)"""
+        self.payment_state[ms.PAYMENT_STATUS][tax_position] = ms.PAYMENT_COMBINATION
+        self.df_tax_new.at[idx, '차변금액'] = won_values(subset_cands['차변금액']).sum()
+        self.df_tax_new.at[idx, '전표번호'] = subset_cands.iloc[0]['전표번호']
+        self.df_tax_new.at[idx, '회계일'] = subset_cands['회계일'].max().strftime("%Y-%m-%d")
+        
+        # 회계일 월이 모두 동일하지 않으면 "확인요청" 및 분할납부 내역 기록
+        unique_months = subset_cands['회계일'].dt.month.unique()
+        if len(unique_months) > 1:
+            self.df_tax_new.at[idx, '비고'] = "확인요청"
+            subset_cands = subset_cands.copy()
+            subset_cands['회계월'] = subset_cands['회계일'].dt.strftime('%Y-%m')
+            monthly_group = subset_cands.groupby('회계월', as_index=False)['차변금액'].sum()
+            
+            monthly_amounts = won_values(monthly_group['차변금액'])
+            for j, row in monthly_group.iterrows():
+                amount_col = f"분할납부{j+1}_금액"
+                month_col = f"분할납부{j+1}_월"
+                if amount_col not in self.df_tax_new.columns:
+                    self.df_tax_new[amount_col] = missing_won(self.df_tax_new.index)
+                self.df_tax_new.at[idx, amount_col] = monthly_amounts[j]
+                self.df_tax_new.at[idx, month_col] = row['회계월']
                 
-                # 회계일 월이 모두 동일하지 않으면 "확인요청" 및 분할납부 내역 기록
-                unique_months = subset_cands['회계일'].dt.month.unique()
-                if len(unique_months) > 1:
-                    self.df_tax_new.at[idx, '비고'] = "확인요청"
-                    subset_cands = subset_cands.copy()
-                    subset_cands['회계월'] = subset_cands['회계일'].dt.strftime('%Y-%m')
-                    monthly_group = subset_cands.groupby('회계월', as_index=False)['차변금액'].sum()
-                    
-                    for j, row in monthly_group.iterrows():
-                        amount_col = f"분할납부{j+1}_금액"
-                        month_col = f"분할납부{j+1}_월"
-                        self.df_tax_new.at[idx, amount_col] = row['차변금액']
-                        self.df_tax_new.at[idx, month_col] = row['회계월']
-                        
-                # 각 후보에 대해 filtered_df_book 업데이트 (순번 부여)
-                for i, si in enumerate(subset_indices, start=1):
-                    self.filtered_df_book.at[si, 'Key'] = tax_row['대사여부']
-                    self.filtered_df_book.at[si, '구분키'] = f"매입순차대사(조합)-{i}"
+        # 각 후보에 대해 지불보조장 상태 기록 (순번 부여)
+        self.book_state[ms.PAYMENT_STATUS][book_positions] = ms.PAYMENT_COMBINATION
+        self.book_state[ms.TAX_ROW][book_positions] = idx
+        self.book_state[ms.ORDINAL][book_positions] = np.arange(1, len(book_positions) + 1)
     
     def _create_final_results(self):
         """최종 결과 생성"""
+        # 대사 상태 코드 → 표시 라벨
+        self._materialize_labels()
+        
         # 디버깅 정보 출력
         print(f"DEBUG: df_final_pivot columns: {list(self.df_final_pivot.columns)}")
         print(f"DEBUG: '지불예상금액' in columns: {'지불예상금액' in self.df_final_pivot.columns}")
@@ -1065,9 +1425,9 @@ class ReconciliationService:
         # 최종지불금액 계산
         self.df_final_pivot['최종지불금액'] = self.df_final_pivot['최종매입금액']
         
-        # 과세: 최종매입금액에 1.1을 곱함
+        # 과세: 최종매입금액 + 부가세 10% (원 미만 절사)
         mask_taxable = self.df_final_pivot['면과세구분명'] == '과세'
-        self.df_final_pivot.loc[mask_taxable, '최종지불금액'] = self.df_final_pivot.loc[mask_taxable, '최종매입금액'] * 1.1
+        self.df_final_pivot.loc[mask_taxable, '최종지불금액'] = with_vat(self.df_final_pivot.loc[mask_taxable, '최종매입금액'])
         
         # 정렬
         self.df_final_pivot = self.df_final_pivot.sort_values(by=["업체사업자번호", "협력사코드", "년월"], ascending=True)
@@ -1075,8 +1435,8 @@ class ReconciliationService:
         # 지불예상금액이 없다면 여기서 생성
         if '지불예상금액' not in self.df_final_pivot.columns:
             print("WARNING: '지불예상금액' 컬럼이 없어서 생성합니다.")
-            self.df_final_pivot["국세청공급가액"] = self.df_final_pivot.get("국세청공급가액", 0).fillna(0)
-            self.df_final_pivot["국세청세액"] = self.df_final_pivot.get("국세청세액", 0).fillna(0)
+            self.df_final_pivot["국세청공급가액"] = to_won(self.df_final_pivot.get("국세청공급가액", 0), missing=0)
+            self.df_final_pivot["국세청세액"] = to_won(self.df_final_pivot.get("국세청세액", 0), missing=0)
             self.df_final_pivot["지불예상금액"] = self.df_final_pivot["국세청공급가액"] + self.df_final_pivot["국세청세액"]
         
         # 최종 DataFrame
@@ -1085,6 +1445,52 @@ class ReconciliationService:
             '구분키', 'key', '업체사업자번호', '최종지불금액', '지불예상금액'
         ]]
     
+    def _materialize_labels(self):
+        """
+        대사 상태 컬럼을 표시 라벨 컬럼으로 교체 (같은 자리에)
+        
+        - 피벗: 대사상태 → 구분키
+        - 세금계산서: 대사상태/대사피벗/대사순번 → 대사여부("피벗key-순번"), 구분키 / 지불상태 → 구분키2
+        - 지불보조장: 지불상태/대사세금계산서/대사순번 → 구분키, Key(세금계산서 대사여부)
+        """
+        pivot, tax = self.df_final_pivot, self.df_tax_new
+        if ms.STATUS not in pivot.columns or ms.STATUS not in tax.columns:
+            return
+        
+        tax_status = tax[ms.STATUS].to_numpy()
+        tax_ordinals = tax[ms.ORDINAL].to_numpy()
+        match_keys = pd.Series(
+            ms.reference_labels(tax[ms.PIVOT_ROW].to_numpy(), pivot['key'], tax_ordinals),
+            index=tax.index
+        )
+        self.df_final_pivot = ms.replace_columns(pivot, [ms.STATUS], {
+            '구분키': compact_labels(pd.Series(ms.status_labels(pivot[ms.STATUS].to_numpy(), ms.MATCH_LABELS), index=pivot.index)),
+        })
+        tax = ms.replace_columns(tax, [ms.STATUS, ms.PIVOT_ROW, ms.ORDINAL], {
+            '대사여부': match_keys,
+            '구분키': compact_labels(pd.Series(
+                ms.status_labels(tax_status, ms.MATCH_LABELS, tax_ordinals, ms.NUMBERED_MATCHES), index=tax.index
+            )),
+        })
+        
+        if ms.PAYMENT_STATUS in tax.columns:
+            tax = ms.replace_columns(tax, [ms.PAYMENT_STATUS], {
+                '구분키2': compact_labels(pd.Series(
+                    ms.status_labels(tax[ms.PAYMENT_STATUS].to_numpy(), ms.PAYMENT_LABELS, missing=None), index=tax.index
+                )),
+            })
+        self.df_tax_new = tax
+        
+        book = getattr(self, 'filtered_df_book', None)
+        if book is not None and ms.PAYMENT_STATUS in book.columns:
+            self.filtered_df_book = ms.replace_columns(book, [ms.PAYMENT_STATUS, ms.TAX_ROW, ms.ORDINAL], {
+                '구분키': compact_labels(pd.Series(ms.status_labels(
+                    book[ms.PAYMENT_STATUS].to_numpy(), ms.PAYMENT_LABELS,
+                    book[ms.ORDINAL].to_numpy(), ms.NUMBERED_PAYMENTS
+                ), index=book.index)),
+                'Key': ms.reference_labels(book[ms.TAX_ROW].to_numpy(), match_keys, missing=None),
+            })
+    
     def _save_to_excel(self):
         """Excel 파일 저장 - 노트북과 동일한 형식"""
         output_dir = Path("output")
@@ -1102,35 +1508,43 @@ class ReconciliationService:
             ("요청단품내역", self.df_standard)
         ]
         
-        # Excel 파일 생성 (노트북의 save_excel_with_pywin 함수와 유사)
-        self._save_excel_with_pywin(str(output_path), sheets_data)
+        # Excel 파일 생성 - 시트 단위 일괄 기록 (COM은 셀 단위 왕복이라 대용량에서 매우 느림)
+        if EXCEL_WRITER_BACKEND == 'com':
+            self._save_excel_with_pywin(str(output_path), sheets_data)
+        else:
+            save_sheets(str(output_path), sheets_data, progress_callback=self.progress.step)
         
         return str(output_path)
     
     def _save_excel_with_pywin(self, save_path, sheets_data):
         """win32com을 사용한 Excel 저장"""
+        import win32com.client as win32
+        
         excel = win32.Dispatch("Excel.Application")
         excel.Visible = False
         excel.DisplayAlerts = False
         
         wb = excel.Workbooks.Add()
         
-        # 첫 번째 시트
-        first_sheet_name, first_df = sheets_data[0]
-        ws = wb.Worksheets(1)
-        ws.Name = first_sheet_name
-        self._df_to_sheet(ws, first_df)
-        
-        # 나머지 시트
-        for sheet_name, df in sheets_data[1:]:
-            ws = wb.Worksheets.Add(After=wb.Worksheets(wb.Worksheets.Count))
-            ws.Name = sheet_name
-            self._df_to_sheet(ws, df)
-        
-        # 저장
-        wb.SaveAs(os.path.abspath(save_path), FileFormat=51)
-        wb.Close(False)
-        excel.Quit()
+        try:
+            # 첫 번째 시트
+            first_sheet_name, first_df = sheets_data[0]
+            ws = wb.Worksheets(1)
+            ws.Name = first_sheet_name
+            self._df_to_sheet(ws, first_df)
+            
+            # 나머지 시트
+            for sheet_name, df in sheets_data[1:]:
+                ws = wb.Worksheets.Add(After=wb.Worksheets(wb.Worksheets.Count))
+                ws.Name = sheet_name
+                self._df_to_sheet(ws, df)
+            
+            # 저장
+            wb.SaveAs(os.path.abspath(save_path), FileFormat=51)
+        finally:
+            # 취소/오류 시에도 Excel 프로세스가 남지 않도록 종료
+            wb.Close(False)
+            excel.Quit()
     
     def _df_to_sheet(self, sheet, df, start_row=1, start_col=1):
         """DataFrame을 Excel 시트에 기록"""
@@ -1145,6 +1559,7 @@ class ReconciliationService:
         
         # 데이터 작성
         for row_idx in range(n_rows):
+            self.progress.check()
             for col_idx in range(n_cols):
                 val = df.iat[row_idx, col_idx]
                 if pd.isnull(val):
@@ -1260,7 +1675,7 @@ class ReconciliationService:
             if row['구분키'] in ['금액대사', '금액대사(수기확인)']:
                 # 1:1 대사는 금액이 정확히 일치해야 함
                 if pd.notna(row['국세청공급가액']):
-                    if abs(row['최종매입금액'] - row['국세청공급가액']) > 1e-6:
+                    if row['최종매입금액'] != row['국세청공급가액']:
                         result['errors'].append(
                             f"행 {idx}: 금액대사이나 금액 불일치 (매입: {row['최종매입금액']}, 국세청: {row['국세청공급가액']})"
                         )
@@ -1268,7 +1683,7 @@ class ReconciliationService:
             elif row['구분키'] == '순차대사':
                 # 순차대사는 합계가 일치해야 함
                 if pd.notna(row['국세청공급가액']):
-                    if abs(row['최종매입금액'] - row['국세청공급가액']) > 1e-6:
+                    if row['최종매입금액'] != row['국세청공급가액']:
                         result['warnings'].append(
                             f"행 {idx}: 순차대사 금액 차이 (매입: {row['최종매입금액']}, 국세청: {row['국세청공급가액']})"
                         )
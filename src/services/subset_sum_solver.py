@@ -0,0 +1,182 @@
+"""
+부분집합 합 탐색기 - 원 단위 정수 금액 기반, 탐색 예산 제한
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence
+
+import pandas as pd
+
+
+@dataclass
+class SubsetSumResult:
+    """부분집합 합 탐색 결과"""
+    status: str                                   # found / not_found / exhausted
+    indices: List[Any] = field(default_factory=list)
+    nodes: int = 0                                # 탐색한 노드 수
+
+    @property
+    def found(self) -> bool:
+        return self.status == SubsetSumSolver.FOUND
+
+    @property
+    def exhausted(self) -> bool:
+        return self.status == SubsetSumSolver.EXHAUSTED
+
+
+class SubsetSumSolver:
+    """
+    목표 금액과 합이 일치하는 후보 부분집합을 찾는다.
+
+    결과는 기존 DFS(후보 순서대로 "포함" 분기를 먼저 탐색)가 처음 찾는 해와 동일하다.
+    - 모든 금액이 0 이상이면 합계 비트셋 DP로 도달 가능 여부를 먼저 계산하고,
+      DP 표를 따라 후보 순서대로 해를 복원한다 (백트래킹 없음).
+    - 음수 금액이 있거나 DP 표가 너무 크면 실패 상태 메모이제이션과
+      잔여 양수 합(suffix sum) 가지치기를 적용한 반복 DFS로 탐색한다.
+    - DFS는 노드 수/시간 예산을 넘으면 블로킹하지 않고 exhausted를 반환한다.
+    """
+
+    FOUND = 'found'
+    NOT_FOUND = 'not_found'
+    EXHAUSTED = 'exhausted'
+
+    # 예산 확인 주기 (노드 수)
+    _CHECK_INTERVAL = 1024
+
+    def __init__(self, max_nodes: int = 200_000, time_limit: float = 2.0,
+                 max_dp_bits: int = 200_000_000, max_memo: int = 1_000_000,
+                 cancel_check: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            max_nodes: DFS 최대 탐색 노드 수
+            time_limit: 탐색 1회당 최대 시간(초)
+            max_dp_bits: 합계 DP 표 최대 크기 (후보 수 × 목표 금액 비트)
+            max_memo: 실패 상태 메모 최대 개수
+            cancel_check: 탐색 중 주기적으로 호출 (취소 시 예외를 던져 중단)
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.max_dp_bits = max_dp_bits
+        self.max_memo = max_memo
+        self.cancel_check = cancel_check
+
+    def solve(self, amounts, target) -> SubsetSumResult:
+        """
+        Args:
+            amounts: 금액 Series (인덱스가 반환 레이블) 또는 금액 시퀀스
+            target: 목표 금액
+
+        Returns:
+            SubsetSumResult (indices는 amounts의 인덱스 레이블, 후보 순서)
+        """
+        if isinstance(amounts, pd.Series):
+            items = list(amounts.items())
+        else:
+            items = list(enumerate(amounts))
+
+        # 결측 금액은 어떤 합과도 일치할 수 없으므로 제외
+        labels = [label for label, amount in items if not pd.isna(amount)]
+        values = [self._to_won(amount) for _, amount in items if not pd.isna(amount)]
+        target = self._to_won(target)
+
+        if target == 0:
+            return SubsetSumResult(self.FOUND, [], 0)
+
+        if all(value >= 0 for value in values) and target > 0:
+            result = self._solve_dp(values, target)
+            if result is not None:
+                chosen, status = result
+                return SubsetSumResult(status, [labels[i] for i in chosen], len(values))
+
+        chosen, status, nodes = self._solve_dfs(values, target)
+        return SubsetSumResult(status, [labels[i] for i in chosen], nodes)
+
+    def _solve_dp(self, values: Sequence[int], target: int) -> Optional[tuple]:
+        """합계 비트셋 DP (금액이 모두 0 이상일 때). 표가 예산을 넘으면 None"""
+        gcd = 0
+        for value in values:
+            gcd = math.gcd(gcd, value)
+        if gcd == 0 or target % gcd != 0:
+            return [], self.NOT_FOUND
+
+        scaled = [value // gcd for value in values]
+        scaled_target = target // gcd
+        if (len(scaled) + 1) * (scaled_target + 1) > self.max_dp_bits:
+            return None
+
+        # reachable[i]: 후보 i..n-1로 만들 수 있는 합의 비트셋 (목표 이하만 유지)
+        mask = (1 << (scaled_target + 1)) - 1
+        reachable = [0] * (len(scaled) + 1)
+        reachable[-1] = 1
+        for i in range(len(scaled) - 1, -1, -1):
+            reachable[i] = (reachable[i + 1] | (reachable[i + 1] << scaled[i])) & mask
+            if self.cancel_check is not None:
+                self.cancel_check()
+
+        if not (reachable[0] >> scaled_target) & 1:
+            return [], self.NOT_FOUND
+
+        # DFS와 같은 순서로 복원: 목표에 도달하면 중단, 가능한 경우 "포함" 우선
+        chosen = []
+        remaining = scaled_target
+        for i, value in enumerate(scaled):
+            if remaining == 0:
+                break
+            rest = remaining - value
+            if rest >= 0 and (reachable[i + 1] >> rest) & 1:
+                chosen.append(i)
+                remaining = rest
+
+        return chosen, self.FOUND
+
+    def _solve_dfs(self, values: Sequence[int], target: int) -> tuple:
+        """예산 제한 반복 DFS (포함 → 미포함 순서)"""
+        n = len(values)
+        positive_suffix = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            positive_suffix[i] = positive_suffix[i + 1] + max(values[i], 0)
+
+        deadline = time.monotonic() + self.time_limit
+        failed = set()
+        chosen = []
+        nodes = 0
+
+        # 프레임: [후보 위치, 현재 합, 단계(0: 진입, 1: 포함 탐색 후, 2: 미포함 탐색 후)]
+        stack = [[0, 0, 0]]
+        while stack:
+            frame = stack[-1]
+            i, current, stage = frame
+
+            if stage == 0:
+                nodes += 1
+                if nodes % self._CHECK_INTERVAL == 0:
+                    if self.cancel_check is not None:
+                        self.cancel_check()
+                    if nodes > self.max_nodes or time.monotonic() > deadline:
+                        return [], self.EXHAUSTED, nodes
+                if current == target:
+                    return chosen[:], self.FOUND, nodes
+                if (i >= n or current > target
+                        or current + positive_suffix[i] < target
+                        or (i, current) in failed):
+                    stack.pop()
+                    continue
+                frame[2] = 1
+                chosen.append(i)
+                stack.append([i + 1, current + values[i], 0])
+            elif stage == 1:
+                chosen.pop()
+                frame[2] = 2
+                stack.append([i + 1, current, 0])
+            else:
+                if len(failed) < self.max_memo:
+                    failed.add((i, current))
+                stack.pop()
+
+        return [], self.NOT_FOUND, nodes
+
+    @staticmethod
+    def _to_won(amount) -> int:
+        """금액을 원 단위 정수로 변환"""
+        return int(round(float(amount)))
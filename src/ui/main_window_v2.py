@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QLineEdit, QComboBox, QGroupBox,
-    QFileDialog, QMessageBox, QProgressBar, QTableWidget,
-    QTableWidgetItem, QTextEdit, QSplitter, QHeaderView, QDateEdit,
+    QFileDialog, QMessageBox, QProgressBar, QTableView,
+    QTextEdit, QSplitter, QHeaderView, QDateEdit,
     QDialog, QDialogButtonBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer, QDate, QSettings
@@ -19,12 +19,14 @@ import threading
 
 # kfunction 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from kfunction import read_excel_data
+from kfunction import probe_excel_schema
 
 from src.services.excel_service import ExcelService
 from src.services.reconciliation_service_v2 import ReconciliationService
+from src.services.file_snapshot import take_fingerprint
 from src.ui.workers.reconciliation_worker import ReconciliationWorker
 from src.ui.widgets.progress_dialog import ProgressDialog
+from src.ui.widgets.dataframe_model import DataFrameTableModel, fit_columns_to_sample
 
 # 전역 큐와 결과 딕셔너리
 excel_read_queue = queue.Queue()
@@ -40,6 +42,7 @@ class FileValidationThread(QThread):
         self.file_path = file_path
         self.file_type = file_type
         self.request_id = f"{file_type}_{threading.get_ident()}"
+        self.fingerprint = None  # 검증 시점의 파일 지문
         
     def run(self):
         try:
@@ -57,6 +60,7 @@ class FileValidationThread(QThread):
                 if self.request_id in excel_read_results:
                     result = excel_read_results.pop(self.request_id)
                     if result['success']:
+                        self.fingerprint = result.get('fingerprint')
                         self.validation_complete.emit(True, "검증 완료", self.file_type)
                     else:
                         self.validation_complete.emit(False, result['error'], self.file_type)
@@ -78,6 +82,7 @@ class FileUploadWidget(QWidget):
         super().__init__()
         self.file_type = file_type
         self.file_path = None
+        self.fingerprint = None
         self.validation_thread = None
         self.init_ui(file_label)
 
@@ -155,6 +160,7 @@ class FileUploadWidget(QWidget):
         if success:
             self.status_label.setText("✅ 확인")
             self.status_label.setStyleSheet("color: green;")
+            self.fingerprint = self.validation_thread.fingerprint
             self.file_uploaded.emit(self.file_type, self.file_path)
         else:
             self.status_label.setText("❌ 오류")
@@ -166,6 +172,7 @@ class FileUploadWidget(QWidget):
     def reset(self):
         """초기화"""
         self.file_path = None
+        self.fingerprint = None
         self.path_edit.clear()
         self.status_label.setText("⏳ 대기")
         self.status_label.setStyleSheet("")
@@ -224,19 +231,17 @@ class ImprovedMainWindow(QMainWindow):
             # Excel 파일 읽기 전 UI 이벤트 처리
             QApplication.processEvents()
             
-            # Excel 파일 읽기 (COM 객체 사용)
-            df = read_excel_data(file_path)
+            # 헤더/차원만 확인 (전체 파싱은 대사 실행 시 로드 단계에서 수행)
+            schema = probe_excel_schema(file_path)
             
             # 읽기 후 UI 이벤트 처리
             QApplication.processEvents()
             
-            if len(df) > 5:
-                df = df.head(5)  # 검증용으로 5행만 확인
-            
-            # 성공 결과 저장
+            # 성공 결과 저장 (로드 시 일관성 확인용 지문 - 크기/수정시각만, 내용 해시는 대사 실행 시 필요할 때 계산)
             excel_read_results[request_id] = {
                 'success': True,
-                'data': df
+                'data': schema,
+                'fingerprint': take_fingerprint(file_path)
             }
         except Exception as e:
             # 실패 결과 저장
@@ -446,9 +451,29 @@ class ImprovedMainWindow(QMainWindow):
         self.summary_label = QLabel("대사를 실행하면 결과가 여기에 표시됩니다.")
         result_layout.addWidget(self.summary_label)
 
-        # 결과 테이블
-        self.result_table = QTableWidget()
+        # 결과 필터
+        self.result_filter = QLineEdit()
+        self.result_filter.setPlaceholderText("🔍 결과 검색 (모든 열)")
+        self.result_filter.setClearButtonEnabled(True)
+        result_layout.addWidget(self.result_filter)
+
+        # 결과 테이블 (DataFrame 모델 - 보이는 셀만 변환하므로 행 수와 무관하게 즉시 표시)
+        self.result_model = DataFrameTableModel()
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
         self.result_table.setAlternatingRowColors(True)
+        self.result_table.setSortingEnabled(True)
+        self.result_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.result_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.result_table.verticalHeader().setDefaultSectionSize(self.result_table.fontMetrics().height() + 8)
+        # 입력이 멈춘 뒤 한 번만 필터 적용 (대용량에서 키 입력마다 전체 검색하지 않음)
+        self.result_filter_timer = QTimer(self)
+        self.result_filter_timer.setSingleShot(True)
+        self.result_filter_timer.setInterval(250)
+        self.result_filter_timer.timeout.connect(
+            lambda: self.result_model.set_filter_text(self.result_filter.text())
+        )
+        self.result_filter.textChanged.connect(self.result_filter_timer.start)
         result_layout.addWidget(self.result_table)
 
         # 다운로드 버튼
@@ -566,9 +591,14 @@ class ImprovedMainWindow(QMainWindow):
         self.btn_download.setEnabled(False)
 
         # 스레드 실행
-        self.thread = ReconciliationWorker(self.file_paths, start_date, end_date)
+        fingerprints = {
+            file_type: widget.fingerprint for file_type, widget in self.file_widgets.items()
+            if file_type in self.file_paths
+        }
+        self.thread = ReconciliationWorker(self.file_paths, start_date, end_date, fingerprints)
         self.thread.progress.connect(self.progress_dialog.update_progress)
         self.thread.message.connect(self.progress_dialog.append_message)
+        self.thread.status.connect(self.progress_dialog.update_status)
         self.thread.message.connect(self.log)
         self.thread.finished.connect(self.on_reconciliation_finished)
         self.thread.error.connect(self.on_reconciliation_error)
@@ -587,18 +617,22 @@ class ImprovedMainWindow(QMainWindow):
         if hasattr(self, 'progress_dialog'):
             self.progress_dialog.on_finished()
 
-        # 결과 표시
-        if 'reconciliation_result' in results:
-            df = results['reconciliation_result']
+        # 결과 표시 (작업 스레드가 넘겨준 최종 대사 결과)
+        df = results.get('reconciliation_result')
+        if isinstance(df, pd.DataFrame):
             self.display_results(df)
 
-            # 요약 표시
-            if 'summary' in results:
-                summary = results['summary']
-                summary_text = f"총 {len(df)}건 처리\n"
-                for _, row in summary.iterrows():
-                    summary_text += f"{row['구분']}: {row['대사율']:.1f}%\n"
-                self.summary_label.setText(summary_text)
+            # 요약 표시 (서비스의 _create_summary 결과)
+            summary = results.get('summary') or {}
+            summary_text = f"총 {len(df):,}건 처리\n"
+            for key, label in (('exact_match', '금액대사'), ('sequential_match', '순차대사'),
+                               ('partial_match', '부분대사'), ('unmatched', '미대사')):
+                if key in summary:
+                    summary_text += f"{label}: {summary[key]:,}건\n"
+            rate = summary.get('validation', {}).get('statistics', {}).get('reconciliation_rate')
+            if rate is not None:
+                summary_text += f"대사율: {rate:.1f}%\n"
+            self.summary_label.setText(summary_text)
 
         # UI 활성화
         self.btn_execute.setEnabled(True)
@@ -620,22 +654,14 @@ class ImprovedMainWindow(QMainWindow):
 
     def display_results(self, df: pd.DataFrame):
         """결과 테이블에 표시"""
-        self.result_table.setRowCount(len(df))
-        self.result_table.setColumnCount(len(df.columns))
-        self.result_table.setHorizontalHeaderLabels(df.columns.tolist())
-
-        for row in range(len(df)):
-            for col in range(len(df.columns)):
-                value = df.iloc[row, col]
-                if pd.isna(value):
-                    item = QTableWidgetItem("")
-                else:
-                    item = QTableWidgetItem(str(value))
-                self.result_table.setItem(row, col, item)
-
-        self.result_table.horizontalHeader().setSectionResizeMode(
-            QHeaderView.ResizeMode.ResizeToContents
-        )
+        self.result_filter.blockSignals(True)
+        self.result_filter.clear()
+        self.result_filter.blockSignals(False)
+        self.result_filter_timer.stop()
+        self.result_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+
+        self.result_model.set_dataframe(df)
+        fit_columns_to_sample(self.result_table)
 
     def download_results(self):
         """결과 다운로드"""
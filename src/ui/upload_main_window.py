@@ -14,7 +14,7 @@ import pandas as pd
 
 # kfunction 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from kfunction import read_excel_data
+from kfunction import read_excel_data, probe_excel_schema
 
 # 프로젝트 서비스 import - 절대 임포트로 변경
 from src.services.data_manager import DataManager
@@ -59,45 +59,28 @@ class FileUploadThread(QThread):
             self.finished.emit(False, f"업로드 실패: {str(e)}")
             
     def validate_and_load_file(self):
-        """파일 검증 및 데이터 로드 (한 번만 읽기)"""
+        """파일 검증 - 헤더/차원만 확인하고 전체 파싱은 데이터 로드 단계로 미룸"""
         try:
             # 파일 크기 확인
             file_size = os.path.getsize(self.file_path) / 1024 / 1024  # MB
             if file_size > 10:
                 print(f"큰 파일 처리 중: {file_size:.1f}MB")
             
-            # Excel 파일 읽기 (한 번만!)
-            print(f"[INFO] '{self.file_path}' 읽는 중…")
-            df = read_excel_data(self.file_path)
+            # 헤더 스키마만 조회 (대용량 파일도 즉시 완료)
+            schema = probe_excel_schema(self.file_path)
             
-            if df.empty:
+            if not schema['columns'] or schema['row_count'] == 0:
                 return False, "빈 파일입니다.", None
 
             # 파일 타입별 검증
             if self.file_type == "supplier_purchase":
                 # 협력사단품별매입 파일 검증
                 required_cols = ['협력사코드', '협력사명']
-                if not all(col in df.columns for col in required_cols):
+                if not all(col in schema['columns'] for col in required_cols):
                     return False, f"필수 컬럼이 없습니다: {required_cols}", None
-                return True, "검증 완료", df
-                
-            elif self.file_type == "standard":
-                # 기준 파일 검증
-                return True, "검증 완료", df
-                
-            elif self.file_type == "tax_invoice":
-                # 매입세금계산서 파일 검증
-                return True, "검증 완료", df
-                
-            elif self.file_type == "payment_ledger":
-                # 지불보조장 파일 검증
-                return True, "검증 완료", df
-                
-            elif self.file_type == "tax_invoice_wis":
-                # 매입세금계산서(WIS) 파일 검증
-                return True, "검증 완료", df
 
-            return True, "검증 완료", df
+            # 데이터는 DataLoadThread에서 캐시 또는 파일로부터 로드
+            return True, "검증 완료", None
 
         except Exception as e:
             return False, f"파일 읽기 오류: {str(e)}", None
@@ -0,0 +1,194 @@
+"""
+DataFrame 결과 그리드 모델
+셀 위젯을 만들지 않고 화면에 보이는 셀만 data()에서 그때그때 문자열로 변환
+"""
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QHeaderView, QTableView
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.models.amount import AMOUNT_COLUMNS
+
+# 열 너비 계산에 사용할 표본 행 수
+WIDTH_SAMPLE_ROWS = 200
+
+# 열 최대 너비 (px)
+MAX_COLUMN_WIDTH = 400
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    DataFrame 열 배열을 그대로 참조하는 읽기 전용 테이블 모델
+
+    - 표시 문자열은 data() 호출 시 해당 셀만 변환 (행 수와 무관하게 즉시 표시)
+    - 정렬/필터는 행 순서 배열만 바꾸며 원본 데이터는 복사하지 않음
+    - 천 단위 구분자는 금액 컬럼(amount_columns, 기본 AMOUNT_COLUMNS)에만 적용 (년월 등은 그대로)
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, parent=None,
+                 amount_columns: Optional[Iterable[str]] = None):
+        super().__init__(parent)
+        self._amount_columns = frozenset(AMOUNT_COLUMNS if amount_columns is None else amount_columns)
+        self._headers: List[str] = []
+        self._columns: List[np.ndarray] = []
+        self._numeric: List[bool] = []
+        self._amount: List[bool] = []
+        self._n_rows = 0
+        self._sort_order: Optional[np.ndarray] = None  # 정렬된 원본 행 위치 (없으면 원래 순서)
+        self._mask: Optional[np.ndarray] = None        # 필터 통과 여부 (없으면 전체)
+        self._rows = np.arange(0, dtype=np.intp)       # 화면 행 → 원본 행 위치
+        self._frame = pd.DataFrame()
+        self.set_dataframe(df if df is not None else pd.DataFrame())
+
+    def set_dataframe(self, df: pd.DataFrame):
+        """표시할 DataFrame 교체 (정렬/필터 초기화)"""
+        self.beginResetModel()
+        self._frame = df
+        self._headers = [self._header_text(col) for col in df.columns]
+        self._columns = [df.iloc[:, i].to_numpy() for i in range(df.shape[1])]
+        self._numeric = [
+            pd.api.types.is_numeric_dtype(df.iloc[:, i].dtype) and not pd.api.types.is_bool_dtype(df.iloc[:, i].dtype)
+            for i in range(df.shape[1])
+        ]
+        self._amount = [header in self._amount_columns for header in self._headers]
+        self._n_rows = len(df)
+        self._sort_order = None
+        self._mask = None
+        self._rows = np.arange(self._n_rows, dtype=np.intp)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(index.row(), col)
+        if role == Qt.ItemDataRole.TextAlignmentRole and self._numeric[col]:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
+
+    def display_text(self, row: int, col: int) -> str:
+        """화면 행/열의 표시 문자열"""
+        return self._format(self._columns[col][self._rows[row]], self._amount[col])
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """열 기준 정렬 (안정 정렬, 빈 값은 항상 마지막)"""
+        if not 0 <= column < len(self._columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        series = pd.Series(self._columns[column])
+        ascending = order == Qt.SortOrder.AscendingOrder
+        try:
+            ordered = series.sort_values(ascending=ascending, kind='stable', na_position='last')
+        except TypeError:
+            # 문자열/숫자 혼합 열은 표시 문자열 기준
+            ordered = series.where(series.isna(), series.astype(str)).sort_values(
+                ascending=ascending, kind='stable', na_position='last'
+            )
+        self._sort_order = ordered.index.to_numpy(dtype=np.intp)
+        self._apply_view()
+        self.layoutChanged.emit()
+
+    def set_filter_text(self, text: str):
+        """모든 열에서 text를 포함하는 행만 표시 (빈 문자열이면 필터 해제)"""
+        self.beginResetModel()
+        text = text.strip()
+        if not text:
+            self._mask = None
+        else:
+            mask = np.zeros(self._n_rows, dtype=bool)
+            for i in range(self._frame.shape[1]):
+                column = self._frame.iloc[:, i]
+                mask |= column.astype(str).str.contains(text, case=False, regex=False).to_numpy(dtype=bool) & column.notna().to_numpy()
+            self._mask = mask
+        self._apply_view()
+        self.endResetModel()
+
+    def source_row(self, row: int) -> int:
+        """화면 행 → DataFrame 행 위치"""
+        return int(self._rows[row])
+
+    def _apply_view(self):
+        order = self._sort_order if self._sort_order is not None else np.arange(self._n_rows, dtype=np.intp)
+        self._rows = order if self._mask is None else order[self._mask[order]]
+
+    @staticmethod
+    def _header_text(column) -> str:
+        if isinstance(column, tuple):
+            return "_".join(str(part) for part in column if not pd.isna(part))
+        return str(column)
+
+    @staticmethod
+    def _format(value, amount: bool = False) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, (float, np.floating)):
+            if np.isnan(value):
+                return ""
+            if float(value).is_integer():
+                return f"{value:,.0f}" if amount else f"{value:.0f}"
+            return f"{value:,.2f}" if amount else f"{value:.2f}"
+        if isinstance(value, (bool, np.bool_)):
+            return str(bool(value))
+        if isinstance(value, (int, np.integer)):
+            return f"{int(value):,}" if amount else str(int(value))
+        if isinstance(value, np.datetime64):
+            if np.isnat(value):
+                return ""
+            value = pd.Timestamp(value)
+        if isinstance(value, datetime):
+            if pd.isna(value):
+                return ""
+            if (value.hour, value.minute, value.second, value.microsecond) == (0, 0, 0, 0):
+                return value.strftime("%Y-%m-%d")
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        if value is pd.NA or value is pd.NaT:
+            return ""
+        return str(value)
+
+
+def fit_columns_to_sample(view: QTableView, sample_rows: int = WIDTH_SAMPLE_ROWS):
+    """
+    표본 행만 측정해 열 너비 설정 (ResizeToContents는 모든 셀을 측정하므로 대용량에서 사용하지 않음)
+
+    앞쪽 행과 전체에 고르게 흩어진 행을 함께 표본으로 사용한다.
+    """
+    model = view.model()
+    if model is None:
+        return
+    n_rows, n_cols = model.rowCount(), model.columnCount()
+    head = min(n_rows, sample_rows // 2)
+    spread = np.linspace(0, n_rows - 1, num=min(n_rows, sample_rows - head), dtype=np.intp) if n_rows else []
+    rows = sorted(set(range(head)) | set(int(r) for r in spread))
+
+    metrics = view.fontMetrics()
+    header_metrics = view.horizontalHeader().fontMetrics()
+    padding = 2 * view.style().pixelMetric(view.style().PixelMetric.PM_FocusFrameHMargin) + 16
+
+    header = view.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+    for col in range(n_cols):
+        title = model.headerData(col, Qt.Orientation.Horizontal) or ""
+        width = header_metrics.horizontalAdvance(str(title))
+        for row in rows:
+            text = model.data(model.index(row, col))
+            if text:
+                width = max(width, metrics.horizontalAdvance(text))
+        header.resizeSection(col, min(width + padding, MAX_COLUMN_WIDTH))
@@ -3,17 +3,12 @@
 """
 from PyQt6.QtCore import QThread, pyqtSignal
 from datetime import datetime
-from pathlib import Path
-import shutil
-import os
-import sys
-
-# kfunction 모듈 경로 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-from kfunction import read_excel_data
+from typing import Dict, Optional
 
 from src.services.reconciliation_service_v2 import ReconciliationService
 from src.services.reconciliation_validator import ReconciliationValidator
+from src.services.file_snapshot import FileFingerprint, find_changed, prepare_snapshot
+from src.services.progress import ReconciliationCancelled
 
 
 class ReconciliationWorker(QThread):
@@ -22,20 +17,37 @@ class ReconciliationWorker(QThread):
     # 시그널 정의
     progress = pyqtSignal(int)        # 진행률 (0-100)
     message = pyqtSignal(str)         # 상태 메시지
+    status = pyqtSignal(str)          # 현재 단계 + 남은 예상 시간
     finished = pyqtSignal(dict)       # 완료 시 결과
     error = pyqtSignal(str)           # 오류 발생
     
-    def __init__(self, file_paths: dict, start_date: datetime, end_date: datetime):
+    def __init__(self, file_paths: dict, start_date: datetime, end_date: datetime,
+                 fingerprints: Optional[Dict[str, FileFingerprint]] = None):
         super().__init__()
         self.file_paths = file_paths
         self.start_date = start_date
         self.end_date = end_date
+        self.fingerprints = fingerprints or {}  # 업로드 검증 시점의 파일 지문 (UI 파일 타입 기준)
         self.is_running = True
+        self._last_stage_message = None
         
     def stop(self):
-        """작업 중단"""
+        """작업 중단 (대사 처리 중이면 다음 취소 확인 시점에 중단)"""
         self.is_running = False
         
+    def _on_service_progress(self, percent: float, stage_message: str, eta_seconds: Optional[float]):
+        """서비스 진행률 → 시그널 (단계가 바뀔 때만 메시지 로그 추가)"""
+        if stage_message != self._last_stage_message:
+            self._last_stage_message = stage_message
+            self.message.emit(f"  - {stage_message}...")
+        self.progress.emit(50 + int(percent * 0.45))
+        
+        if eta_seconds is None:
+            self.status.emit(stage_message)
+        else:
+            minutes, seconds = divmod(int(round(eta_seconds)), 60)
+            self.status.emit(f"{stage_message} (남은 시간 약 {minutes}분 {seconds}초)")
+        
     def run(self):
         """백그라운드 실행"""
         try:
@@ -43,6 +55,9 @@ class ReconciliationWorker(QThread):
             self.message.emit("📋 필수 파일 검증 중...")
             self.progress.emit(5)
             
+            # 서비스 파일 키 → UI 파일 타입
+            ui_keys = {'purchase_detail': 'supplier_purchase'}
+            
             required_files = {
                 'purchase_detail': self.file_paths.get('supplier_purchase'),
                 'standard': self.file_paths.get('standard'),
@@ -77,44 +92,37 @@ class ReconciliationWorker(QThread):
             self.message.emit("📥 Excel 파일 로드 중...")
             self.progress.emit(20)
             
-            # 파일 경로를 data 폴더로 복사 (임시)
-            data_dir = Path("data")
-            data_dir.mkdir(exist_ok=True)
-            
-            file_map = {}
-            for key, src_path in required_files.items():
-                if src_path:
-                    dest_path = data_dir / Path(src_path).name
-                    shutil.copy2(src_path, dest_path)
-                    file_map[key] = str(dest_path)
+            # 원본 경로에서 직접 로드 (네트워크 경로/검증 후 변경된 파일만 data 폴더로 스냅샷 복사)
+            validated = {key: self.fingerprints.get(ui_keys.get(key, key)) for key in required_files}
+            file_map, load_fingerprints, notes = prepare_snapshot(required_files, validated)
+            for note in notes:
+                self.message.emit(f"  - {note}")
                     
-            service.load_all_data(file_map)
+            service.load_all_data(file_map, parallel=True, fingerprints=load_fingerprints)
+            
+            changed = find_changed(file_map, load_fingerprints)
+            if changed:
+                self.error.emit(f"파일 로드 중 파일이 변경되었습니다. 다시 실행해주세요: {', '.join(changed)}")
+                return
             
             if not self.is_running:
                 return
                 
-            # 4. 대사 처리
+            # 4. 대사 처리 (서비스가 보고하는 실제 진행률을 50~95% 구간에 표시)
             self.message.emit("⚙️ 대사 처리 중...")
             self.progress.emit(50)
             
-            # 진행률 업데이트를 위한 단계별 처리
-            self.message.emit("  - 데이터 전처리 및 피벗...")
-            self.progress.emit(60)
-            
-            self.message.emit("  - 세금계산서 데이터 처리...")
-            self.progress.emit(70)
-            
-            self.message.emit("  - 금액대사 및 순차대사...")
-            self.progress.emit(80)
-            
-            self.message.emit("  - 지불보조장 대사...")
-            self.progress.emit(90)
-            
-            # 실제 대사 처리
-            results = service.process_reconciliation(self.start_date, self.end_date)
+            results = service.process_reconciliation(
+                self.start_date, self.end_date,
+                progress_callback=self._on_service_progress,
+                cancel_callback=lambda: not self.is_running
+            )
             
             if not self.is_running:
                 return
+            
+            if results.get('reused_stages'):
+                self.message.emit(f"♻️ 입력이 바뀌지 않은 단계 재사용: {', '.join(results['reused_stages'])}")
                 
             # 4-1. 대사 결과 검증
             self.message.emit("🔍 대사 결과 검증 중...")
@@ -129,12 +137,13 @@ class ReconciliationWorker(QThread):
                 'book_filtered': service.filtered_df_book
             }
             
+            # 원본은 대사 기간에 해당하는 행 기준 (기간 밖 행은 대사 대상이 아님)
             original_data = {
-                'purchase_detail': service.df,
+                'purchase_detail': service.input_in_period('purchase_detail'),
                 'standard': service.df_standard,
                 'tax_invoice': service.df_tax_hifi,
-                'payment_ledger': service.df_book,
-                'tax_invoice_wis': service.df_num
+                'payment_ledger': service.input_in_period('payment_ledger'),
+                'tax_invoice_wis': service.input_in_period('tax_invoice_wis')
             }
             
             # 검증 실행
@@ -154,9 +163,12 @@ class ReconciliationWorker(QThread):
             self.message.emit("✅ 대사 처리 완료!")
             self.progress.emit(100)
             
-            # 결과 반환
+            # 결과 반환 (결과 그리드에 표시할 최종 대사 결과 포함)
+            results['reconciliation_result'] = service.final_merged_df
             self.finished.emit(results)
             
+        except ReconciliationCancelled:
+            self.error.emit("작업이 취소되었습니다")
         except Exception as e:
             import traceback
             error_msg = f"대사 처리 중 오류 발생:\n{str(e)}\n\n{traceback.format_exc()}"